@@ -0,0 +1,14 @@
+"""
+Benchmark suite for the analysis pipelines.
+
+``benchmarks.suite`` times and memory-profiles every stage of each domain
+(load, preprocess, analysis, insights, render) on generated data at
+several scales; ``benchmarks.baseline`` stores runs as JSON and compares
+a run against a stored baseline. ``bench_preprocessing`` compares the
+vectorised preprocessing against the former row-wise code.
+
+Usage:
+    python -m benchmarks run --rows 10000 100000 --save benchmarks/baselines/main.json
+    python -m benchmarks run --rows 10000 100000 --compare benchmarks/baselines/main.json
+    python -m benchmarks compare benchmarks/baselines/main.json current.json
+"""
@@ -0,0 +1,154 @@
+"""
+Benchmark CLI
+
+    python -m benchmarks run [--domains ...] [--rows ...] [--stages ...]
+                             [--save PATH] [--compare PATH]
+    python -m benchmarks startup [--entry-points ...] [--modes help run]
+                                 [--save PATH] [--compare PATH]
+    python -m benchmarks compare BASELINE CURRENT
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from benchmarks.baseline import compare_runs, load_run, regressions, save_run
+from benchmarks.startup import ENTRY_POINTS, MODES, run_startup
+from benchmarks.suite import DATA_DIR, STAGES, environment, run_suite
+from src.common.domains import DOMAINS
+
+
+def _megabytes(value) -> str:
+    return "-" if value is None else f"{value / 2**20:.1f}"
+
+
+def print_result(result: dict):
+    print(
+        f"{result['domain']:<12}{result['rows']:>11,}  {result['stage']:<11}"
+        f"{result['name']:<42}{result['seconds']:>10.4f}s{_megabytes(result['peak_bytes']):>10} MB"
+    )
+
+
+def print_startup(result: dict):
+    heavy = ", ".join(
+        f"{package} {seconds:.2f}s" for package, seconds in result["heavy_imports"].items()
+    )
+    print(
+        f"{result['domain']:<12}{result['name']:<6}{result['seconds']:>8.3f}s"
+        f"{result['import_seconds']:>8.3f}s  {heavy or '-'}"
+    )
+
+
+def print_comparison(comparison: list[dict]) -> int:
+    print(
+        f"\n{'domain':<12}{'rows':>11}  {'stage':<11}{'name':<42}"
+        f"{'base (s)':>10}{'now (s)':>10}{'time':>8}{'memory':>8}"
+    )
+    for row in comparison:
+        time_ratio = f"{row['time_ratio']:.2f}x" if row["time_ratio"] else "-"
+        memory_ratio = f"{row['memory_ratio']:.2f}x" if row["memory_ratio"] else "-"
+        flag = "  ⚠ REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['domain']:<12}{row['rows']:>11,}  {row['stage']:<11}{row['name']:<42}"
+            f"{row['baseline_seconds']:>10.4f}{row['seconds']:>10.4f}"
+            f"{time_ratio:>8}{memory_ratio:>8}{flag}"
+        )
+
+    flagged = regressions(comparison)
+    print(f"\n{len(flagged)} regression(s) in {len(comparison)} compared measurements")
+    return 1 if flagged else 0
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Pipeline benchmark suite")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the benchmarks")
+    run.add_argument("--domains", nargs="+", choices=list(DOMAINS), default=list(DOMAINS))
+    run.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000],
+                     help="Row counts (data scales) to benchmark")
+    run.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    run.add_argument("--repeat", type=int, default=3, help="Best-of repetitions")
+    run.add_argument("--seed", type=int, default=0, help="Seed for the generated data")
+    run.add_argument("--no-memory", action="store_true", help="Skip the traced memory run")
+    run.add_argument("--data-dir", type=Path, default=DATA_DIR,
+                     help="Where generated datasets are cached")
+    run.add_argument("--save", type=Path, help="Write the run to this JSON file")
+    run.add_argument("--compare", type=Path, help="Baseline JSON to compare against")
+    run.add_argument("--tolerance", type=float, default=0.25,
+                     help="Allowed relative slowdown / memory growth")
+
+    startup = commands.add_parser(
+        "startup", help="Time dashboard start-up under python -X importtime"
+    )
+    startup.add_argument("--entry-points", nargs="+", choices=list(ENTRY_POINTS),
+                         default=list(ENTRY_POINTS))
+    startup.add_argument("--modes", nargs="+", choices=MODES, default=MODES,
+                         help="help: argument handling only; run: a full report")
+    startup.add_argument("--repeat", type=int, default=3, help="Best-of repetitions")
+    startup.add_argument("--seed", type=int, default=0, help="Seed for the generated data")
+    startup.add_argument("--data-dir", type=Path, default=DATA_DIR,
+                         help="Where generated datasets are cached")
+    startup.add_argument("--save", type=Path, help="Write the run to this JSON file")
+    startup.add_argument("--compare", type=Path, help="Baseline JSON to compare against")
+    startup.add_argument("--tolerance", type=float, default=0.25,
+                         help="Allowed relative slowdown")
+
+    compare = commands.add_parser("compare", help="Compare two stored runs")
+    compare.add_argument("baseline", type=Path)
+    compare.add_argument("current", type=Path)
+    compare.add_argument("--tolerance", type=float, default=0.25,
+                         help="Allowed relative slowdown / memory growth")
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+
+    if args.command == "compare":
+        comparison = compare_runs(
+            load_run(args.baseline), load_run(args.current),
+            time_tolerance=args.tolerance, memory_tolerance=args.tolerance,
+        )
+        sys.exit(print_comparison(comparison))
+
+    if args.command == "startup":
+        print(f"{'entry':<12}{'mode':<6}{'wall':>9}{'imports':>9}  heavy packages")
+        run = {
+            "environment": environment(),
+            "settings": {
+                "entry_points": args.entry_points,
+                "modes": args.modes,
+                "repeat": args.repeat,
+                "seed": args.seed,
+            },
+            "results": run_startup(
+                args.entry_points, args.modes, repeat=args.repeat, seed=args.seed,
+                data_dir=args.data_dir, progress=print_startup,
+            ),
+        }
+    else:
+        run = run_suite(
+            args.domains, args.rows, args.stages,
+            repeat=args.repeat, seed=args.seed, memory=not args.no_memory,
+            data_dir=args.data_dir, progress=print_result,
+        )
+
+    if args.save:
+        save_run(run, args.save)
+        print(f"\n💾 Saved run to {args.save}")
+
+    if args.compare:
+        comparison = compare_runs(
+            load_run(args.compare), run,
+            time_tolerance=args.tolerance, memory_tolerance=args.tolerance,
+        )
+        sys.exit(print_comparison(comparison))
+
+
+if __name__ == "__main__":
+    main()
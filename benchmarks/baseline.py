@@ -0,0 +1,79 @@
+"""
+JSON baselines and regression checks for benchmark runs.
+"""
+
+import json
+from pathlib import Path
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+
+# Timings below this many seconds are too noisy to flag
+MIN_SECONDS = 0.01
+
+
+def save_run(run: dict, path: Path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(run, indent=2, default=str))
+
+
+def load_run(path: Path) -> dict:
+    return json.loads(Path(path).read_text())
+
+
+def _key(result: dict) -> tuple:
+    return result["domain"], result["rows"], result["stage"], result["name"]
+
+
+def _ratio(current, baseline):
+    if current is None or baseline is None or baseline == 0:
+        return None
+    return current / baseline
+
+
+def compare_runs(baseline: dict, current: dict, time_tolerance: float = 0.25,
+                 memory_tolerance: float = 0.25, min_seconds: float = MIN_SECONDS) -> list[dict]:
+    """
+    Pair the measurements of two runs and flag regressions.
+
+    A measurement regresses when it is more than ``time_tolerance`` slower
+    (and above ``min_seconds``) or allocates more than ``memory_tolerance``
+    extra peak memory than in ``baseline``. Measurements present in only
+    one of the runs are skipped.
+    """
+    previous = {_key(result): result for result in baseline["results"]}
+
+    rows = []
+    for result in current["results"]:
+        base = previous.get(_key(result))
+        if base is None:
+            continue
+
+        time_ratio = _ratio(result["seconds"], base["seconds"])
+        memory_ratio = _ratio(result.get("peak_bytes"), base.get("peak_bytes"))
+
+        slower = (
+            time_ratio is not None
+            and time_ratio > 1 + time_tolerance
+            and result["seconds"] >= min_seconds
+        )
+        heavier = memory_ratio is not None and memory_ratio > 1 + memory_tolerance
+
+        rows.append({
+            "domain": result["domain"],
+            "rows": result["rows"],
+            "stage": result["stage"],
+            "name": result["name"],
+            "baseline_seconds": base["seconds"],
+            "seconds": result["seconds"],
+            "time_ratio": time_ratio,
+            "baseline_peak_bytes": base.get("peak_bytes"),
+            "peak_bytes": result.get("peak_bytes"),
+            "memory_ratio": memory_ratio,
+            "regression": slower or heavier,
+        })
+    return rows
+
+
+def regressions(comparison: list[dict]) -> list[dict]:
+    return [row for row in comparison if row["regression"]]
@@ -0,0 +1,93 @@
+"""
+Benchmark: Year/Month partitioned weather store
+Times a fresh ingest, an incremental ingest (a prefix of the file, then
+the whole file) and a one-year range read on generated data, and checks
+that the incremental store holds exactly the rows of the fresh one.
+
+Usage:
+    python benchmarks/bench_partitions.py --rows 200000 1000000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from benchmarks.suite import DATA_DIR, dataset_file
+from src.common.data_loader import load_csv
+from src.weather_trends_analysis.partitions import WeatherPartitionStore
+
+
+def assert_same_rows(expected: pd.DataFrame, actual: pd.DataFrame, label: str):
+    columns = list(expected.columns)
+    pd.testing.assert_frame_equal(
+        expected.sort_values(columns).reset_index(drop=True),
+        actual[columns].sort_values(columns).reset_index(drop=True),
+        obj=label,
+    )
+
+
+def run(rows_list, prefix: float, seed: int, data_dir: Path):
+    print(f"{'rows':>12}{'fresh (s)':>12}{'prefix (s)':>12}{'rest (s)':>12}{'read 1y (s)':>13}")
+    print("-" * 61)
+    for rows in rows_list:
+        df = load_csv(dataset_file("weather", rows, seed, data_dir))
+        with tempfile.TemporaryDirectory() as fresh_dir, tempfile.TemporaryDirectory() as staged_dir:
+            fresh = WeatherPartitionStore(Path(fresh_dir))
+            start = time.perf_counter()
+            fresh.append(df)
+            fresh_time = time.perf_counter() - start
+
+            staged = WeatherPartitionStore(Path(staged_dir))
+            start = time.perf_counter()
+            staged.append(df.iloc[:int(rows * prefix)])
+            prefix_time = time.perf_counter() - start
+            start = time.perf_counter()
+            staged.append(df)
+            rest_time = time.perf_counter() - start
+
+            # Timestamps repeat, so this only holds if rows, not dates, are deduplicated
+            assert_same_rows(fresh.read(), staged.read(), f"weather {rows:,}")
+            assert staged.append(df) == 0, "replaying the full file added rows"
+
+            first = fresh.partitions()[0].split("/")[0].partition("=")[2]
+            start = time.perf_counter()
+            fresh.read(f"{first}-01-01", f"{int(first) + 1}-01-01")
+            read_time = time.perf_counter() - start
+
+        print(f"{rows:>12,}{fresh_time:>12.3f}{prefix_time:>12.3f}{rest_time:>12.3f}{read_time:>13.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark and check the partitioned weather store"
+    )
+    parser.add_argument(
+        "--rows",
+        type=int,
+        nargs="+",
+        default=[200_000],
+        help="Row counts to benchmark"
+    )
+    parser.add_argument(
+        "--prefix",
+        type=float,
+        default=0.5,
+        help="Share of the rows ingested before the whole file"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the generated data")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR,
+                        help="Directory for the generated CSVs")
+
+    args = parser.parse_args()
+    run(args.rows, args.prefix, args.seed, args.data_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+Benchmark: row-wise (legacy) vs vectorised preprocessing
+Compares every preprocess_* function, plus the student result resolution,
+against the original .apply(lambda ...) implementations on synthetic data
+and checks that both produce the same values before timing them.
+
+Usage:
+    python benchmarks/bench_preprocessing.py --rows 1000000 10000000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from src.common.dtypes import compact_dtypes
+from src.finance_stock_market_analysis.preprocessing import preprocess_finance_data
+from src.healthcare_covid_analysis.preprocessing import preprocess_covid_data
+from src.student_performance_analysis.analysis import _resolve_result_column
+from src.student_performance_analysis.preprocessing import preprocess_student_data
+from src.supermarket_sales_analysis.preprocessing import preprocess_sales_data
+from src.weather_trends_analysis.preprocessing import preprocess_weather_data
+
+
+# --------------------------------------------------
+# Legacy row-wise implementations
+# --------------------------------------------------
+# Original derivations kept verbatim; they run after the same
+# compact_dtypes step as the current code so that only the derivations
+# are compared.
+def legacy_covid(df):
+    df = compact_dtypes(df, "healthcare")
+    df["DIED"] = df["DATE_DIED"].apply(lambda x: 0 if x == "9999-99-99" else 1)
+    df["AGE_GROUP"] = pd.cut(
+        df["AGE"],
+        bins=[0, 18, 40, 60, 80, 120],
+        labels=["Child", "Young Adult", "Adult", "Senior", "Elderly"]
+    )
+    df["COVID_POSITIVE"] = df["CLASIFFICATION_FINAL"].apply(
+        lambda x: 1 if x in [1, 2, 3] else 0
+    )
+    return df
+
+
+def legacy_finance(df):
+    df = compact_dtypes(df, "finance")
+    df["AGE_GROUP"] = pd.cut(
+        df["age"],
+        bins=[18, 25, 35, 45, 60, 100],
+        labels=["18–25", "26–35", "36–45", "46–60", "60+"]
+    )
+    df["EQUITY_INVESTOR"] = df["Equity_Market"].apply(
+        lambda x: 1 if str(x).lower() == "yes" else 0
+    )
+    return df
+
+
+def legacy_student(df):
+    df = compact_dtypes(df, "education")
+    df["attendance_band"] = pd.cut(
+        df["attendance_percentage"],
+        bins=[0, 60, 75, 90, 100],
+        labels=["Low", "Medium", "High", "Excellent"]
+    )
+    df["study_hours_band"] = pd.cut(
+        df["study_hours"],
+        bins=[0, 2, 4, 6, 10],
+        labels=["Very Low", "Low", "Moderate", "High"]
+    )
+    return df
+
+
+def legacy_result_column(df):
+    if "final_grade" in df.columns:
+        return df["final_grade"].apply(
+            lambda x: "Pass" if str(x).lower() not in ["f", "fail"] else "Fail"
+        )
+    return df["overall_score"].apply(lambda x: "Pass" if x >= 40 else "Fail")
+
+
+def legacy_weather(df):
+    df = compact_dtypes(df, "weather")
+    df["Formatted Date"] = pd.to_datetime(df["Formatted Date"], utc=True, errors="coerce")
+    df["Year"] = df["Formatted Date"].dt.year
+    df["Month"] = df["Formatted Date"].dt.month
+    df["Month_Name"] = df["Formatted Date"].dt.month_name()
+    return df
+
+
+def legacy_sales(df):
+    df = compact_dtypes(df, "supermarket")
+    df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
+    df["Month"] = df["Date"].dt.month_name()
+    df["Day_Name"] = df["Date"].dt.day_name()
+    df["Hour"] = pd.to_datetime(df["Time"], format="%H:%M", errors="coerce").dt.hour
+    return df
+
+
+# --------------------------------------------------
+# Synthetic inputs (only the columns each step reads)
+# --------------------------------------------------
+def make_covid(rows, rng):
+    died_on = pd.date_range("2020-01-01", periods=400).strftime("%d/%m/%Y").to_numpy()
+    dates = np.where(rng.random(rows) < 0.07, rng.choice(died_on, rows), "9999-99-99")
+    return pd.DataFrame({
+        "DATE_DIED": dates,
+        "AGE": rng.integers(0, 121, rows),
+        "CLASIFFICATION_FINAL": rng.integers(1, 8, rows),
+    })
+
+
+def make_finance(rows, rng):
+    return pd.DataFrame({
+        "age": rng.integers(15, 80, rows),
+        "Equity_Market": rng.integers(1, 8, rows),
+    })
+
+
+def make_student(rows, rng):
+    return pd.DataFrame({
+        "attendance_percentage": np.round(rng.uniform(40, 100, rows), 1),
+        "study_hours": np.round(rng.uniform(0, 10, rows), 1),
+        "overall_score": np.round(rng.uniform(10, 100, rows), 1),
+        "final_grade": rng.choice(["a", "b", "c", "d", "e", "f"], rows),
+    })
+
+
+def make_weather(rows, rng):
+    stamps = pd.date_range("2006-01-01", periods=rows, freq="h", tz="Europe/Budapest")
+    return pd.DataFrame({
+        "Formatted Date": stamps.strftime("%Y-%m-%d %H:%M:%S.000 %z"),
+    })
+
+
+def make_sales(rows, rng):
+    days = pd.date_range("2023-01-01", "2023-12-31").strftime("%Y-%m-%d").to_numpy()
+    minutes = rng.integers(10 * 60, 21 * 60, rows)
+    times = pd.Series(minutes // 60).astype(str).str.zfill(2) + ":" + \
+        pd.Series(minutes % 60).astype(str).str.zfill(2)
+    dates = rng.choice(days, rows)
+    times = times.to_numpy()
+    # Malformed entries must come out as NaT, as with pd.to_datetime
+    malformed = rng.random(rows) < 0.001
+    dates[malformed] = "not a date"
+    times[malformed] = rng.choice(["7pm", "2023-05-01", "25:61"], malformed.sum())
+    return pd.DataFrame({
+        "Date": dates,
+        "Time": times,
+    })
+
+
+def _without_grade(df):
+    return df.drop(columns="final_grade")
+
+
+CASES = {
+    "covid": (make_covid, legacy_covid, preprocess_covid_data,
+              ["DIED", "AGE_GROUP", "COVID_POSITIVE"]),
+    "finance": (make_finance, legacy_finance, preprocess_finance_data,
+                ["AGE_GROUP", "EQUITY_INVESTOR"]),
+    "student": (make_student, legacy_student, preprocess_student_data,
+                ["attendance_band", "study_hours_band"]),
+    "student_result_grade": (make_student, legacy_result_column,
+                             _resolve_result_column, None),
+    "student_result_score": (lambda rows, rng: _without_grade(make_student(rows, rng)),
+                             legacy_result_column, _resolve_result_column, None),
+    "weather": (make_weather, legacy_weather, preprocess_weather_data,
+                ["Year", "Month", "Month_Name"]),
+    "sales": (make_sales, legacy_sales, preprocess_sales_data,
+              ["Month", "Day_Name", "Hour"]),
+}
+
+
+# --------------------------------------------------
+# Equivalence and timing
+# --------------------------------------------------
+def assert_equivalent(legacy: pd.Series, current: pd.Series, label: str):
+    pd.testing.assert_series_equal(
+        legacy.astype(object), current.astype(object),
+        check_names=False, obj=label,
+    )
+    # Grouping on the new column must keep the legacy group order
+    legacy_order = legacy.dropna().drop_duplicates().sort_values().astype(object)
+    current_order = pd.Series(current.dropna().unique()).sort_values().astype(object)
+    assert list(legacy_order) == list(current_order), f"{label}: group order differs"
+
+
+def check_case(name, legacy_out, current_out):
+    columns = CASES[name][3]
+    if columns is None:
+        assert_equivalent(legacy_out, current_out, name)
+    else:
+        for column in columns:
+            assert_equivalent(legacy_out[column], current_out[column], f"{name}.{column}")
+
+
+def time_call(func, df, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(df)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(rows_list, cases, repeat, seed):
+    rng = np.random.default_rng(seed)
+
+    # Empty inputs (e.g. a filter matching nothing) must not break either path
+    for name in cases:
+        make, legacy, current, _ = CASES[name]
+        df = make(0, rng)
+        check_case(name, legacy(df.copy()), current(df.copy()))
+
+    print(f"{'case':<22}{'rows':>12}{'legacy (s)':>13}{'vectorised (s)':>16}{'speedup':>10}")
+    print("-" * 73)
+    for rows in rows_list:
+        for name in cases:
+            make, legacy, current, _ = CASES[name]
+            df = make(rows, rng)
+
+            legacy_time, legacy_out = time_call(legacy, df, repeat)
+            current_time, current_out = time_call(current, df, repeat)
+
+            check_case(name, legacy_out, current_out)
+
+            print(
+                f"{name:<22}{rows:>12,}{legacy_time:>13.3f}{current_time:>16.3f}"
+                f"{legacy_time / current_time:>9.1f}x"
+            )
+            del df, legacy_out, current_out
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark legacy vs vectorised preprocessing"
+    )
+    parser.add_argument(
+        "--rows",
+        type=int,
+        nargs="+",
+        default=[1_000_000, 10_000_000],
+        help="Row counts to benchmark"
+    )
+    parser.add_argument(
+        "--cases",
+        nargs="+",
+        choices=list(CASES),
+        default=list(CASES),
+        help="Subset of cases to run"
+    )
+    parser.add_argument("--repeat", type=int, default=1, help="Best-of repetitions")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+
+    args = parser.parse_args()
+    run(args.rows, args.cases, args.repeat, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Start-up cost of the command line entry points.
+
+Every dashboard is launched in a fresh interpreter under
+``python -X importtime``, either with ``--help`` (argument handling only)
+or producing its full report on a small generated dataset. A measurement
+records the best wall time of the process, the time its imports took and
+how long each heavy package that got imported at all cost.
+"""
+
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.suite import DATA_DIR, dataset_file
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+ENTRY_POINTS = {
+    "supermarket": "dashboards/supermarket_dashboard.py",
+    "education": "dashboards/student_dashboard.py",
+    "weather": "dashboards/weather_dashboard.py",
+    "healthcare": "dashboards/healthcare_dashboard.py",
+    "finance": "dashboards/finance_dashboard.py",
+}
+
+MODES = ["help", "run"]
+
+# Packages whose import cost is reported separately
+HEAVY_PACKAGES = ("pandas", "numpy", "pyarrow", "matplotlib", "seaborn", "scipy")
+
+# Dataset size for "run": large enough to exercise every code path,
+# small enough that imports dominate
+RUN_ROWS = 1_000
+
+
+def parse_importtime(stderr: str) -> dict:
+    """
+    ``{module: (self seconds, cumulative seconds)}`` from ``-X importtime``
+    output.
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|", 2)
+        if not own.strip().isdigit():
+            continue  # header line
+        modules[name.strip()] = (int(own) / 1e6, int(cumulative) / 1e6)
+    return modules
+
+
+def measure_startup(script: str, args: list[str], repeat: int = 1) -> dict:
+    """
+    Best-of-``repeat`` wall time of ``python -X importtime script *args``.
+    """
+    command = [sys.executable, "-X", "importtime", str(PROJECT_ROOT / script), *args]
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        completed = subprocess.run(command, capture_output=True, text=True, cwd=PROJECT_ROOT)
+        seconds = time.perf_counter() - start
+        if completed.returncode != 0:
+            raise RuntimeError(f"{script} {' '.join(args)} failed:\n{completed.stderr[-2000:]}")
+        if best is None or seconds < best["seconds"]:
+            modules = parse_importtime(completed.stderr)
+            best = {
+                "seconds": seconds,
+                "import_seconds": sum(own for own, _ in modules.values()),
+                "heavy_imports": {
+                    package: modules[package][1]
+                    for package in HEAVY_PACKAGES
+                    if package in modules
+                },
+            }
+    return best
+
+
+def _arguments(entry_point: str, mode: str, seed: int, data_dir: Path) -> list[str]:
+    if mode == "help":
+        return ["--help"]
+    return ["--data", str(dataset_file(entry_point, RUN_ROWS, seed, data_dir))]
+
+
+def run_startup(entry_points: list[str], modes: list[str] = MODES, repeat: int = 1,
+                seed: int = 0, data_dir: Path = DATA_DIR, progress=None) -> list[dict]:
+    """
+    Start-up measurements of every entry point in every mode, in the
+    result format of ``run_suite`` (stage ``"startup"``).
+    """
+    results = []
+    for entry_point in entry_points:
+        for mode in modes:
+            args = _arguments(entry_point, mode, seed, data_dir)
+            result = {
+                "domain": entry_point,
+                "rows": RUN_ROWS if mode == "run" else 0,
+                "stage": "startup",
+                "name": mode,
+                "peak_bytes": None,
+                **measure_startup(ENTRY_POINTS[entry_point], args, repeat),
+            }
+            if progress:
+                progress(result)
+            results.append(result)
+    return results
@@ -0,0 +1,159 @@
+"""
+Stage-by-stage timing and memory profiling on generated datasets.
+
+Each measurement records the best wall time over ``repeat`` runs and, in
+a separate traced run, the peak memory allocated through Python and
+NumPy (``tracemalloc``). Allocations made by Arrow when reading Parquet
+snapshots are not traced.
+"""
+
+import platform
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.common.data_loader import load_csv
+from src.common.domains import (
+    DOMAINS,
+    analysis_jobs,
+    domain_module,
+    insight_functions,
+    plot_jobs,
+)
+from src.common.synthetic import write_dataset
+
+STAGES = ["load", "preprocess", "analysis", "insights", "render"]
+
+# Generated CSVs are kept here and reused across runs
+DATA_DIR = Path(__file__).resolve().parent / ".data"
+
+
+def measure(func, *args, repeat: int = 1, memory: bool = True) -> dict:
+    """
+    Best-of-``repeat`` wall time and (optionally) traced peak memory.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            func(*args)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {"seconds": best, "peak_bytes": peak}
+
+
+def dataset_file(domain: str, rows: int, seed: int, data_dir: Path = DATA_DIR) -> Path:
+    """
+    Path of the generated CSV for ``(domain, rows, seed)``, writing it once.
+    """
+    path = Path(data_dir) / f"{domain}_{rows}_{seed}.csv"
+    if not path.exists():
+        write_dataset(domain, rows, path, seed=seed)
+    return path
+
+
+def _label(name: str, args: tuple) -> str:
+    if not args:
+        return name
+    return f"{name}({', '.join(map(str, args))})"
+
+
+def run_domain(domain: str, rows: int, stages: list[str], repeat: int = 1, seed: int = 0,
+               memory: bool = True, data_dir: Path = DATA_DIR) -> list[dict]:
+    path = dataset_file(domain, rows, seed, data_dir)
+    results = []
+
+    def record(stage, name, func, *args):
+        result = measure(func, *args, repeat=repeat, memory=memory)
+        results.append({"domain": domain, "rows": rows, "stage": stage, "name": name, **result})
+
+    if "load" in stages:
+        record("load", "load_csv", lambda p: load_csv(p, use_cache=False), path)
+        load_csv(path)  # write the Parquet snapshot once before timing reads
+        record("load", "load_csv[snapshot]", load_csv, path)
+
+    # Each preprocessing step is measured on the output of the previous one
+    df = load_csv(path)
+    for step in DOMAINS[domain]["preprocess"]:
+        module, name = step.split(":")
+        step_func = getattr(domain_module(domain, module), name)
+        if "preprocess" in stages:
+            record("preprocess", name, step_func, df)
+        df = step_func(df)
+
+    if "analysis" in stages:
+        module = domain_module(domain, "analysis")
+        for name, args in analysis_jobs(domain):
+            record("analysis", _label(name, args), getattr(module, name), df, *args)
+
+    if "insights" in stages:
+        module = domain_module(domain, "insights")
+        for name in insight_functions(domain):
+            record("insights", name, getattr(module, name), df)
+
+    if "render" in stages:
+        import matplotlib
+        matplotlib.use("Agg")
+
+        from src.common.plot_cache import configure_cache
+        # Measure drawing, not copies of previously rendered charts
+        configure_cache(enabled=False)
+
+        module = domain_module(domain, "visualization")
+        with tempfile.TemporaryDirectory() as output_dir:
+            for name, args in plot_jobs(domain):
+                record("render", _label(name, args), getattr(module, name), df, Path(output_dir), *args)
+
+    return results
+
+
+def environment() -> dict:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def run_suite(domains: list[str], rows_list: list[int], stages: list[str] = STAGES,
+              repeat: int = 1, seed: int = 0, memory: bool = True,
+              data_dir: Path = DATA_DIR, progress=None) -> dict:
+    """
+    Benchmark ``stages`` of every domain at every row count.
+    """
+    results = []
+    for rows in rows_list:
+        for domain in domains:
+            domain_results = run_domain(domain, rows, stages, repeat, seed, memory, data_dir)
+            if progress:
+                for result in domain_results:
+                    progress(result)
+            results.extend(domain_results)
+
+    return {
+        "environment": environment(),
+        "settings": {
+            "domains": domains,
+            "rows": rows_list,
+            "stages": stages,
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": results,
+    }
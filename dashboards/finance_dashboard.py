@@ -4,31 +4,25 @@ Project 5 – Finance Analytics
 Author: Rahul Mahakal
 """
 
+from __future__ import annotations
+
 import argparse
 from textwrap import fill
-import pandas as pd
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 # --------------------------------------------------
 # Resolve project paths
 # --------------------------------------------------
 # Add project root to Python path
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
 sys.path.append(str(PROJECT_ROOT / "src"))
 
-from src.finance_stock_market_analysis.preprocessing import preprocess_finance_data
-from src.finance_stock_market_analysis.analysis import (
-    overview_metrics,
-    equity_by_gender,
-    equity_by_age_group,
-)
-from src.finance_stock_market_analysis.insights import generate_finance_insights
-from src.finance_stock_market_analysis.report_generator import (
-    overview_text,
-    recommendations,
-)
-
 
 def print_header(title: str):
     print("\n" + "=" * 50)
@@ -38,17 +32,37 @@ def print_header(title: str):
 # --------------------------------------------------
 # Data loading
 # --------------------------------------------------
-def load_data(csv_path: Path) -> pd.DataFrame:
+def load_data(csv_path: Path, filters=None) -> pd.DataFrame:
     if not csv_path.exists():
         raise FileNotFoundError(f"Dataset not found: {csv_path}")
-    return pd.read_csv(csv_path)
+
+    from src.common.data_loader import load_csv
+    return load_csv(csv_path, filters=filters)
 
 # --------------------------------------------------
 # Dashboard Logic
 # --------------------------------------------------
-def run_dashboard(data_path: str):
-    df = load_data(Path(data_path))
-    df = preprocess_finance_data(df)
+def prepare_data(data_path: str, filters=None):
+    from src.common.aggregation import has_rows
+    from src.finance_stock_market_analysis.preprocessing import preprocess_finance_data
+
+    df = load_data(Path(data_path), filters)
+    if filters and not has_rows(df):
+        sys.exit(f"❌ No rows match --filter {', '.join(filters)}")
+    return preprocess_finance_data(df)
+
+
+def print_report(df):
+    from src.finance_stock_market_analysis.analysis import (
+        overview_metrics,
+        equity_by_gender,
+        equity_by_age_group,
+    )
+    from src.finance_stock_market_analysis.insights import generate_finance_insights
+    from src.finance_stock_market_analysis.report_generator import (
+        overview_text,
+        recommendations,
+    )
 
     metrics = overview_metrics(df)
     insights = generate_finance_insights(df)
@@ -114,6 +128,10 @@ def run_dashboard(data_path: str):
     # Call your analysis / visualization logic here
     print("✅ Finance Stock-Market dashboard loaded successfully")
 
+
+def run_dashboard(data_path: str, filters=None):
+    print_report(prepare_data(data_path, filters))
+
 # --------------------------------------------------
 # Entry Point
 # --------------------------------------------------
@@ -129,6 +147,16 @@ def main():
         help="Path to Finance_data.csv (relative to project root)"
     )
 
+    parser.add_argument(
+        "--filter",
+        action="append",
+        default=[],
+        dest="filters",
+        metavar="EXPR",
+        help="Only load rows matching EXPR on a raw dataset column, e.g. "
+             "'gender==Female' (repeatable; all must match)"
+    )
+
     args = parser.parse_args()
 
     BASE_DIR = Path(__file__).resolve().parents[1]
@@ -137,7 +165,7 @@ def main():
     if not data_path.exists():
         raise FileNotFoundError(f"Dataset not found: {data_path}")
 
-    run_dashboard(str(data_path))
+    run_dashboard(str(data_path), args.filters)
 
 
 if __name__ == "__main__":
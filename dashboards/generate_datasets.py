@@ -0,0 +1,85 @@
+"""
+CLI for generating synthetic datasets
+Writes schema-faithful versions of the five datasets at any scale
+Author: Rahul Mahakal
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# --------------------------------------------------
+# Resolve project paths
+# --------------------------------------------------
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+sys.path.append(str(PROJECT_ROOT / "src"))
+
+from src.common.data_loader import DATASET_PATHS
+from src.common.synthetic import DEFAULT_CHUNK_ROWS, GENERATORS, write_dataset
+
+
+# --------------------------------------------------
+# CLI Handling
+# --------------------------------------------------
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Generate synthetic datasets matching the real schemas"
+    )
+    parser.add_argument(
+        "--datasets",
+        nargs="+",
+        choices=list(GENERATORS),
+        default=list(GENERATORS),
+        help="Datasets to generate"
+    )
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=100_000,
+        help="Rows per dataset (10k to 100M+)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=["csv", "parquet"],
+        default="csv",
+        help="Output format"
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="datasets/synthetic",
+        help="Output folder (relative to project root)"
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=DEFAULT_CHUNK_ROWS,
+        help="Rows generated and held in memory at a time"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    return parser.parse_args()
+
+
+# --------------------------------------------------
+# Entry Point
+# --------------------------------------------------
+def main():
+    args = parse_arguments()
+    output_dir = PROJECT_ROOT / args.output
+
+    for name in args.datasets:
+        # Same file names as the real datasets, so dashboards can point at them
+        path = output_dir / DATASET_PATHS[name].with_suffix(f".{args.format}").name
+
+        start = time.perf_counter()
+        write_dataset(name, args.rows, path, args.format, args.chunk_rows, args.seed)
+        elapsed = time.perf_counter() - start
+
+        size_mb = path.stat().st_size / 2**20
+        print(f"✅ {name:<12}{args.rows:>13,} rows  {size_mb:>9.1f} MB  {elapsed:>7.1f}s  → {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,30 +4,25 @@ Project 4 – Healthcare Analytics
 Author: Rahul Mahakal
 """
 
+from __future__ import annotations
+
 import argparse
 from textwrap import fill
-import pandas as pd
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 # --------------------------------------------------
 # Resolve project paths
 # --------------------------------------------------
 # Add project root to Python path
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
 sys.path.append(str(PROJECT_ROOT / "src"))
 
-from src.healthcare_covid_analysis.preprocessing import preprocess_covid_data
-from src.healthcare_covid_analysis.analysis import (
-    overview_metrics,
-    mortality_by_age_group,
-    comorbidity_mortality,
-)
-from src.healthcare_covid_analysis.insights import generate_healthcare_insights
-from src.healthcare_covid_analysis.report_generator import (
-    overview_text,
-    recommendations,
-)
 import warnings
 warnings.filterwarnings("ignore", category=FutureWarning)
 
@@ -40,17 +35,57 @@ def print_header(title: str):
 # --------------------------------------------------
 # Data loading
 # --------------------------------------------------
-def load_data(csv_path: Path) -> pd.DataFrame:
+def load_data(csv_path: Path, filters=None) -> pd.DataFrame:
     if not csv_path.exists():
         raise FileNotFoundError(f"Dataset not found: {csv_path}")
-    return pd.read_csv(csv_path)
+
+    from src.common.data_loader import load_csv
+    return load_csv(csv_path, filters=filters)
 
 # --------------------------------------------------
 # Dashboard Logic
 # --------------------------------------------------
-def run_dashboard(data_path: str):
-    df = load_data(Path(data_path))
-    df = preprocess_covid_data(df)
+def prepare_data(data_path: str, chunksize: int | None = None, filters=None):
+    from src.common.aggregation import has_rows
+    from src.common.data_loader import stream_dataset
+    from src.healthcare_covid_analysis.bitmap_index import CovidBitmapIndex
+    from src.healthcare_covid_analysis.preprocessing import preprocess_covid_data
+
+    if chunksize:
+        # Stream the file instead of materialising it in memory
+        df = stream_dataset("healthcare", Path(data_path), chunksize, filters)
+    else:
+        df = load_data(Path(data_path), filters)
+    if filters and not has_rows(df):
+        sys.exit(f"❌ No rows match --filter {', '.join(filters)}")
+
+    if chunksize:
+        df = df.map(preprocess_covid_data)
+    else:
+        df = preprocess_covid_data(df)
+
+    # Groupings by the patient flags are answered from bitsets; the others
+    # are computed once and shared through the context, and prefetching lets
+    # a chunk stream produce them all in a single pass
+    return CovidBitmapIndex.build(df)
+
+
+def print_report(df):
+    from src.healthcare_covid_analysis.analysis import (
+        COMORBIDITIES,
+        overview_metrics,
+        mortality_by_age_group,
+        comorbidity_mortality,
+    )
+    from src.healthcare_covid_analysis.insights import generate_healthcare_insights
+    from src.healthcare_covid_analysis.report_generator import (
+        overview_text,
+        recommendations,
+    )
+
+    df.prefetch(
+        [(key, "DIED", "mean") for key in ["AGE_GROUP", "ICU", *COMORBIDITIES]]
+    )
 
     metrics = overview_metrics(df)
     insights = generate_healthcare_insights(df)
@@ -76,7 +111,7 @@ def run_dashboard(data_path: str):
     # ---------------- COMORBIDITY INSIGHTS ----------------
     print("\n🧬 COMORBIDITY INSIGHTS:")
     print("=" * 25)
-    for condition in ["DIABETES", "HIPERTENSION", "OBESITY"]:
+    for condition in COMORBIDITIES:
         rate = comorbidity_mortality(df, condition)
         print(f"• {condition.capitalize()} Mortality Rate: {rate:.2f}%")
 
@@ -104,6 +139,10 @@ def run_dashboard(data_path: str):
     # Call your analysis / visualization logic here
     print("✅ Healthcare-Covid-19 dashboard loaded successfully")
 
+
+def run_dashboard(data_path: str, chunksize: int | None = None, filters=None):
+    print_report(prepare_data(data_path, chunksize, filters))
+
 # --------------------------------------------------
 # Entry Point
 # --------------------------------------------------
@@ -118,6 +157,23 @@ def main():
         help="Path to Covid Data.csv (relative to project root)"
     )
 
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=None,
+        help="Stream the dataset in chunks of this many rows"
+    )
+
+    parser.add_argument(
+        "--filter",
+        action="append",
+        default=[],
+        dest="filters",
+        metavar="EXPR",
+        help="Only load rows matching EXPR on a raw dataset column, e.g. "
+             "'AGE in 60,70,80' or 'SEX==1' (repeatable; all must match)"
+    )
+
     args = parser.parse_args()
 
     BASE_DIR = Path(__file__).resolve().parents[1]
@@ -126,7 +182,7 @@ def main():
     if not data_path.exists():
         raise FileNotFoundError(f"Dataset not found: {data_path}")
 
-    run_dashboard(str(data_path))
+    run_dashboard(str(data_path), args.chunksize, args.filters)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,118 @@
+"""
+CLI for regenerating the visualizations/ tree
+Renders every chart of the selected domains across a process pool
+Author: Rahul Mahakal
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# --------------------------------------------------
+# Resolve project paths
+# --------------------------------------------------
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+sys.path.append(str(PROJECT_ROOT / "src"))
+
+from src.common.domains import DOMAINS, VISUALIZATIONS_DIR
+
+
+# --------------------------------------------------
+# CLI Handling
+# --------------------------------------------------
+def parse_data_overrides(values: list[str]) -> dict:
+    overrides = {}
+    for value in values:
+        domain, _, path = value.partition("=")
+        if domain not in DOMAINS or not path:
+            raise SystemExit(f"Invalid --data value: {value!r} (expected DOMAIN=PATH)")
+        overrides[domain] = PROJECT_ROOT / path
+    return overrides
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Render all visualization charts in parallel"
+    )
+    parser.add_argument(
+        "--domains",
+        nargs="+",
+        choices=list(DOMAINS),
+        default=list(DOMAINS),
+        help="Domains to render"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: number of CPUs, 1 = no pool)"
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=str(VISUALIZATIONS_DIR.relative_to(PROJECT_ROOT)),
+        help="Output root (relative to project root)"
+    )
+    parser.add_argument(
+        "--data",
+        action="append",
+        default=[],
+        metavar="DOMAIN=PATH",
+        help="Dataset path override for a domain (relative to project root)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Redraw every chart instead of reusing unchanged ones from the plot cache"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Plot cache directory (relative to project root, default: visualizations/.cache)"
+    )
+    return parser.parse_args()
+
+
+# --------------------------------------------------
+# Entry Point
+# --------------------------------------------------
+def main():
+    args = parse_arguments()
+
+    # Loads matplotlib, so only once the arguments are known to be valid
+    from src.common.rendering import render_all
+
+    start = time.perf_counter()
+    results = render_all(
+        domains=args.domains,
+        workers=args.workers,
+        data_paths=parse_data_overrides(args.data),
+        root=PROJECT_ROOT / args.output,
+        cache=not args.no_cache,
+        cache_dir=PROJECT_ROOT / args.cache_dir if args.cache_dir else None,
+    )
+    elapsed = time.perf_counter() - start
+
+    failures = [result for result in results if result["error"]]
+    for result in results:
+        label = result["plot"] or "(dataset)"
+        if result["args"]:
+            label += f" {', '.join(map(str, result['args']))}"
+        status = "FAILED" if result["error"] else ("cached" if result["cached"] else "ok")
+        print(f"{result['domain']:<12}{label:<48}{result['seconds']:>8.2f}s  {status}")
+
+    for result in failures:
+        print(f"\n❌ {result['domain']} {result['plot'] or ''}\n{result['error']}")
+
+    cached = sum(result["cached"] for result in results)
+    print(f"\n✅ Rendered {len(results) - len(failures)} charts "
+          f"({cached} from cache) in {elapsed:.1f}s")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+CLI for running several dashboards in one go
+Loads each dataset once and runs the selected domains concurrently on
+threads of this interpreter, then prints every report followed by a
+per-domain timing summary
+Author: Rahul Mahakal
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+from pathlib import Path
+
+# --------------------------------------------------
+# Resolve project paths
+# --------------------------------------------------
+DASHBOARDS_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = DASHBOARDS_DIR.parent
+sys.path.append(str(PROJECT_ROOT))
+sys.path.append(str(PROJECT_ROOT / "src"))
+sys.path.append(str(DASHBOARDS_DIR))
+
+# Dashboard module of every domain; each exposes prepare_data(path) and
+# print_report(data)
+DASHBOARDS = {
+    "supermarket": "supermarket_dashboard",
+    "education": "student_dashboard",
+    "weather": "weather_dashboard",
+    "healthcare": "healthcare_dashboard",
+    "finance": "finance_dashboard",
+}
+
+
+# --------------------------------------------------
+# Per-thread output capture
+# --------------------------------------------------
+class _ThreadOutput(io.TextIOBase):
+    """
+    Stand-in for ``sys.stdout`` sending every thread's output to the
+    stream that thread captures into, or to the real stdout otherwise.
+    ``contextlib.redirect_stdout`` swaps the stream for the whole process,
+    so it cannot separate reports printed at the same time.
+    """
+
+    def __init__(self, stdout):
+        self.stdout = stdout
+        self.local = threading.local()
+
+    def _target(self):
+        return getattr(self.local, "stream", None) or self.stdout
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def flush(self):
+        self._target().flush()
+
+
+@contextlib.contextmanager
+def _capture_stdout(stream: io.StringIO):
+    """
+    Send what the current thread prints to ``stream``.
+    """
+    router = sys.stdout
+    if not isinstance(router, _ThreadOutput):
+        with contextlib.redirect_stdout(stream):
+            yield
+        return
+
+    router.local.stream = stream
+    try:
+        yield
+    finally:
+        router.local.stream = None
+
+
+# --------------------------------------------------
+# Running dashboards
+# --------------------------------------------------
+def run_domain(domain: str, data_path: str) -> dict:
+    """
+    Load one domain's dataset and capture its report; failures are
+    captured in the result rather than raised.
+    """
+    output = io.StringIO()
+    timings = {"load_seconds": 0.0, "report_seconds": 0.0}
+    error = None
+    try:
+        dashboard = import_module(DASHBOARDS[domain])
+        with _capture_stdout(output):
+            start = time.perf_counter()
+            data = dashboard.prepare_data(data_path)
+            timings["load_seconds"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            dashboard.print_report(data)
+            timings["report_seconds"] = time.perf_counter() - start
+    except Exception:
+        error = traceback.format_exc()
+
+    return {"domain": domain, "output": output.getvalue(), **timings, "error": error}
+
+
+def run_all(domains: list[str], workers: int | None = None,
+            data_paths: dict | None = None, on_result=None) -> list[dict]:
+    """
+    Run the dashboards of ``domains`` and return their results in order.
+
+    Every domain runs in the calling process, up to ``workers`` at once on
+    threads (default: one per domain, capped at the number of CPUs), so
+    pandas and the analysis stack are imported a single time;
+    ``workers=1`` runs them one after another. ``on_result`` is called
+    with every result, in order, as soon as it is available.
+    """
+    from src.common.data_loader import DATASET_PATHS
+
+    data_paths = data_paths or {}
+    workers = workers or min(len(domains), os.cpu_count() or 1)
+    on_result = on_result or (lambda result: None)
+
+    jobs = [(domain, str(data_paths.get(domain, DATASET_PATHS[domain]))) for domain in domains]
+
+    results = []
+    if workers == 1:
+        for job in jobs:
+            results.append(run_domain(*job))
+            on_result(results[-1])
+        return results
+
+    router = _ThreadOutput(sys.stdout)
+    sys.stdout = router
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_domain, *job) for job in jobs]
+            for future in futures:
+                results.append(future.result())
+                on_result(results[-1])
+    finally:
+        sys.stdout = router.stdout
+    return results
+
+
+# --------------------------------------------------
+# CLI Handling
+# --------------------------------------------------
+def parse_data_overrides(values: list[str]) -> dict:
+    overrides = {}
+    for value in values:
+        domain, _, path = value.partition("=")
+        if domain not in DASHBOARDS or not path:
+            raise SystemExit(f"Invalid --data value: {value!r} (expected DOMAIN=PATH)")
+        overrides[domain] = PROJECT_ROOT / path
+    return overrides
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Run several dashboards in one process"
+    )
+    parser.add_argument(
+        "--domains",
+        nargs="+",
+        choices=list(DASHBOARDS),
+        default=list(DASHBOARDS),
+        help="Domains to report on"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Domains run at once on threads (default: one per domain up to "
+             "the number of CPUs, 1 = one after another)"
+    )
+    parser.add_argument(
+        "--data",
+        action="append",
+        default=[],
+        metavar="DOMAIN=PATH",
+        help="Dataset path override for a domain (relative to project root)"
+    )
+    return parser.parse_args()
+
+
+def print_result(result: dict):
+    print(result["output"], end="")
+    if result["error"]:
+        print(f"\n❌ {result['domain']} dashboard failed\n{result['error']}")
+
+
+def print_summary(results: list[dict], elapsed: float):
+    print(f"\n{'domain':<12}{'load':>9}{'report':>9}{'total':>9}")
+    for result in results:
+        total = result["load_seconds"] + result["report_seconds"]
+        status = "  FAILED" if result["error"] else ""
+        print(
+            f"{result['domain']:<12}{result['load_seconds']:>8.2f}s"
+            f"{result['report_seconds']:>8.2f}s{total:>8.2f}s{status}"
+        )
+
+    failures = sum(1 for result in results if result["error"])
+    print(f"\n✅ Ran {len(results) - failures} of {len(results)} dashboards in {elapsed:.1f}s")
+
+
+# --------------------------------------------------
+# Entry Point
+# --------------------------------------------------
+def main():
+    args = parse_arguments()
+    data_paths = parse_data_overrides(args.data)
+
+    start = time.perf_counter()
+    results = run_all(args.domains, args.workers, data_paths, on_result=print_result)
+    print_summary(results, time.perf_counter() - start)
+
+    if any(result["error"] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+CLI for the resident analytics server
+Loads the selected datasets once and answers analysis functions and
+insight generators as JSON, reloading a dataset when its file changes
+Author: Rahul Mahakal
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# --------------------------------------------------
+# Resolve project paths
+# --------------------------------------------------
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+sys.path.append(str(PROJECT_ROOT / "src"))
+
+DOMAIN_NAMES = ["supermarket", "education", "weather", "healthcare", "finance"]
+
+
+# --------------------------------------------------
+# CLI Handling
+# --------------------------------------------------
+def parse_data_overrides(values: list[str]) -> dict:
+    overrides = {}
+    for value in values:
+        domain, _, path = value.partition("=")
+        if domain not in DOMAIN_NAMES or not path:
+            raise SystemExit(f"Invalid --data value: {value!r} (expected DOMAIN=PATH)")
+        overrides[domain] = PROJECT_ROOT / path
+    return overrides
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Serve the analysis functions and insights as JSON over HTTP"
+    )
+    parser.add_argument(
+        "--domains",
+        nargs="+",
+        choices=DOMAIN_NAMES,
+        default=DOMAIN_NAMES,
+        help="Domains to keep loaded"
+    )
+    parser.add_argument(
+        "--data",
+        action="append",
+        default=[],
+        metavar="DOMAIN=PATH",
+        help="Dataset path override for a domain (relative to project root)"
+    )
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Interface to listen on"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8050,
+        help="Port to listen on (0 = any free port)"
+    )
+    parser.add_argument(
+        "--poll",
+        type=float,
+        default=2.0,
+        help="Seconds between checks for changed dataset files (0 = never reload)"
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Do not log requests"
+    )
+    return parser.parse_args()
+
+
+# --------------------------------------------------
+# Entry Point
+# --------------------------------------------------
+def main():
+    args = parse_arguments()
+    data_paths = parse_data_overrides(args.data)
+
+    from src.common.server import create_server
+
+    def log(message: str):
+        print(message, flush=True)
+
+    server = create_server(
+        args.domains,
+        data_paths,
+        host=args.host,
+        port=args.port,
+        poll_interval=args.poll or None,
+        log=log,
+        log_requests=not args.quiet,
+    )
+
+    host, port = server.server_address[:2]
+    print(f"\n✅ Serving {', '.join(server.states)} on http://{host}:{port}/", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping server")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,29 +4,25 @@ OS-independent | Project 2
 Author: Rahul Mahakal
 """
 
+from __future__ import annotations
+
 import argparse
 from textwrap import fill
-import pandas as pd
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 # --------------------------------------------------
 # Resolve project paths
 # --------------------------------------------------
 # Add project root to Python path
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
 sys.path.append(str(PROJECT_ROOT / "src"))
 
-from src.student_performance_analysis.preprocessing import preprocess_student_data
-from src.student_performance_analysis.analysis import (
-    overview_metrics,
-    subject_average_scores,
-)
-from src.student_performance_analysis.insights import generate_insights
-from src.student_performance_analysis.report_generator import (
-    overview_text,
-    recommendations,
-)
 
 # --------------------------------------------------
 # Data and Dashboard Logic
@@ -37,15 +33,34 @@ def print_header(title: str):
     print("=" * 50)
 
 
-def load_data(csv_path: Path) -> pd.DataFrame:
+def load_data(csv_path: Path, filters=None) -> pd.DataFrame:
     if not csv_path.exists():
         raise FileNotFoundError(f"Dataset not found: {csv_path}")
-    return pd.read_csv(csv_path)
+
+    from src.common.data_loader import load_csv
+    return load_csv(csv_path, filters=filters)
 
 
-def run_dashboard(data_path: str):
-    df = load_data(Path(data_path))
-    df = preprocess_student_data(df)
+def prepare_data(data_path: str, filters=None):
+    from src.common.aggregation import has_rows
+    from src.student_performance_analysis.preprocessing import preprocess_student_data
+
+    df = load_data(Path(data_path), filters)
+    if filters and not has_rows(df):
+        sys.exit(f"❌ No rows match --filter {', '.join(filters)}")
+    return preprocess_student_data(df)
+
+
+def print_report(df, cohort: dict | None = None):
+    from src.student_performance_analysis.analysis import (
+        overview_metrics,
+        subject_average_scores,
+    )
+    from src.student_performance_analysis.insights import generate_insights
+    from src.student_performance_analysis.report_generator import (
+        overview_text,
+        recommendations,
+    )
 
     # --------------------------------------------------
     # PRINT REPORT
@@ -97,6 +112,10 @@ def run_dashboard(data_path: str):
     for idx, rec in enumerate(recommendations(), 1):
         print(f"{idx}. {fill(rec, width=46)}")
 
+    # ---------------- COHORT DRILL-DOWN ----------------
+    if cohort:
+        print_cohort(df, cohort)
+
     print("\n" + "=" * 50)
     print("END OF REPORT".center(50))
     print("=" * 50 + "\n")
@@ -105,6 +124,27 @@ def run_dashboard(data_path: str):
     print("✅ Student dashboard loaded successfully")
 
 
+def print_cohort(df, cohort: dict):
+    from src.student_performance_analysis.analysis import cohort_summary
+
+    summary = cohort_summary(df, **cohort)
+
+    print("\n🔎 COHORT DRILL-DOWN:")
+    print("=" * 22)
+    print(f"• Cohort: {', '.join(f'{key}={value}' for key, value in cohort.items())}")
+    print(f"• Students: {summary['students']:,}")
+    if not summary["students"]:
+        return
+    print(f"• Pass Rate: {summary['pass_rate']:.2f}%")
+    for subject, row in summary["scores"].iterrows():
+        subject_name = subject.replace("_score", "").capitalize()
+        print(f"• {subject_name}: {row['mean']:.2f} ± {row['std']:.2f}")
+
+
+def run_dashboard(data_path: str, filters=None, cohort: dict | None = None):
+    print_report(prepare_data(data_path, filters), cohort)
+
+
 # --------------------------------------------------
 # Entry Point
 # --------------------------------------------------
@@ -120,6 +160,25 @@ def main():
         help="Path to Student_Performance.csv (default: datasets/Student_Performance.csv)"
     )
 
+    parser.add_argument(
+        "--filter",
+        action="append",
+        default=[],
+        dest="filters",
+        metavar="EXPR",
+        help="Only load rows matching EXPR on a raw dataset column, e.g. "
+             "'school_type==public' (repeatable; all must match)"
+    )
+
+    parser.add_argument(
+        "--cohort",
+        action="append",
+        default=[],
+        metavar="DIMENSION=VALUE",
+        help="Add a drill-down of the cohort with this value, e.g. "
+             "'internet_access=yes' or 'attendance_band=High' (repeatable)"
+    )
+
     args = parser.parse_args()
 
     # 🔑 Always resolve from project root
@@ -130,7 +189,24 @@ def main():
         raise FileNotFoundError(f"Dataset not found: {data_path}")
 
     # 🔑 Call the actual dashboard
-    run_dashboard(str(data_path))
+    cohort = {}
+    for value in args.cohort:
+        dimension, _, member = value.partition("=")
+        if not dimension or not member:
+            parser.error(f"Invalid --cohort value: {value!r} (expected DIMENSION=VALUE)")
+        cohort[dimension] = member
+
+    if cohort:
+        from src.student_performance_analysis.cohorts import COHORT_DIMENSIONS
+
+        unknown = [dimension for dimension in cohort if dimension not in COHORT_DIMENSIONS]
+        if unknown:
+            parser.error(
+                f"Unknown --cohort dimension: {', '.join(unknown)} "
+                f"(choose from {', '.join(COHORT_DIMENSIONS)})"
+            )
+
+    run_dashboard(str(data_path), args.filters, cohort)
 
 
 if __name__ == "__main__":
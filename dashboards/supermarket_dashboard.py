@@ -1,64 +1,104 @@
+from __future__ import annotations
+
 import argparse
-import pandas as pd
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from src.common.aggregation import FrameSource
 
 # --------------------------------------------------
 # Resolve project paths
 # --------------------------------------------------
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 DATASETS_DIR = PROJECT_ROOT / "datasets"
+sys.path.append(str(PROJECT_ROOT))
 sys.path.append(str(PROJECT_ROOT / "src"))
 
 # --------------------------------------------------
 # Processing data
 # --------------------------------------------------
 def preprocess_data(df: pd.DataFrame) -> pd.DataFrame:
-    df["Date"] = pd.to_datetime(df["Date"])
-    df["Time"] = pd.to_datetime(df["Time"], format="%H:%M", errors="coerce")
+    from src.common.dtypes import compact_dtypes
+    from src.common.parsing import parse_datetimes
+
+    df = compact_dtypes(df, "supermarket")
+    df["Date"] = parse_datetimes(df["Date"])
+    df["Time"] = parse_datetimes(df["Time"], format="%H:%M", errors="coerce")
     df["Hour"] = df["Time"].dt.hour
     df["Month"] = df["Date"].dt.month_name()
     df["Day"] = df["Date"].dt.day_name()
     return df
 
 
+def prepare_data(data_path: str, chunksize: int | None = None, filters=None):
+    from src.common.aggregation import has_rows
+    from src.common.data_loader import load_csv, stream_dataset
+
+    if chunksize:
+        # Stream the file instead of materialising it in memory
+        df = stream_dataset("supermarket", Path(data_path), chunksize, filters)
+    else:
+        df = load_csv(Path(data_path), filters=filters)
+    if filters and not has_rows(df):
+        sys.exit(f"❌ No rows match --filter {', '.join(filters)}")
+
+    if chunksize:
+        return df.map(preprocess_data)
+    return preprocess_data(df)
+
+
 # --------------------------------------------------
 # Dashboard Logic
 # --------------------------------------------------
-def generate_report(df: pd.DataFrame, currency: str):
-    total_sales = df["Total"].sum()
-    total_transactions = len(df)
+def print_report(df: FrameSource, currency: str = "₹"):
+    from src.common.aggregation import as_context, grouped_reduce, summarize
+
+    df = as_context(df)
+    df.prefetch([
+        ("Product_Line", "Total", "sum"),
+        ("Day", "Total", "mean"),
+        ("Month", "Total", "sum"),
+        ("Hour", "Total", "sum"),
+    ])
+
+    total_transactions, stats = summarize(df, {
+        "Total": ["sum"],
+        "Date": ["min", "max"],
+    })
+    total_sales = stats["Total"]["sum"]
     avg_transaction = total_sales / total_transactions
 
-    start_period = df["Date"].min().strftime("%B %Y")
-    end_period = df["Date"].max().strftime("%B %Y")
+    start_period = stats["Date"]["min"].strftime("%B %Y")
+    end_period = stats["Date"]["max"].strftime("%B %Y")
 
     # Top product lines
     category_sales = (
-        df.groupby("Product_Line")["Total"]
-        .sum()
+        grouped_reduce(df, "Product_Line", "Total", "sum")
         .sort_values(ascending=False)
     )
 
     # Best day
     best_day = (
-        df.groupby("Day")["Total"]
-        .mean()
+        grouped_reduce(df, "Day", "Total", "mean")
         .sort_values(ascending=False)
         .idxmax()
     )
 
     # Best month
     best_month = (
-        df.groupby("Month")["Total"]
-        .sum()
+        grouped_reduce(df, "Month", "Total", "sum")
         .sort_values(ascending=False)
         .idxmax()
     )
 
     # Peak hours
+    hourly = grouped_reduce(df, "Hour", "Total", "sum")
     peak_hours_pct = (
-        df[(df["Hour"] >= 17) & (df["Hour"] <= 19)]["Total"].sum()
+        hourly[(hourly.index >= 17) & (hourly.index <= 19)].sum()
         / total_sales
     ) * 100
 
@@ -127,7 +167,42 @@ def parse_arguments():
         help="Currency symbol"
     )
 
-    return parser.parse_args()
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=None,
+        help="Stream the dataset in chunks of this many rows"
+    )
+
+    parser.add_argument(
+        "--filter",
+        action="append",
+        default=[],
+        dest="filters",
+        metavar="EXPR",
+        help="Only load rows matching EXPR on a raw dataset column, e.g. "
+             "'Branch in A,B' or 'Date>=2023-06-01' (repeatable; all must match)"
+    )
+
+    aggregates = parser.add_mutually_exclusive_group()
+    aggregates.add_argument(
+        "--store",
+        default=None,
+        help="Directory of an incremental aggregate store: only invoices it "
+             "has not seen yet are added, and the report is served from it"
+    )
+    aggregates.add_argument(
+        "--cube",
+        default=None,
+        help="Directory of a precomputed sales cube: the report is served "
+             "from it, and it is rebuilt whenever the dataset file changed"
+    )
+
+    args = parser.parse_args()
+    if args.filters and (args.store or args.cube):
+        # Both persist aggregates of the whole file across runs
+        parser.error("--filter cannot be combined with --store or --cube")
+    return args
 
 
 # --------------------------------------------------
@@ -140,10 +215,32 @@ def main():
     if not data_path.exists():
         raise FileNotFoundError(f"Dataset not found: {data_path}")
 
-    df = pd.read_csv(data_path)
-    df = preprocess_data(df)
-
-    generate_report(df, args.currency)
+    if args.cube:
+        from src.supermarket_sales_analysis.cube import SalesCube, is_current
+
+        if is_current(args.cube, data_path):
+            df = SalesCube.load(Path(args.cube))
+            print(f"Loaded sales cube from {args.cube} ({df.rows:,} invoices)")
+        else:
+            df = SalesCube.build(prepare_data(data_path, args.chunksize))
+            df.save(Path(args.cube), source=data_path)
+            print(f"Built sales cube in {args.cube} ({df.rows:,} invoices)")
+        print_report(df, args.currency)
+        return
+
+    if args.store:
+        # Imported after argument handling, like the rest of the pipeline
+        from src.supermarket_sales_analysis.incremental import SalesAggregateStore
+
+        # Only the rows appended to the file since the last run are read
+        store = SalesAggregateStore(Path(args.store))
+        added = store.ingest_csv(data_path, preprocess_data)
+        store.save()
+        print(f"Added {added:,} new invoices to {args.store} ({store.rows:,} in total)")
+        print_report(store, args.currency)
+        return
+
+    print_report(prepare_data(data_path, args.chunksize, args.filters), args.currency)
 
 
 if __name__ == "__main__":
@@ -4,29 +4,25 @@ Project 3 – Weather Analytics
 Author: Rahul Mahakal
 """
 
+from __future__ import annotations
+
 import argparse
 from textwrap import fill
-import pandas as pd
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 # --------------------------------------------------
 # Resolve project paths
 # --------------------------------------------------
 # Add project root to Python path
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
 sys.path.append(str(PROJECT_ROOT / "src"))
 
-from src.weather_trends_analysis.preprocessing import preprocess_weather_data
-from src.weather_trends_analysis.analysis import (
-    temperature_overview,
-    yearly_temperature_trend,
-)
-from src.weather_trends_analysis.insights import generate_weather_insights
-from src.weather_trends_analysis.report_generator import (
-    overview_text,
-    recommendations,
-)
 
 # --------------------------------------------------
 # Data and Dashboard Logic
@@ -37,18 +33,62 @@ def print_header(title: str):
     print("=" * 50)
 
 
-def load_data(csv_path: Path) -> pd.DataFrame:
+def load_data(csv_path: Path, filters=None) -> pd.DataFrame:
     if not csv_path.exists():
         raise FileNotFoundError(f"Dataset not found: {csv_path}")
-    return pd.read_csv(csv_path)
 
-def run_dashboard(data_path: str):
-    df = load_data(Path(data_path))
-    df = preprocess_weather_data(df)
+    from src.common.data_loader import load_csv
+    return load_csv(csv_path, filters=filters)
+
+def prepare_data(data_path: str, chunksize: int | None = None, filters=None,
+                 partitions: str | None = None, start: str | None = None,
+                 end: str | None = None):
+    from src.common.aggregation import AggregationContext, has_rows
+    from src.common.data_loader import filter_frame, stream_dataset
+    from src.weather_trends_analysis.preprocessing import preprocess_weather_data
+
+    if partitions:
+        # Only the months overlapping start/end are read
+        from src.weather_trends_analysis.partitions import WeatherPartitionStore
+
+        df = WeatherPartitionStore(Path(partitions)).read(start, end)
+        if df.empty:
+            sys.exit(f"❌ No observations in {partitions} within the --start/--end range")
+        df = filter_frame(df, filters)
+    elif chunksize:
+        # Stream the file instead of materialising it in memory
+        df = stream_dataset("weather", Path(data_path), chunksize, filters)
+    else:
+        df = load_data(Path(data_path), filters)
+
+    if filters and not has_rows(df):
+        sys.exit(f"❌ No rows match --filter {', '.join(filters)}")
+
+    if chunksize and not partitions:
+        df = df.map(preprocess_weather_data)
+    else:
+        df = preprocess_weather_data(df)
+
+    # Shared by the overview, insights and trend of the report
+    return AggregationContext(df)
+
+
+def print_report(df, approximate: bool = False):
+    from src.weather_trends_analysis.analysis import (
+        temperature_overview,
+        yearly_temperature_trend,
+        weather_variable_correlation,
+    )
+    from src.weather_trends_analysis.insights import generate_weather_insights
+    from src.weather_trends_analysis.report_generator import (
+        overview_text,
+        recommendations,
+    )
 
-    stats = temperature_overview(df)
+    stats = temperature_overview(df, approximate=approximate)
     insights = generate_weather_insights(df)
     yearly_trend = yearly_temperature_trend(df)
+    correlation = weather_variable_correlation(df)
 
     print_header("WEATHER TRENDS ANALYSIS REPORT")
 
@@ -73,11 +113,11 @@ def run_dashboard(data_path: str):
     print("=" * 26)
     print(
         f"• Temperature vs Humidity: "
-        f"{df['Temperature (C)'].corr(df['Humidity']):.2f}"
+        f"{correlation.loc['Temperature (C)', 'Humidity']:.2f}"
     )
     print(
         f"• Temperature vs Wind Speed: "
-        f"{df['Temperature (C)'].corr(df['Wind Speed (km/h)']):.2f}"
+        f"{correlation.loc['Temperature (C)', 'Wind Speed (km/h)']:.2f}"
     )
 
     # ---------------- CLIMATE INSIGHTS ----------------
@@ -100,6 +140,12 @@ def run_dashboard(data_path: str):
     print("✅ Weather dashboard loaded successfully")
 
 
+def run_dashboard(data_path: str, chunksize: int | None = None, approximate: bool = False,
+                  filters=None, partitions: str | None = None, start: str | None = None,
+                  end: str | None = None):
+    print_report(prepare_data(data_path, chunksize, filters, partitions, start, end), approximate)
+
+
 # --------------------------------------------------
 # Entry Point
 # --------------------------------------------------
@@ -114,7 +160,55 @@ def main():
         help="Path to weatherHistory.csv (relative to project root)"
     )
 
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=None,
+        help="Stream the dataset in chunks of this many rows"
+    )
+
+    parser.add_argument(
+        "--approximate",
+        action="store_true",
+        help="Estimate the median with a quantile sketch instead of holding "
+             "the whole temperature column"
+    )
+
+    parser.add_argument(
+        "--filter",
+        action="append",
+        default=[],
+        dest="filters",
+        metavar="EXPR",
+        help="Only load rows matching EXPR on a raw dataset column, e.g. "
+             "'Formatted Date>=2010-01-01' (repeatable; all must match)"
+    )
+
+    parser.add_argument(
+        "--partitions",
+        default=None,
+        help="Directory of a Year=/Month= partitioned store: observations of "
+             "--data it has not seen yet are appended, and the report is read from it"
+    )
+
+    parser.add_argument(
+        "--start",
+        default=None,
+        help="With --partitions, only report observations from this date on "
+             "(UTC, e.g. 2010-01-01)"
+    )
+
+    parser.add_argument(
+        "--end",
+        default=None,
+        help="With --partitions, only report observations before this date (UTC)"
+    )
+
     args = parser.parse_args()
+    if (args.start or args.end) and not args.partitions:
+        parser.error("--start and --end require --partitions")
+    if args.partitions and args.chunksize:
+        parser.error("--chunksize cannot be combined with --partitions")
 
     BASE_DIR = Path(__file__).resolve().parents[1]
     data_path = BASE_DIR / args.data
@@ -122,7 +216,22 @@ def main():
     if not data_path.exists():
         raise FileNotFoundError(f"Dataset not found: {data_path}")
 
-    run_dashboard(str(data_path))
+    partitions = None
+    if args.partitions:
+        # Imported after argument handling, like the rest of the pipeline
+        from src.weather_trends_analysis.partitions import WeatherPartitionStore
+
+        # Resolved from the project root, like --data
+        partitions = str(BASE_DIR / args.partitions)
+        store = WeatherPartitionStore(Path(partitions))
+        added = store.ingest(data_path)
+        print(f"Added {added:,} new observations to {args.partitions} "
+              f"({len(store.partitions())} partitions)")
+
+    run_dashboard(
+        str(data_path), args.chunksize, args.approximate, args.filters,
+        partitions, args.start, args.end,
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,439 @@
+"""
+Aggregation helpers shared by the analysis modules.
+
+Every helper accepts either a full DataFrame or an iterable of DataFrame
+chunks (e.g. ``common.data_loader.stream_dataset(...).map(preprocess)``).
+Full frames go straight to pandas; chunk streams are reduced one chunk at
+a time and the partial results combined, so only group-level results are
+held in memory.
+
+They also accept an ``AggregationContext``, which memoises grouped and
+column reductions and correlation matrices so that analysis, insights,
+visualization and the dashboards share one computation per (keys,
+column, reducer) or set of correlated columns.
+"""
+
+from typing import Iterable
+
+import pandas as pd
+
+from src.common.sketches import DEFAULT_RANK_ERROR, KLLSketch
+from src.common.statistics import CovarianceAccumulator
+
+# A full frame or a stream of chunks sharing its columns
+FrameSource = pd.DataFrame | Iterable[pd.DataFrame]
+
+# Partial results are folded together once this many have accumulated
+_COMBINE_EVERY = 32
+
+_PARTIAL_COLUMNS = {
+    "sum": ["sum"],
+    "count": ["count"],
+    "mean": ["sum", "count"],
+    "min": ["min"],
+    "max": ["max"],
+    "size": ["size"],
+}
+
+_SUMMARY_REDUCERS = ("sum", "count", "mean", "min", "max", "median", "sketch")
+
+_COMBINE_RULES = {
+    "sum": "sum",
+    "count": "sum",
+    "size": "sum",
+    "min": "min",
+    "max": "max",
+}
+
+
+def is_chunked(data) -> bool:
+    if isinstance(data, AggregationContext):
+        data = data.data
+    return not isinstance(data, pd.DataFrame)
+
+
+def iter_frames(data):
+    if isinstance(data, AggregationContext):
+        data = data.data
+    if isinstance(data, pd.DataFrame):
+        yield data
+    else:
+        yield from data
+
+
+def row_count(data) -> int:
+    if isinstance(data, AggregationContext):
+        return data.summarize({})[0]
+    return sum(len(frame) for frame in iter_frames(data))
+
+
+def has_rows(data) -> bool:
+    """
+    Whether ``data`` holds any row; a chunk stream is only read up to its
+    first non-empty chunk.
+    """
+    return any(len(frame) for frame in iter_frames(data))
+
+
+def frame_of(data) -> pd.DataFrame:
+    """
+    The full DataFrame behind ``data``, for computations that need raw rows.
+    """
+    if isinstance(data, AggregationContext):
+        data = data.data
+    if is_chunked(data):
+        raise TypeError("This computation needs a full DataFrame, not a chunk stream")
+    return data
+
+
+def collect_columns(data, columns: list[str]) -> pd.DataFrame:
+    """
+    Materialise only ``columns`` from a frame or chunk stream.
+    """
+    if isinstance(data, AggregationContext):
+        data = data.data
+    if not is_chunked(data):
+        return data[columns]
+    parts = [chunk[columns] for chunk in data]
+    if not parts:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(parts, ignore_index=True)
+
+
+def _check_reducer(reducer: str):
+    if reducer not in _SUMMARY_REDUCERS:
+        raise ValueError(f"Unsupported reducer: {reducer}")
+
+
+def _finalise(partial: dict, reducer: str):
+    if reducer == "mean":
+        return partial["sum"] / partial["count"] if partial["count"] else float("nan")
+    return partial[reducer]
+
+
+def _column_reduce(series: pd.Series, reducer: str, rank_error: float):
+    if reducer == "sketch":
+        return KLLSketch(rank_error=rank_error).update(series)
+    return getattr(series, reducer)()
+
+
+def summarize(data, spec: dict[str, list[str]],
+              rank_error: float = DEFAULT_RANK_ERROR) -> tuple[int, dict]:
+    """
+    Compute several column reductions in a single pass.
+
+    ``spec`` maps a column to the reducers wanted for it, e.g.
+    ``{"Total": ["sum", "mean"], "Date": ["min", "max"]}``. Returns the
+    row count and a ``{column: {reducer: value}}`` dict. Medians over a
+    chunk stream are exact and keep only that one column in memory; the
+    ``"sketch"`` reducer instead returns a ``KLLSketch`` of the column
+    with the given ``rank_error``, in constant memory.
+    """
+    if isinstance(data, AggregationContext):
+        return data.summarize(spec, rank_error)
+
+    for reducers in spec.values():
+        for reducer in reducers:
+            _check_reducer(reducer)
+
+    if not is_chunked(data):
+        return len(data), {
+            column: {
+                reducer: _column_reduce(data[column], reducer, rank_error)
+                for reducer in reducers
+            }
+            for column, reducers in spec.items()
+        }
+
+    needed = {
+        column: sorted({
+            part for reducer in reducers if reducer not in ("median", "sketch")
+            for part in _PARTIAL_COLUMNS[reducer]
+        })
+        for column, reducers in spec.items()
+    }
+    medians = [column for column, reducers in spec.items() if "median" in reducers]
+    sketches = {
+        column: KLLSketch(rank_error=rank_error)
+        for column, reducers in spec.items() if "sketch" in reducers
+    }
+
+    rows = 0
+    partials = {column: {} for column in spec}
+    median_parts = {column: [] for column in medians}
+
+    for chunk in data:
+        rows += len(chunk)
+        for column, parts in needed.items():
+            series = chunk[column]
+            state = partials[column]
+            for part in parts:
+                value = getattr(series, part)()
+                state[part] = value if part not in state else _combine_scalar(state[part], value, part)
+        for column in medians:
+            median_parts[column].append(chunk[column].dropna())
+        for column, sketch in sketches.items():
+            sketch.update(chunk[column])
+
+    result = {}
+    for column, reducers in spec.items():
+        result[column] = {}
+        for reducer in reducers:
+            if reducer == "median":
+                parts = median_parts[column]
+                values = pd.concat(parts) if parts else pd.Series(dtype="float64")
+                result[column][reducer] = values.median()
+            elif reducer == "sketch":
+                result[column][reducer] = sketches[column]
+            else:
+                result[column][reducer] = _finalise(partials[column], reducer)
+    return rows, result
+
+
+def _combine_scalar(current, value, part: str):
+    if part in ("sum", "count", "size"):
+        return current + value
+    if pd.isna(current):
+        return value
+    if pd.isna(value):
+        return current
+    if part == "min":
+        return min(current, value)
+    return max(current, value)
+
+
+def column_reduce(data, column: str, reducer: str):
+    return summarize(data, {column: [reducer]})[1][column][reducer]
+
+
+def column_quantiles(data, column: str, percentiles) -> dict:
+    """
+    Exact ``{q: value}`` quantiles of one column; only that column is
+    materialised for a chunk stream.
+    """
+    if not percentiles:
+        return {}
+    values = collect_columns(data, [column])[column]
+    return dict(zip(percentiles, values.quantile(list(percentiles)).tolist()))
+
+
+def correlation_matrix(data, columns: list[str]) -> pd.DataFrame:
+    """
+    Pairwise Pearson correlation of ``columns``, as ``DataFrame.corr``.
+
+    Sums and cross-products are accumulated chunk by chunk, so a chunk
+    stream is read once and never materialised.
+    """
+    if isinstance(data, AggregationContext):
+        return data.correlation(columns)
+
+    accumulator = CovarianceAccumulator(columns)
+    for frame in iter_frames(data):
+        accumulator.update(frame)
+    return accumulator.correlation()
+
+
+def _partial_groupby(frame: pd.DataFrame, by, column: str, reducer: str) -> pd.DataFrame:
+    grouped = frame.groupby(by, observed=True)
+    if reducer == "size":
+        return grouped.size().to_frame("size")
+    return grouped[column].agg(_PARTIAL_COLUMNS[reducer])
+
+
+def _combine_partials(partials: list[pd.DataFrame]) -> pd.DataFrame:
+    combined = pd.concat(partials)
+    levels = list(range(combined.index.nlevels))
+    rules = {part: _COMBINE_RULES[part] for part in combined.columns}
+    return combined.groupby(level=levels, observed=True).agg(rules)
+
+
+def _check_grouped_reducer(reducer: str):
+    if reducer not in _PARTIAL_COLUMNS:
+        raise ValueError(f"Unsupported grouped reducer: {reducer}")
+
+
+def _finalise_grouped(combined: pd.DataFrame, column: str | None, reducer: str) -> pd.Series:
+    if reducer == "mean":
+        result = combined["sum"] / combined["count"]
+    else:
+        result = combined[reducer]
+
+    result.name = None if reducer == "size" else column
+    return result
+
+
+def grouped_reduce_many(data, requests: list[tuple]) -> list[pd.Series]:
+    """
+    Evaluate several ``(by, column, reducer)`` requests in one pass.
+
+    Over a chunk stream every chunk is read once for all requests; over a
+    full frame this is the same as calling ``grouped_reduce`` for each.
+    """
+    for _, _, reducer in requests:
+        _check_grouped_reducer(reducer)
+
+    if isinstance(data, AggregationContext):
+        data.prefetch(requests)
+        return [data.grouped(*request) for request in requests]
+
+    if not is_chunked(data):
+        return [grouped_reduce(data, *request) for request in requests]
+
+    partials = [[] for _ in requests]
+    for chunk in data:
+        for parts, (by, column, reducer) in zip(partials, requests):
+            parts.append(_partial_groupby(chunk, by, column, reducer))
+            if len(parts) >= _COMBINE_EVERY:
+                parts[:] = [_combine_partials(parts)]
+
+    results = []
+    for parts, (_, column, reducer) in zip(partials, requests):
+        if not parts:
+            results.append(pd.Series(dtype="float64", name=column))
+        else:
+            results.append(_finalise_grouped(_combine_partials(parts), column, reducer))
+    return results
+
+
+def grouped_reduce(data, by, column: str | None, reducer: str) -> pd.Series:
+    """
+    Group ``data`` by ``by`` and reduce ``column`` with ``reducer``.
+
+    Equivalent to ``df.groupby(by, observed=True)[column].agg(reducer)``
+    (or ``.size()`` when ``reducer == "size"``) for a full frame.
+    """
+    _check_grouped_reducer(reducer)
+
+    if isinstance(data, AggregationContext):
+        return data.grouped(by, column, reducer)
+
+    if not is_chunked(data):
+        grouped = data.groupby(by, observed=True)
+        if reducer == "size":
+            return grouped.size()
+        return grouped[column].agg(reducer)
+
+    return grouped_reduce_many(data, [(by, column, reducer)])[0]
+
+
+# --------------------------------------------------
+# Memoised aggregation context
+# --------------------------------------------------
+def _group_key(by) -> tuple:
+    return tuple(by) if isinstance(by, (list, tuple)) else (by,)
+
+
+class AggregationContext:
+    """
+    Memoised aggregations over one preprocessed frame or chunk stream.
+
+    Pass the context wherever a DataFrame is accepted: ``grouped_reduce``
+    and ``summarize`` results are cached by (keys, column, reducer), so a
+    grouping requested by several analysis, insight or plotting functions
+    is computed only once. Cached results are handed out as copies.
+    """
+
+    def __init__(self, data: FrameSource):
+        self.data = data
+        self._grouped = {}
+        self._scalars = {}
+        self._correlations = {}
+        self._derived = {}
+        self._rows = None
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        return frame_of(self.data)
+
+    @property
+    def columns(self) -> list[str]:
+        """
+        Columns that can be grouped and reduced.
+        """
+        return list(self.frame.columns)
+
+    def grouped(self, by, column: str | None, reducer: str) -> pd.Series:
+        key = (_group_key(by), column, reducer)
+        if key not in self._grouped:
+            self.prefetch([(by, column, reducer)])
+        return self._grouped[key].copy()
+
+    def prefetch(self, requests: list[tuple]):
+        """
+        Compute the uncached ``(by, column, reducer)`` requests together,
+        in a single pass when the context wraps a chunk stream.
+        """
+        missing = {}
+        for by, column, reducer in requests:
+            key = (_group_key(by), column, reducer)
+            if key not in self._grouped:
+                missing[key] = (by, column, reducer)
+        if not missing:
+            return
+
+        results = grouped_reduce_many(self.data, list(missing.values()))
+        self._grouped.update(zip(missing, results))
+
+    def summarize(self, spec: dict[str, list[str]],
+                  rank_error: float = DEFAULT_RANK_ERROR) -> tuple[int, dict]:
+        def key(column, reducer):
+            # Sketches of different accuracy are cached separately
+            return (column, reducer, rank_error if reducer == "sketch" else None)
+
+        missing = {}
+        for column, reducers in spec.items():
+            wanted = [r for r in reducers if key(column, r) not in self._scalars]
+            if wanted:
+                missing[column] = wanted
+
+        if missing or self._rows is None:
+            rows, stats = summarize(self.data, missing, rank_error)
+            self._rows = rows
+            for column, values in stats.items():
+                for reducer, value in values.items():
+                    self._scalars[key(column, reducer)] = value
+
+        return self._rows, {
+            column: {reducer: self._scalars[key(column, reducer)] for reducer in reducers}
+            for column, reducers in spec.items()
+        }
+
+    def correlation(self, columns: list[str]) -> pd.DataFrame:
+        """
+        Cached ``correlation_matrix``; a matrix already computed over a
+        superset of ``columns`` is sliced rather than recomputed.
+        """
+        columns = list(columns)
+        for cached_columns, matrix in self._correlations.items():
+            if set(columns) <= set(cached_columns):
+                return matrix.loc[columns, columns].copy()
+
+        matrix = correlation_matrix(self.data, columns)
+        self._correlations[tuple(columns)] = matrix
+        return matrix.copy()
+
+    def derived(self, build):
+        """
+        Cached ``build(data)``, for a structure precomputed from the rows
+        (e.g. ``CohortStats.build``) that later queries read instead of
+        the rows. Unlike group-bys it is handed out as is, not copied.
+        """
+        if build not in self._derived:
+            self._derived[build] = build(self.data)
+        return self._derived[build]
+
+    def clear(self):
+        self._grouped.clear()
+        self._scalars.clear()
+        self._correlations.clear()
+        self._derived.clear()
+        self._rows = None
+
+
+def as_context(data) -> AggregationContext:
+    """
+    Wrap ``data`` in an ``AggregationContext`` unless it already is one.
+    """
+    if isinstance(data, AggregationContext):
+        return data
+    return AggregationContext(data)
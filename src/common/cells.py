@@ -0,0 +1,32 @@
+"""
+Sums over mixed-radix cell keys.
+
+Grouping by several coded dimensions combines the codes into one integer
+key per row (``np.ravel_multi_index``), so every group becomes a cell of
+a fixed key space and its totals can be counted in one ``np.bincount``
+pass instead of a hash-based group-by.
+"""
+
+import numpy as np
+
+# Key spaces up to this size are counted into a dense array; larger ones
+# are first compressed to the keys that occur
+DENSE_KEY_LIMIT = 1 << 20
+
+
+def sum_by_key(keys: np.ndarray, size: int, columns: list) -> tuple[np.ndarray, list[np.ndarray]]:
+    """
+    The keys that occur, in ascending order, and the per-key sums of each
+    of ``columns`` (``None`` counts rows); ``size`` bounds the key space.
+    """
+    if size <= DENSE_KEY_LIMIT:
+        counts = np.bincount(keys, minlength=size)
+        observed = np.flatnonzero(counts)
+        sums = [
+            counts if column is None else np.bincount(keys, weights=column, minlength=size)
+            for column in columns
+        ]
+        return observed, [values[observed] for values in sums]
+
+    observed, ids = np.unique(keys, return_inverse=True)
+    return observed, [np.bincount(ids, weights=column, minlength=len(observed)) for column in columns]
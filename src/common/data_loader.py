@@ -1,7 +1,14 @@
 from pathlib import Path
+import hashlib
+import io
+import json
+import os
+import re
+import warnings
+
 import pandas as pd
 
-BASE_DIR = Path(__file__).resolve().parent.parent
+BASE_DIR = Path(__file__).resolve().parents[2]
 
 DATASET_PATHS = {
     "supermarket": BASE_DIR / "datasets" / "supermarket_sales.csv",
@@ -11,8 +18,535 @@ DATASET_PATHS = {
     "finance": BASE_DIR / "datasets" / "Finance_data.csv"
 }
 
+# read_csv options used when streaming a dataset in chunks; only the
+# columns the analysis modules consume are read
+DATASET_SCHEMAS = {
+    "supermarket": {
+        "usecols": [
+            "Invoice_ID", "Branch", "City", "Customer_Type", "Gender",
+            "Product_Line", "Unit_Price", "Quantity", "Tax", "Total",
+            "Date", "Time", "Payment", "Rating",
+        ],
+        "dtype": {
+            "Unit_Price": "float64",
+            "Quantity": "int64",
+            "Tax": "float64",
+            "Total": "float64",
+            "Rating": "float64",
+        },
+    },
+    "education": {
+        "usecols": [
+            "student_id", "age", "gender", "school_type", "parent_education",
+            "study_hours", "attendance_percentage", "internet_access",
+            "travel_time", "extra_activities", "study_method", "math_score",
+            "science_score", "english_score", "overall_score", "final_grade",
+        ],
+        "dtype": {
+            "age": "int64",
+            "study_hours": "float64",
+            "attendance_percentage": "float64",
+            "math_score": "float64",
+            "science_score": "float64",
+            "english_score": "float64",
+            "overall_score": "float64",
+        },
+    },
+    "weather": {
+        "usecols": [
+            "Formatted Date", "Summary", "Precip Type", "Temperature (C)",
+            "Apparent Temperature (C)", "Humidity", "Wind Speed (km/h)",
+            "Pressure (millibars)",
+        ],
+        "dtype": {
+            "Temperature (C)": "float64",
+            "Apparent Temperature (C)": "float64",
+            "Humidity": "float64",
+            "Wind Speed (km/h)": "float64",
+            "Pressure (millibars)": "float64",
+        },
+    },
+    "healthcare": {
+        "usecols": [
+            "USMER", "MEDICAL_UNIT", "SEX", "PATIENT_TYPE", "DATE_DIED",
+            "INTUBED", "PNEUMONIA", "AGE", "PREGNANT", "DIABETES", "COPD",
+            "ASTHMA", "INMSUPR", "HIPERTENSION", "OTHER_DISEASE",
+            "CARDIOVASCULAR", "OBESITY", "RENAL_CHRONIC", "TOBACCO",
+            "CLASIFFICATION_FINAL", "ICU",
+        ],
+        "dtype": {
+            col: "int64"
+            for col in [
+                "USMER", "MEDICAL_UNIT", "SEX", "PATIENT_TYPE", "INTUBED",
+                "PNEUMONIA", "AGE", "PREGNANT", "DIABETES", "COPD", "ASTHMA",
+                "INMSUPR", "HIPERTENSION", "OTHER_DISEASE", "CARDIOVASCULAR",
+                "OBESITY", "RENAL_CHRONIC", "TOBACCO", "CLASIFFICATION_FINAL",
+                "ICU",
+            ]
+        },
+    },
+    "finance": {
+        "dtype": {
+            "age": "int64",
+        },
+    },
+}
+
+DEFAULT_CHUNKSIZE = 250_000
+
+# Columnar snapshots live in a hidden folder next to each source CSV
+CACHE_DIR_NAME = ".cache"
+SNAPSHOT_VERSION = 2
+
+# Rows per Parquet row group of a snapshot; filtered loads skip the row
+# groups whose min/max statistics rule out the filters
+SNAPSHOT_ROW_GROUP_SIZE = 16_384
+
+FILTER_OPERATORS = ("==", "!=", "<", "<=", ">", ">=", "in", "not in")
+
+_FILTER_PATTERN = re.compile(
+    r"^\s*(?P<column>.+?)\s*(?P<op>==|!=|>=|<=|=|>|<)\s*(?P<value>.*?)\s*$"
+)
+_MEMBERSHIP_PATTERN = re.compile(
+    r"^\s*(?P<column>.+?)\s+(?P<op>not in|in)\s+(?P<value>.+?)\s*$"
+)
+
+_HASH_BLOCK_SIZE = 1 << 20
+
+# Bytes before a read position hashed by read_appended to notice rewrites
+TAIL_CHECK_BYTES = 4096
+
+
+def _parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _file_digest(file_path: Path) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as handle:
+        for block in iter(lambda: handle.read(_HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _snapshot_paths(file_path: Path) -> tuple[Path, Path]:
+    cache_dir = file_path.parent / CACHE_DIR_NAME
+    return (
+        cache_dir / f"{file_path.name}.parquet",
+        cache_dir / f"{file_path.name}.json",
+    )
+
+
+def _read_manifest(manifest_path: Path) -> dict | None:
+    try:
+        with open(manifest_path, encoding="utf-8") as handle:
+            manifest = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != SNAPSHOT_VERSION:
+        return None
+    return manifest
+
+
+def _write_manifest(manifest_path: Path, manifest: dict):
+    tmp_path = manifest_path.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump(manifest, handle, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+
+# --------------------------------------------------
+# Filters
+# --------------------------------------------------
+def parse_filter(text: str) -> tuple:
+    """
+    Parse a command-line filter such as ``"Branch=A"``,
+    ``"Date>=2023-03-01"`` or ``"Product_Line in Electronic Accessories,Sports & Travel"``
+    into a ``(column, operator, value)`` tuple.
+
+    Values stay strings here; they are converted to the column's type when
+    the filter is applied.
+    """
+    match = _MEMBERSHIP_PATTERN.match(text)
+    if match is None or any(char in match["column"] for char in "=<>!"):
+        # A comparison whose value happens to contain " in "
+        match = _FILTER_PATTERN.match(text)
+    if match is None or not match["value"]:
+        raise ValueError(f"Invalid filter: {text!r} (expected COLUMN OP VALUE)")
+
+    op = "==" if match["op"] == "=" else match["op"]
+    value = match["value"]
+    if op in ("in", "not in"):
+        value = [item.strip() for item in value.split(",")]
+    return match["column"], op, value
+
+
+def _normalise_filters(filters) -> list[tuple]:
+    result = []
+    for item in filters or ():
+        column, op, value = parse_filter(item) if isinstance(item, str) else item
+        if op not in FILTER_OPERATORS:
+            raise ValueError(f"Unsupported filter operator: {op!r}")
+        result.append((column, op, value))
+    return result
+
+
+def _coerce_value(value, dtype):
+    if not isinstance(value, str):
+        return value
+    if pd.api.types.is_integer_dtype(dtype):
+        number = float(value)
+        return int(number) if number.is_integer() else number
+    if pd.api.types.is_float_dtype(dtype):
+        return float(value)
+    return value
+
+
+def _coerce_filters(filters: list[tuple], dtypes) -> list[tuple]:
+    """
+    Convert string filter values to the type of their column.
+    """
+    coerced = []
+    for column, op, value in filters:
+        if column not in dtypes:
+            raise KeyError(f"Cannot filter on missing column: {column!r}")
+        if op in ("in", "not in"):
+            value = [_coerce_value(item, dtypes[column]) for item in value]
+        else:
+            value = _coerce_value(value, dtypes[column])
+        coerced.append((column, op, value))
+    return coerced
+
+
+def filter_frame(df: pd.DataFrame, filters) -> pd.DataFrame:
+    """
+    Rows of ``df`` matching every filter, keeping their index labels.
+
+    Missing values match only ``"not in"``, as in the Parquet reader.
+    """
+    filters = _coerce_filters(_normalise_filters(filters), df.dtypes)
+    if not filters:
+        return df
+
+    mask = pd.Series(True, index=df.index)
+    for column, op, value in filters:
+        values = df[column]
+        if op == "in":
+            mask &= values.isin(value)
+        elif op == "not in":
+            mask &= ~values.isin(value)
+        else:
+            compare = {
+                "==": values.eq, "!=": values.ne, "<": values.lt,
+                "<=": values.le, ">": values.gt, ">=": values.ge,
+            }[op]
+            mask &= compare(value) & values.notna()
+    return df.loc[mask.to_numpy()]
+
+
+def _snapshot_dtypes(snapshot_path: Path) -> dict:
+    import pyarrow.parquet as pq
+
+    schema = pq.read_schema(snapshot_path)
+    return {name: schema.field(name).type.to_pandas_dtype() for name in schema.names}
+
+
+def _may_match(op: str, value, statistics) -> bool:
+    """
+    Whether a row group with these column ``statistics`` can hold a row
+    matching ``op value``; unknown or incomparable statistics always can.
+    """
+    if statistics is None or not statistics.has_min_max:
+        return True
+    low, high = statistics.min, statistics.max
+    try:
+        if op == "==":
+            return low <= value <= high
+        if op == "in":
+            return any(low <= item <= high for item in value)
+        if op == "<":
+            return low < value
+        if op == "<=":
+            return low <= value
+        if op == ">":
+            return high > value
+        if op == ">=":
+            return high >= value
+        if op == "!=":
+            return not low == high == value
+        # "not in" also matches missing values
+        return statistics.null_count != 0 or not (low == high and low in value)
+    except TypeError:
+        return True
+
+
+def _row_mask(table, filters: list[tuple]):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    functions = {
+        "==": pc.equal, "!=": pc.not_equal, "<": pc.less,
+        "<=": pc.less_equal, ">": pc.greater, ">=": pc.greater_equal,
+    }
+    mask = None
+    for column, op, value in filters:
+        values = table[column]
+        if op in ("in", "not in"):
+            matches = pc.is_in(values, value_set=pa.array(value, type=values.type))
+            if op == "not in":
+                matches = pc.invert(matches)
+        else:
+            matches = functions[op](values, pa.scalar(value, type=values.type))
+        mask = matches if mask is None else pc.and_kleene(mask, matches)
+    # Rows where a comparison is null (missing values) are dropped
+    return pc.fill_null(mask, False)
+
 
-def load_csv(file_path: Path) -> pd.DataFrame:
+def _read_filtered_snapshot(snapshot_path: Path, filters: list[tuple]) -> pd.DataFrame:
+    """
+    Read the snapshot rows matching ``filters``.
+
+    Row groups are kept only when their min/max statistics allow a match,
+    and only those are read and filtered row by row. Rows keep the labels
+    they have in the full frame.
+    """
+    import numpy as np
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+
+    parquet = pq.ParquetFile(snapshot_path)
+    metadata = parquet.metadata
+    positions = {
+        metadata.schema.column(i).path: i for i in range(metadata.num_columns)
+    }
+
+    kept, starts, offset = [], [], 0
+    for group in range(metadata.num_row_groups):
+        row_group = metadata.row_group(group)
+        if all(
+            _may_match(op, value, row_group.column(positions[column]).statistics)
+            for column, op, value in filters
+        ):
+            kept.append(group)
+            starts.append(offset)
+        offset += row_group.num_rows
+
+    if not kept:
+        return parquet.schema_arrow.empty_table().to_pandas()
+
+    table = parquet.read_row_groups(kept)
+    rows = np.concatenate([
+        np.arange(start, start + metadata.row_group(group).num_rows)
+        for group, start in zip(kept, starts)
+    ])
+
+    mask = _row_mask(table, filters)
+    df = table.filter(mask).to_pandas()
+    df.index = pd.Index(rows[pc.indices_nonzero(mask).to_numpy()])
+    return df
+
+
+# --------------------------------------------------
+# Snapshots
+# --------------------------------------------------
+def _load_snapshot(file_path: Path, filters: list[tuple] = ()) -> pd.DataFrame | None:
+    """
+    Return the cached frame when the snapshot still matches the source.
+
+    Size and mtime are checked first; when only the mtime moved (e.g. the
+    file was touched or re-copied) the content hash decides.
+    """
+    snapshot_path, manifest_path = _snapshot_paths(file_path)
+    manifest = _read_manifest(manifest_path)
+    if manifest is None or not snapshot_path.exists():
+        return None
+
+    stat = file_path.stat()
+    if manifest["size"] != stat.st_size:
+        return None
+
+    if manifest["mtime_ns"] != stat.st_mtime_ns:
+        if manifest["digest"] != _file_digest(file_path):
+            return None
+        manifest["mtime_ns"] = stat.st_mtime_ns
+        try:
+            _write_manifest(manifest_path, manifest)
+        except OSError:
+            pass
+
+    try:
+        if not filters:
+            return pd.read_parquet(snapshot_path)
+        dtypes = _snapshot_dtypes(snapshot_path)
+    except Exception:
+        # A truncated or incompatible snapshot is rebuilt from the CSV
+        return None
+
+    import pyarrow as pa
+
+    # Invalid filters are the caller's error, not a reason to rebuild
+    filters = _coerce_filters(filters, dtypes)
+    try:
+        return _read_filtered_snapshot(snapshot_path, filters)
+    except (pa.ArrowInvalid, OSError):
+        # A truncated or corrupt snapshot is rebuilt from the CSV
+        return None
+
+
+def _write_snapshot(file_path: Path, df: pd.DataFrame, stat, digest: str):
+    snapshot_path, manifest_path = _snapshot_paths(file_path)
+    try:
+        snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = snapshot_path.with_suffix(".parquet.tmp")
+        df.to_parquet(tmp_path, index=True, row_group_size=SNAPSHOT_ROW_GROUP_SIZE)
+        os.replace(tmp_path, snapshot_path)
+        _write_manifest(manifest_path, {
+            "version": SNAPSHOT_VERSION,
+            "source": file_path.name,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "digest": digest,
+        })
+    except Exception as exc:
+        warnings.warn(f"Could not write columnar snapshot for {file_path}: {exc}")
+
+
+def load_csv(file_path: Path, use_cache: bool = True, filters=None) -> pd.DataFrame:
+    """
+    Load a CSV dataset, serving it from a Parquet snapshot when possible.
+
+    The first load of each dataset version parses the CSV and stores a
+    snapshot in ``<dataset dir>/.cache``; later loads read the snapshot
+    as long as the source size, mtime or content hash still match.
+    Caching is skipped when ``pyarrow`` is not installed.
+
+    ``filters`` keeps only the rows matching every ``(column, operator,
+    value)`` predicate (or ``parse_filter`` string) on the raw CSV columns;
+    operators are those of ``FILTER_OPERATORS``, and ``"in"``/``"not in"``
+    take a list. Snapshot reads push them down to the Parquet reader, which
+    skips row groups whose min/max statistics cannot match.
+    """
+    file_path = Path(file_path)
     if not file_path.exists():
         raise FileNotFoundError(f"{file_path} not found")
-    return pd.read_csv(file_path)
+    filters = _normalise_filters(filters)
+
+    if not use_cache or not _parquet_available():
+        return filter_frame(pd.read_csv(file_path), filters)
+
+    cached = _load_snapshot(file_path, filters)
+    if cached is not None:
+        return cached
+
+    stat = file_path.stat()
+    digest = _file_digest(file_path)
+    df = pd.read_csv(file_path)
+    _write_snapshot(file_path, df, stat, digest)
+    return filter_frame(df, filters)
+
+
+def _tail_check(handle, offset: int) -> str:
+    """
+    Hash of the bytes just before ``offset``, to notice a rewritten file.
+    """
+    start = max(offset - TAIL_CHECK_BYTES, 0)
+    handle.seek(start)
+    return hashlib.sha1(handle.read(offset - start)).hexdigest()
+
+
+def read_appended(file_path: Path, position: dict | None = None, **kwargs) -> tuple[pd.DataFrame, dict]:
+    """
+    Read the rows appended to a CSV file since ``position``.
+
+    ``position`` is what the previous call returned (``None`` reads every
+    row). Only the bytes after it are read, so the cost follows the new
+    rows rather than the file; a last line without its newline is left for
+    the next call. When the file shrank or the bytes before the position
+    changed, it was rewritten and is read from the start again. Returns
+    the rows (read with ``kwargs`` passed to ``pd.read_csv``) and the new
+    position.
+    """
+    with open(file_path, "rb") as handle:
+        header = handle.readline()
+        offset = len(header)
+        if position:
+            size = os.fstat(handle.fileno()).st_size
+            if position["offset"] <= size and _tail_check(handle, position["offset"]) == position["check"]:
+                offset = position["offset"]
+
+        handle.seek(offset)
+        body = handle.read()
+        body = body[:body.rfind(b"\n") + 1]
+        end = offset + len(body)
+        check = _tail_check(handle, end)
+
+    df = pd.read_csv(io.BytesIO(header + body), **kwargs)
+    return df, {"offset": end, "check": check}
+
+
+class ChunkedDataset:
+    """
+    Re-iterable stream of DataFrame chunks read from a CSV file.
+
+    Every iteration re-opens the file, so the same object can be handed
+    to several analysis functions; ``map`` attaches per-chunk transforms
+    such as the domain ``preprocess_*`` functions.
+    """
+
+    def __init__(self, file_path: Path, schema: dict | None = None,
+                 chunksize: int = DEFAULT_CHUNKSIZE, transforms=(), filters=None):
+        self.file_path = Path(file_path)
+        self.schema = dict(schema or {})
+        self.chunksize = chunksize
+        self.transforms = tuple(transforms)
+        self.filters = _normalise_filters(filters)
+
+        if not self.file_path.exists():
+            raise FileNotFoundError(f"{self.file_path} not found")
+
+    def map(self, func) -> "ChunkedDataset":
+        return ChunkedDataset(
+            self.file_path, self.schema, self.chunksize,
+            self.transforms + (func,), self.filters,
+        )
+
+    def __iter__(self):
+        reader = pd.read_csv(
+            self.file_path, chunksize=self.chunksize, **self.schema
+        )
+        with reader:
+            for chunk in reader:
+                if self.filters:
+                    chunk = filter_frame(chunk, self.filters)
+                    if chunk.empty:
+                        continue
+                for transform in self.transforms:
+                    chunk = transform(chunk)
+                yield chunk
+
+    def __repr__(self):
+        return (
+            f"ChunkedDataset({self.file_path.name!r}, "
+            f"chunksize={self.chunksize})"
+        )
+
+
+def stream_dataset(name: str, file_path: Path | None = None,
+                   chunksize: int = DEFAULT_CHUNKSIZE, filters=None) -> ChunkedDataset:
+    """
+    Stream a registered dataset in fixed-size chunks using its schema.
+
+    ``file_path`` overrides the default location from ``DATASET_PATHS``;
+    ``filters`` (as for ``load_csv``) are applied to every chunk before
+    its transforms.
+    """
+    if name not in DATASET_SCHEMAS:
+        raise KeyError(f"Unknown dataset: {name}")
+    return ChunkedDataset(
+        file_path or DATASET_PATHS[name], DATASET_SCHEMAS[name], chunksize,
+        filters=filters,
+    )
@@ -0,0 +1,147 @@
+"""
+Density-binned rendering for scatter plots with many rows.
+
+Above ``DEFAULT_DENSITY_THRESHOLD`` rows one marker per row is slow to
+draw and saturates into a solid blob, so the scatter plots switch to a
+2D histogram drawn as a single image. Bin counts are accumulated chunk by
+chunk with ``np.bincount`` (after one pass for the axis ranges, which an
+``AggregationContext`` already caches), so the raw frame never has to be
+materialised.
+"""
+
+import numpy as np
+import pandas as pd
+import seaborn as sns
+from matplotlib.colors import LinearSegmentedColormap, LogNorm, to_rgb
+from matplotlib.patches import Patch
+
+from src.common.aggregation import is_chunked, iter_frames, row_count, summarize
+
+# Scatter plots over more rows than this are drawn as densities
+DEFAULT_DENSITY_THRESHOLD = 50_000
+
+# Histogram resolution along x and y
+DEFAULT_BINS = (240, 160)
+
+
+def use_density(data, threshold: int | None = DEFAULT_DENSITY_THRESHOLD) -> bool:
+    """
+    Whether a scatter over ``data`` should be drawn as a density.
+
+    Chunk streams always are; ``threshold=None`` never switches.
+    """
+    if threshold is None:
+        return False
+    return is_chunked(data) or row_count(data) > threshold
+
+
+def _edges(low, high, bins: int) -> np.ndarray:
+    if pd.isna(low) or pd.isna(high):
+        low, high = 0.0, 1.0
+    elif low == high:
+        low, high = low - 0.5, high + 0.5
+    return np.linspace(float(low), float(high), bins + 1)
+
+
+def _bin_positions(values: pd.Series, edges: np.ndarray) -> np.ndarray:
+    values = values.to_numpy(dtype="float64", na_value=np.nan)
+    scaled = (values - edges[0]) / (edges[-1] - edges[0]) * (len(edges) - 1)
+    with np.errstate(invalid="ignore"):
+        return np.clip(scaled, 0, len(edges) - 2)
+
+
+def density_grid(data, x: str, y: str, bins: tuple[int, int] = DEFAULT_BINS,
+                 by: str | None = None):
+    """
+    Count rows of ``data`` per (``x``, ``y``) bin.
+
+    Returns ``(counts, x_edges, y_edges)`` where ``counts`` has shape
+    ``(x bins, y bins)``; with ``by`` it is a ``{label: counts}`` dict with
+    one grid per distinct value of that column, in order of appearance
+    (category order for categoricals).
+    """
+    x_bins, y_bins = bins
+    _, ranges = summarize(data, {x: ["min", "max"], y: ["min", "max"]})
+    x_edges = _edges(ranges[x]["min"], ranges[x]["max"], x_bins)
+    y_edges = _edges(ranges[y]["min"], ranges[y]["max"], y_bins)
+
+    size = x_bins * y_bins
+    grids = {}
+    for frame in iter_frames(data):
+        x_pos = _bin_positions(frame[x], x_edges)
+        y_pos = _bin_positions(frame[y], y_edges)
+        valid = ~np.isnan(x_pos) & ~np.isnan(y_pos)
+        flat = x_pos.astype("int64") * y_bins + y_pos.astype("int64")
+
+        if by is None:
+            groups = [(None, valid)]
+        else:
+            labels = frame[by]
+            if isinstance(labels.dtype, pd.CategoricalDtype):
+                for label in labels.cat.categories:
+                    grids.setdefault(label, np.zeros(size, dtype="int64"))
+            groups = [
+                (label, valid & (labels == label).to_numpy(dtype=bool, na_value=False))
+                for label in labels.dropna().unique()
+            ]
+
+        for label, mask in groups:
+            counts = np.bincount(flat[mask], minlength=size)
+            grids[label] = grids.get(label, 0) + counts
+
+    grids = {label: counts.reshape(bins) for label, counts in grids.items()}
+    if by is None:
+        return grids.get(None, np.zeros(bins, dtype="int64")), x_edges, y_edges
+    return grids, x_edges, y_edges
+
+
+def _fade_to(color, name: str) -> LinearSegmentedColormap:
+    red, green, blue = to_rgb(color)
+    return LinearSegmentedColormap.from_list(
+        name, [(red, green, blue, 0.15), (red, green, blue, 0.95)]
+    )
+
+
+def draw_density(ax, grid, cmap: str = "viridis", palette=None,
+                 legend_title: str | None = None):
+    """
+    Draw a ``density_grid`` result as a log-scaled 2D histogram on ``ax``.
+
+    A single grid gets a colour bar giving the rows per bin. Grouped grids
+    are each drawn in their own colour from ``palette`` (a seaborn palette
+    name or list), fading with density, and a legend names the groups.
+    """
+    grids, x_edges, y_edges = grid
+
+    if not isinstance(grids, dict):
+        counts = np.ma.masked_equal(grids.T, 0)
+        mesh = ax.pcolormesh(
+            x_edges, y_edges, counts, cmap=cmap, rasterized=True,
+            norm=LogNorm(vmin=1, vmax=max(int(grids.max()), 1)),
+        )
+        ax.figure.colorbar(mesh, ax=ax, label="Rows per bin")
+    else:
+        colors = sns.color_palette(palette, len(grids))
+        top = max([int(counts.max()) for counts in grids.values()] + [1])
+        handles = []
+        for (label, counts), color in zip(grids.items(), colors):
+            ax.pcolormesh(
+                x_edges, y_edges, np.ma.masked_equal(counts.T, 0),
+                cmap=_fade_to(color, f"density_{label}"), rasterized=True,
+                norm=LogNorm(vmin=1, vmax=top),
+            )
+            handles.append(Patch(color=color, label=str(label)))
+        ax.legend(handles=handles, title=legend_title)
+
+    ax.set_xlim(x_edges[0], x_edges[-1])
+    ax.set_ylim(y_edges[0], y_edges[-1])
+
+
+def plot_density(ax, data, x: str, y: str, bins: tuple[int, int] = DEFAULT_BINS,
+                 cmap: str = "viridis", by: str | None = None, palette=None,
+                 legend_title: str | None = None):
+    """
+    Bin ``data`` and draw it on ``ax`` (see ``draw_density``).
+    """
+    grid = density_grid(data, x, y, bins, by)
+    draw_density(ax, grid, cmap, palette, legend_title or by)
@@ -0,0 +1,155 @@
+"""
+Registry of the five analysis domains.
+
+Each entry names the dataset key used by ``common.data_loader``, the
+domain package, the preprocessing steps (``"module:function"`` paths
+inside the package, applied in order), the folder under
+``visualizations/`` its charts are exported to, extra positional
+arguments for analysis and plot functions called more than once (a list
+of argument tuples, or a ``"module:NAME"`` path to a sequence whose
+items are passed one per call), and whether the loaded data is wrapped
+in an ``AggregationContext`` (or built into a domain-specific one by a
+``"module:callable"`` path). Modules are resolved lazily so worker
+processes import only what they render.
+"""
+
+from importlib import import_module
+from pathlib import Path
+
+import pandas as pd
+
+from src.common.aggregation import AggregationContext
+from src.common.data_loader import BASE_DIR, DATASET_PATHS, load_csv
+
+VISUALIZATIONS_DIR = BASE_DIR / "visualizations"
+
+DOMAINS = {
+    "supermarket": {
+        "package": "src.supermarket_sales_analysis",
+        "preprocess": ["preprocessing:preprocess_sales_data"],
+        "output_dir": "supermarket",
+        "analysis_args": {},
+        "plot_args": {},
+        "context": "cube:SalesCube.build",
+    },
+    "education": {
+        "package": "src.student_performance_analysis",
+        "preprocess": [
+            "preprocessing:preprocess_student_data",
+            "analysis:add_result_column",
+        ],
+        "output_dir": "student_performance",
+        "analysis_args": {},
+        "plot_args": {},
+        "context": True,
+    },
+    "weather": {
+        "package": "src.weather_trends_analysis",
+        "preprocess": ["preprocessing:preprocess_weather_data"],
+        "output_dir": "weather",
+        "analysis_args": {},
+        "plot_args": {},
+        "context": True,
+    },
+    "healthcare": {
+        "package": "src.healthcare_covid_analysis",
+        "preprocess": ["preprocessing:preprocess_covid_data"],
+        "output_dir": "healthcare",
+        "analysis_args": {"comorbidity_mortality": "analysis:COMORBIDITIES"},
+        "plot_args": {"plot_comorbidity_impact": "analysis:COMORBIDITIES"},
+        "context": "bitmap_index:CovidBitmapIndex.build",
+    },
+    "finance": {
+        "package": "src.finance_stock_market_analysis",
+        "preprocess": ["preprocessing:preprocess_finance_data"],
+        "output_dir": "finance",
+        "analysis_args": {},
+        "plot_args": {},
+        "context": False,
+    },
+}
+
+
+def domain_module(domain: str, module: str):
+    return import_module(f"{DOMAINS[domain]['package']}.{module}")
+
+
+def _resolve(domain: str, path: str):
+    module, name = path.split(":")
+    value = domain_module(domain, module)
+    for attribute in name.split("."):
+        value = getattr(value, attribute)
+    return value
+
+
+def preprocess(domain: str, df: pd.DataFrame) -> pd.DataFrame:
+    for step in DOMAINS[domain]["preprocess"]:
+        df = _resolve(domain, step)(df)
+    return df
+
+
+def load_domain_data(domain: str, file_path: Path | None = None):
+    """
+    Load and preprocess a domain's dataset.
+
+    Domains whose plot functions accept an ``AggregationContext`` get one,
+    so charts rendered from the same data share their group-bys. A
+    ``"module:callable"`` context builds a domain-specific one instead.
+    """
+    df = preprocess(domain, load_csv(Path(file_path or DATASET_PATHS[domain])))
+    context = DOMAINS[domain]["context"]
+    if isinstance(context, str):
+        return _resolve(domain, context)(df)
+    if context:
+        return AggregationContext(df)
+    return df
+
+
+def output_dir(domain: str, root: Path = VISUALIZATIONS_DIR) -> Path:
+    return Path(root) / DOMAINS[domain]["output_dir"]
+
+
+def _public_functions(domain: str, module_name: str) -> list[str]:
+    module = domain_module(domain, module_name)
+    return [
+        name for name, value in vars(module).items()
+        if not name.startswith("_") and callable(value)
+        and getattr(value, "__module__", None) == module.__name__
+    ]
+
+
+def _with_args(domain: str, names: list[str], extra: dict) -> list[tuple[str, tuple]]:
+    jobs = []
+    for name in names:
+        calls = extra.get(name, [()])
+        if isinstance(calls, str):
+            calls = [(item,) for item in _resolve(domain, calls)]
+        jobs.extend((name, args) for args in calls)
+    return jobs
+
+
+def plot_functions(domain: str) -> list[str]:
+    """
+    Names of the domain's ``plot_*`` functions, in definition order.
+    """
+    return [name for name in _public_functions(domain, "visualization") if name.startswith("plot_")]
+
+
+def plot_jobs(domain: str) -> list[tuple[str, tuple]]:
+    """
+    ``(plot function, extra args)`` pairs covering every chart of a domain.
+    """
+    return _with_args(domain, plot_functions(domain), DOMAINS[domain]["plot_args"])
+
+
+def analysis_jobs(domain: str) -> list[tuple[str, tuple]]:
+    """
+    ``(analysis function, extra args)`` pairs, excluding preprocessing steps.
+    """
+    steps = {step.split(":")[1] for step in DOMAINS[domain]["preprocess"]}
+    names = [name for name in _public_functions(domain, "analysis") if name not in steps]
+    return _with_args(domain, names, DOMAINS[domain]["analysis_args"])
+
+
+def insight_functions(domain: str) -> list[str]:
+    return [name for name in _public_functions(domain, "insights") if name.startswith("generate_")]
@@ -0,0 +1,99 @@
+"""
+Downsampling of long line series before they are handed to matplotlib.
+
+A chart a few thousand pixels wide cannot show more than a few points per
+pixel column, so series longer than ``DEFAULT_MAX_POINTS`` are reduced to
+the points that shape the drawn line:
+
+* ``"minmax"`` (M4): the series is cut into consecutive buckets and the
+  first, last, lowest and highest point of each is kept, so peaks and
+  troughs survive exactly.
+* ``"lttb"``: Largest-Triangle-Three-Buckets keeps one point per bucket,
+  chosen to preserve the perceived shape with fewer points.
+
+Both return positions into the original series, so callers can slice
+whatever they plot (``series.iloc[positions]``) and keep its dtypes.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Series longer than this are downsampled by default
+DEFAULT_MAX_POINTS = 4000
+
+DOWNSAMPLING_METHODS = ("minmax", "lttb")
+
+
+def _as_float(values) -> np.ndarray:
+    series = values if isinstance(values, (pd.Series, pd.Index)) else pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        ints = series.array.asi8.astype("float64")
+        ints[np.asarray(series.isna())] = np.nan
+        return ints
+    return np.asarray(series.to_numpy(dtype="float64", na_value=np.nan))
+
+
+def _minmax_positions(y: np.ndarray, max_points: int) -> np.ndarray:
+    buckets = max(1, max_points // 4)
+    bucket = np.arange(len(y)) * buckets // len(y)
+
+    # Within every bucket, order by value: the first and last entries
+    # are the minimum and maximum
+    order = np.lexsort((y, bucket))
+    edges = np.flatnonzero(np.diff(bucket, prepend=-1))
+    ends = np.append(edges[1:], len(y)) - 1
+
+    keep = np.concatenate([edges, ends, order[edges], order[ends]])
+    return np.unique(keep)
+
+
+def _lttb_positions(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    count = len(y)
+    edges = np.linspace(1, count - 1, max_points - 1).astype("int64")
+
+    keep = np.empty(max_points, dtype="int64")
+    keep[0], keep[-1] = 0, count - 1
+    previous = 0
+    for i in range(max_points - 2):
+        start, end = edges[i], edges[i + 1]
+        # Average of the next bucket (or the last point) as the third vertex
+        next_end = edges[i + 2] if i + 2 < len(edges) else count
+        next_x = x[end:next_end].mean()
+        next_y = y[end:next_end].mean()
+
+        area = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        keep[i + 1] = previous
+    return keep
+
+
+def downsample_positions(x, y, max_points: int | None = DEFAULT_MAX_POINTS,
+                         method: str = "minmax") -> np.ndarray:
+    """
+    Positions of the points to draw for the line ``(x, y)``.
+
+    Series of at most ``max_points`` points (or any series when
+    ``max_points`` is ``None``) are kept whole; longer ones are reduced to
+    about ``max_points`` points, skipping missing ones.
+    """
+    if method not in DOWNSAMPLING_METHODS:
+        raise ValueError(f"Unknown downsampling method: {method}")
+    if max_points is None or len(y) <= max_points:
+        return np.arange(len(y))
+    if max_points < 4:
+        raise ValueError("max_points must be at least 4")
+
+    x_values = _as_float(x)
+    y_values = _as_float(y)
+    valid = np.flatnonzero(~np.isnan(x_values) & ~np.isnan(y_values))
+    if len(valid) <= max_points:
+        return valid
+
+    if method == "minmax":
+        positions = _minmax_positions(y_values[valid], max_points)
+    else:
+        positions = _lttb_positions(x_values[valid], y_values[valid], max_points)
+    return valid[positions]
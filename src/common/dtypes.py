@@ -0,0 +1,193 @@
+"""
+Compact dtype registry applied by each domain's preprocessing.
+
+Low-cardinality strings become categoricals, small integer codes become
+int8/uint8, coded "unknown" sentinels become missing values of a nullable
+integer type, and measurements that only carry a few significant digits
+become float32. Monetary columns stay float64.
+"""
+
+import numpy as np
+import pandas as pd
+
+# COVID flags use 1 = yes, 2 = no and 97/98/99 for "not applicable",
+# "ignored" and "not specified"
+COVID_SENTINELS = [97, 98, 99]
+
+_COVID_FLAG_COLUMNS = [
+    "USMER", "SEX", "PATIENT_TYPE", "INTUBED", "PNEUMONIA", "PREGNANT",
+    "DIABETES", "COPD", "ASTHMA", "INMSUPR", "HIPERTENSION", "OTHER_DISEASE",
+    "CARDIOVASCULAR", "OBESITY", "RENAL_CHRONIC", "TOBACCO", "ICU",
+]
+
+_FINANCE_RANK_COLUMNS = [
+    "Mutual_Funds", "Equity_Market", "Debentures", "Government_Bonds",
+    "Fixed_Deposits", "PPF", "Gold",
+]
+
+DTYPE_REGISTRY = {
+    "supermarket": {
+        "Branch": "category",
+        "City": "category",
+        "Customer_Type": "category",
+        "Gender": "category",
+        "Product_Line": "category",
+        "Payment": "category",
+        "Date": "category",
+        "Time": "category",
+        "Quantity": "uint8",
+        "Rating": "float32",
+    },
+    "education": {
+        "student_id": "int32",
+        "age": "uint8",
+        "gender": "category",
+        "school_type": "category",
+        "parent_education": "category",
+        "internet_access": "category",
+        "travel_time": "category",
+        "extra_activities": "category",
+        "study_method": "category",
+        "final_grade": "category",
+        "study_hours": "float32",
+        "attendance_percentage": "float32",
+        "math_score": "float32",
+        "science_score": "float32",
+        "english_score": "float32",
+        "overall_score": "float32",
+    },
+    "weather": {
+        "Summary": "category",
+        "Precip Type": "category",
+        "Daily Summary": "category",
+        "Temperature (C)": "float32",
+        "Apparent Temperature (C)": "float32",
+        "Humidity": "float32",
+        "Wind Speed (km/h)": "float32",
+        "Wind Bearing (degrees)": "float32",
+        "Visibility (km)": "float32",
+        "Loud Cover": "float32",
+        "Pressure (millibars)": "float32",
+    },
+    "healthcare": {
+        **{col: "Int8" for col in _COVID_FLAG_COLUMNS},
+        "MEDICAL_UNIT": "uint8",
+        "CLASIFFICATION_FINAL": "uint8",
+        "AGE": "uint8",
+        "DATE_DIED": "category",
+    },
+    "finance": {
+        "gender": "category",
+        "age": "uint8",
+        **{col: "int8" for col in _FINANCE_RANK_COLUMNS},
+        "Investment_Avenues": "category",
+        "Stock_Marktet": "category",
+        "Factor": "category",
+        "Objective": "category",
+        "Purpose": "category",
+        "Duration": "category",
+        "Invest_Monitor": "category",
+        "Expect": "category",
+        "Avenue": "category",
+        "What are your savings objectives?": "category",
+        "Reason_Equity": "category",
+        "Reason_Mutual": "category",
+        "Reason_Bonds": "category",
+        "Reason_FD": "category",
+        "Source": "category",
+    },
+}
+
+# Coded values that mean "unknown" and are stored as missing
+SENTINEL_REGISTRY = {
+    "healthcare": {col: COVID_SENTINELS for col in _COVID_FLAG_COLUMNS},
+}
+
+
+def _fits_integer(series: pd.Series, dtype: str) -> bool:
+    # "Int8"/"UInt8" are the nullable counterparts of "int8"/"uint8"
+    nullable = dtype[0].isupper()
+    info = np.iinfo(np.dtype(dtype.lower()))
+    if not pd.api.types.is_numeric_dtype(series):
+        return False
+    values = series.dropna()
+    if values.empty:
+        return True
+    if not nullable and len(values) != len(series):
+        # Plain numpy integers cannot hold missing values
+        return False
+    if not np.all(np.mod(values, 1) == 0):
+        return False
+    return info.min <= values.min() and values.max() <= info.max
+
+
+def _convert(series: pd.Series, dtype: str, sentinels=None) -> pd.Series | None:
+    if sentinels:
+        series = series.mask(series.isin(sentinels))
+
+    if dtype == "category":
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            return series
+        return series.astype("category")
+
+    if dtype.startswith("float"):
+        if not pd.api.types.is_numeric_dtype(series):
+            return None
+        return series.astype(dtype)
+
+    if not _fits_integer(series, dtype):
+        return None
+    return series.astype(dtype)
+
+
+def compact_dtypes(df: pd.DataFrame, domain: str) -> pd.DataFrame:
+    """
+    Return a copy of ``df`` with the registered compact dtypes applied.
+
+    Columns that are absent, already converted, or whose values do not
+    fit the target type are left unchanged.
+    """
+    registry = DTYPE_REGISTRY[domain]
+    sentinels = SENTINEL_REGISTRY.get(domain, {})
+
+    converted = {}
+    for column, dtype in registry.items():
+        if column not in df.columns or str(df[column].dtype) == dtype:
+            continue
+        result = _convert(df[column], dtype, sentinels.get(column))
+        if result is not None:
+            converted[column] = result
+
+    return df.assign(**converted)
+
+
+def memory_report(before: pd.DataFrame, after: pd.DataFrame) -> dict:
+    """
+    Compare the deep memory usage of two versions of the same frame.
+    """
+    before_bytes = before.memory_usage(deep=True)
+    after_bytes = after.memory_usage(deep=True).reindex(before_bytes.index, fill_value=0)
+
+    columns = {
+        column: {
+            "before": int(before_bytes[column]),
+            "after": int(after_bytes[column]),
+            "dtype": str(after[column].dtype) if column in after else None,
+        }
+        for column in before_bytes.index
+        if column != "Index"
+    }
+
+    total_before = int(before_bytes.sum())
+    total_after = int(after_bytes.sum())
+    return {
+        "bytes_before": total_before,
+        "bytes_after": total_after,
+        "bytes_saved": total_before - total_after,
+        "reduction_factor": total_before / total_after if total_after else float("nan"),
+        "columns": columns,
+    }
+
+
+def dtype_savings_report(df: pd.DataFrame, domain: str) -> dict:
+    return memory_report(df, compact_dtypes(df, domain))
@@ -0,0 +1,87 @@
+"""
+Vectorised feature-engineering helpers shared by the preprocessing modules.
+"""
+
+import numpy as np
+import pandas as pd
+
+MONTH_NAMES = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December"
+]
+
+DAY_NAMES = [
+    "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"
+]
+
+# Largest integer range binned through a lookup table
+_MAX_LOOKUP_SIZE = 1 << 16
+
+
+def _as_float_array(series: pd.Series) -> np.ndarray:
+    return series.to_numpy(dtype="float64", na_value=np.nan)
+
+
+def _bin_codes(values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    codes = np.searchsorted(edges, values, side="left") - 1
+    inside = (values > edges[0]) & (values <= edges[-1])
+    return np.where(inside, codes, -1)
+
+
+def bin_values(series: pd.Series, bins: list, labels: list[str]) -> pd.Series:
+    """
+    Vectorised ``pd.cut(series, bins, labels=labels)`` for right-closed bins.
+
+    Bin codes come from ``np.searchsorted`` over the bin edges (through a
+    precomputed lookup table for integer columns); values outside
+    ``(bins[0], bins[-1]]`` and missing values map to NaN.
+    """
+    edges = np.asarray(bins, dtype="float64")
+
+    codes = None
+    if pd.api.types.is_integer_dtype(series.dtype) and not series.hasnans and len(series):
+        values = series.to_numpy()
+        low, high = int(values.min()), int(values.max())
+        if high - low < _MAX_LOOKUP_SIZE:
+            # Small integer ranges (ages, etc.): bin each possible value once
+            # and gather the codes from the lookup table
+            table = _bin_codes(np.arange(low, high + 1, dtype="float64"), edges)
+            codes = table[values.astype("int64") - low]
+
+    if codes is None:
+        codes = _bin_codes(_as_float_array(series), edges)
+
+    return pd.Series(
+        pd.Categorical.from_codes(codes, categories=labels, ordered=True),
+        index=series.index,
+        name=series.name,
+    )
+
+
+def label_codes(codes: pd.Series, names: list[str], offset: int = 0) -> pd.Series:
+    """
+    Map integer codes (month numbers, weekday numbers) to a categorical of names.
+
+    ``names[i]`` is the label of code ``i + offset``. Categories are kept in
+    alphabetical order so group-bys come out in the same order as they did
+    for the plain string columns this replaces.
+    """
+    categories = sorted(names)
+    lookup = np.array([categories.index(name) for name in names])
+
+    values = _as_float_array(codes)
+    valid = ~np.isnan(values)
+    category_codes = np.full(len(values), -1, dtype="int64")
+    category_codes[valid] = lookup[values[valid].astype("int64") - offset]
+
+    return pd.Series(
+        pd.Categorical.from_codes(category_codes, categories=categories),
+        index=codes.index,
+    )
+
+
+def binary_flag(condition) -> np.ndarray:
+    """
+    Turn a boolean mask into a compact 0/1 indicator.
+    """
+    return np.asarray(condition, dtype="int8")
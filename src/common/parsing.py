@@ -0,0 +1,80 @@
+"""
+Parse-once helpers for low-cardinality columns.
+
+Dates, times and coded answers repeat heavily, so each distinct value is
+parsed a single time and the result broadcast back through the integer
+codes of the column. Parsing cost then scales with the number of
+distinct values rather than with the number of rows.
+"""
+
+import re
+
+import pandas as pd
+
+
+def _codes_and_uniques(series: pd.Series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), pd.Series(series.cat.categories)
+    codes, uniques = pd.factorize(series)
+    return codes, pd.Series(uniques)
+
+
+def map_unique(series: pd.Series, func, fill_value=None) -> pd.Series:
+    """
+    Apply a vectorised ``func`` to the distinct values of ``series`` only.
+
+    ``func`` receives a Series of distinct values and must return an
+    array-like of the same length. Missing entries of ``series`` map to
+    ``fill_value`` (missing by default).
+    """
+    codes, uniques = _codes_and_uniques(series)
+    mapped = pd.array(func(uniques))
+    values = mapped.take(codes, allow_fill=True, fill_value=fill_value)
+    return pd.Series(values, index=series.index, name=series.name)
+
+
+def parse_datetimes(series: pd.Series, format: str | None = None, **kwargs) -> pd.Series:
+    """
+    ``pd.to_datetime`` evaluated once per distinct string.
+    """
+    return map_unique(series, lambda uniques: pd.to_datetime(uniques, format=format, **kwargs))
+
+
+_OFFSET_PATTERN = re.compile(r"([+-])(\d{2}):?(\d{2})")
+
+
+def _offsets_to_timedelta(offsets: pd.Series) -> pd.Series:
+    def to_delta(text):
+        match = _OFFSET_PATTERN.fullmatch(str(text))
+        if match is None:
+            return pd.NaT
+        sign = -1 if match.group(1) == "-" else 1
+        return sign * pd.Timedelta(hours=int(match.group(2)), minutes=int(match.group(3)))
+
+    return pd.Series([to_delta(text) for text in offsets], dtype="timedelta64[ns]")
+
+
+def parse_offset_datetimes(series: pd.Series, local_format: str = "%Y-%m-%d %H:%M:%S.%f") -> pd.Series:
+    """
+    Parse ``"<local time> <+HHMM>"`` strings into UTC timestamps.
+
+    Timestamps are almost all distinct, but their UTC offsets are not: the
+    local part goes through the fast fixed-format parser and each distinct
+    offset is parsed once. Rows that do not fit this layout fall back to
+    ``pd.to_datetime(..., utc=True)`` with format inference.
+    """
+    if series.empty:
+        return pd.Series(index=series.index, dtype="datetime64[ns, UTC]", name=series.name)
+
+    parts = series.astype("str").str.rpartition(" ")
+    local = pd.to_datetime(parts[0], format=local_format, errors="coerce")
+    offsets = map_unique(parts[2], _offsets_to_timedelta)
+
+    parsed = (local - offsets.to_numpy()).dt.tz_localize("UTC").dt.as_unit(local.dt.unit)
+    parsed.index = series.index
+    parsed.name = series.name
+
+    failed = parsed.isna() & series.notna()
+    if failed.any():
+        parsed[failed] = parse_datetimes(series[failed], utc=True, errors="coerce")
+    return parsed
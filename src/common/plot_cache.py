@@ -0,0 +1,197 @@
+"""
+Content-addressed cache of rendered charts.
+
+A chart's key hashes exactly what determines its pixels: the reduced data
+the plot function draws (the aggregated series, pivot, density grid or the
+columns of a scatter), its styling arguments, the source of the module
+defining the plot (and of any drawing helpers passed in), the active
+matplotlib rcParams and the matplotlib/seaborn versions. When an artifact
+with that key exists it is copied into place instead of drawing the
+figure again, so regenerating the charts after a small data change only
+redraws the ones whose inputs moved.
+
+Artifacts live in one flat directory named by key; the least recently
+used ones are evicted once it holds more than ``max_entries``.
+"""
+
+import hashlib
+import inspect
+import os
+import shutil
+from functools import lru_cache
+from pathlib import Path
+
+import matplotlib
+import numpy as np
+import pandas as pd
+import seaborn as sns
+
+from src.common.data_loader import BASE_DIR
+
+DEFAULT_CACHE_DIR = BASE_DIR / "visualizations" / ".cache"
+DEFAULT_MAX_ENTRIES = 256
+
+_SETTINGS = {
+    "enabled": True,
+    "directory": DEFAULT_CACHE_DIR,
+    "max_entries": DEFAULT_MAX_ENTRIES,
+}
+
+# rcParams that do not change the saved file
+_IGNORED_RCPARAMS = ("backend", "interactive", "webagg.", "tk.", "macosx.")
+
+# Lookups of the current process, for reporting
+_STATS = {"hits": 0, "misses": 0}
+
+
+def configure_cache(enabled: bool | None = None, directory: Path | None = None,
+                    max_entries: int | None = None):
+    """
+    Change the cache settings of the current process.
+    """
+    if enabled is not None:
+        _SETTINGS["enabled"] = enabled
+    if directory is not None:
+        _SETTINGS["directory"] = Path(directory)
+    if max_entries is not None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        _SETTINGS["max_entries"] = max_entries
+
+
+def cache_settings() -> dict:
+    return dict(_SETTINGS)
+
+
+def cache_stats() -> dict:
+    return dict(_STATS)
+
+
+# --------------------------------------------------
+# Keys
+# --------------------------------------------------
+@lru_cache(maxsize=None)
+def _source_digest(path: str) -> bytes:
+    with open(path, "rb") as handle:
+        return hashlib.blake2b(handle.read(), digest_size=16).digest()
+
+
+def _update(digest, value):
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        names = list(value.columns) if isinstance(value, pd.DataFrame) else [value.name]
+        dtypes = value.dtypes if isinstance(value, pd.DataFrame) else [value.dtype]
+        layout = (type(value).__name__, value.shape, names, list(map(str, dtypes)))
+        digest.update(repr(layout).encode())
+        if not isinstance(value, pd.Index):
+            digest.update(repr((list(value.index.names), str(value.index.dtype))).encode())
+        digest.update(pd.util.hash_pandas_object(value).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(repr((value.dtype.str, value.shape)).encode())
+        if value.dtype == object:
+            digest.update(repr(value.tolist()).encode())
+        else:
+            digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"{type(value).__name__}:{len(value)}".encode())
+        for item in value:
+            _update(digest, item)
+    elif isinstance(value, dict):
+        digest.update(f"dict:{len(value)}".encode())
+        for key, item in value.items():
+            _update(digest, key)
+            _update(digest, item)
+    elif inspect.isfunction(value):
+        digest.update(f"{value.__module__}.{value.__qualname__}".encode())
+        digest.update(_source_digest(inspect.getsourcefile(value)))
+    else:
+        digest.update(repr(value).encode())
+    digest.update(b"\x00")
+
+
+def chart_key(plot, *inputs) -> str:
+    """
+    Cache key of the chart drawn by ``plot`` from ``inputs``.
+
+    Callables among ``inputs`` (drawing helpers) contribute their module
+    source, like ``plot`` itself.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    _update(digest, plot)
+    _update(digest, (matplotlib.__version__, sns.__version__))
+    _update(digest, [
+        item for item in sorted(matplotlib.rcParams.items())
+        if not item[0].startswith(_IGNORED_RCPARAMS)
+    ])
+    for value in inputs:
+        _update(digest, value)
+    return digest.hexdigest()
+
+
+# --------------------------------------------------
+# Artifacts
+# --------------------------------------------------
+def _artifact(key: str, output_path: Path) -> Path:
+    return _SETTINGS["directory"] / f"{key}{Path(output_path).suffix}"
+
+
+def restore_chart(key: str, output_path: Path) -> bool:
+    """
+    Copy the cached artifact for ``key`` to ``output_path``.
+
+    Returns whether it existed; the chart has to be drawn when it did not.
+    """
+    if not _SETTINGS["enabled"]:
+        return False
+
+    artifact = _artifact(key, output_path)
+    tmp_path = Path(f"{output_path}.{os.getpid()}.tmp")
+    try:
+        shutil.copyfile(artifact, tmp_path)
+        os.replace(tmp_path, output_path)
+        # Mark as recently used
+        os.utime(artifact)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        _STATS["misses"] += 1
+        return False
+
+    _STATS["hits"] += 1
+    return True
+
+
+def store_chart(key: str, output_path: Path):
+    """
+    Add the freshly rendered ``output_path`` to the cache under ``key``.
+    """
+    if not _SETTINGS["enabled"]:
+        return
+
+    artifact = _artifact(key, output_path)
+    artifact.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = artifact.with_name(f"{artifact.name}.{os.getpid()}.tmp")
+    shutil.copyfile(output_path, tmp_path)
+    os.replace(tmp_path, artifact)
+    evict(_SETTINGS["max_entries"])
+
+
+def evict(max_entries: int = DEFAULT_MAX_ENTRIES):
+    """
+    Delete the least recently used artifacts beyond ``max_entries``.
+    """
+    directory = _SETTINGS["directory"]
+    if not directory.exists():
+        return
+
+    entries = []
+    for path in directory.iterdir():
+        if path.suffix == ".tmp":
+            continue
+        try:
+            entries.append((path.stat().st_mtime, path))
+        except FileNotFoundError:
+            continue
+
+    entries.sort()
+    for _, path in entries[:max(0, len(entries) - max_entries)]:
+        # Another worker may have evicted it already
+        path.unlink(missing_ok=True)
@@ -0,0 +1,176 @@
+"""
+Parallel chart rendering for the visualization modules.
+
+Every (domain, plot function, extra arguments) combination is a chart
+job. Jobs run on a process pool with the non-interactive Agg backend, in
+batches of charts of one domain: each domain gets a share of the workers
+proportional to its number of charts, and a worker loads and
+preprocesses a domain's dataset once for a batch (and keeps it for the
+next batch of the same domain). A domain is therefore loaded at most
+once per worker rendering it, rather than once per chart. Charts whose
+drawn data is unchanged are copied from the plot cache
+(``common.plot_cache``).
+"""
+
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import matplotlib
+
+from src.common.data_loader import DATASET_PATHS
+from src.common.domains import (
+    DOMAINS,
+    VISUALIZATIONS_DIR,
+    domain_module,
+    load_domain_data,
+    output_dir,
+    plot_jobs,
+)
+from src.common.plot_cache import cache_settings, cache_stats, configure_cache
+
+# The domain data last loaded by this process: (domain, file path, data)
+_LOADED = None
+
+
+def _use_agg():
+    matplotlib.use("Agg")
+
+
+def _init_worker(settings: dict):
+    _use_agg()
+    configure_cache(**settings)
+
+
+def render_chart(domain: str, plot: str, args: tuple, data,
+                 root: Path = VISUALIZATIONS_DIR) -> dict:
+    """
+    Render one chart from a domain's loaded data and report how long it
+    took and whether it came from the plot cache; failures are captured in
+    the result rather than raised.
+    """
+    hits = cache_stats()["hits"]
+    start = time.perf_counter()
+    error = None
+    try:
+        plot_func = getattr(domain_module(domain, "visualization"), plot)
+        plot_func(data, output_dir(domain, root), *args)
+    except Exception:
+        error = traceback.format_exc()
+
+    return {
+        "domain": domain,
+        "plot": plot,
+        "args": list(args),
+        "seconds": time.perf_counter() - start,
+        "cached": cache_stats()["hits"] > hits,
+        "error": error,
+    }
+
+
+def _domain_data(domain: str, file_path: Path):
+    global _LOADED
+    if _LOADED is None or _LOADED[:2] != (domain, file_path):
+        # Only one domain is held at a time
+        _LOADED = None
+        _LOADED = (domain, file_path, load_domain_data(domain, file_path))
+    return _LOADED[2]
+
+
+def render_batch(domain: str, jobs: list[tuple[str, tuple]], file_path: Path | None = None,
+                 root: Path = VISUALIZATIONS_DIR) -> list[dict]:
+    """
+    Render ``(plot, args)`` jobs of one domain from its dataset, loaded
+    once per process. A dataset that fails to load is reported as one
+    failed result.
+    """
+    start = time.perf_counter()
+    try:
+        data = _domain_data(domain, Path(file_path or DATASET_PATHS[domain]))
+    except Exception:
+        return [{
+            "domain": domain,
+            "plot": None,
+            "args": [],
+            "seconds": time.perf_counter() - start,
+            "cached": False,
+            "error": traceback.format_exc(),
+        }]
+    return [render_chart(domain, plot, args, data, root) for plot, args in jobs]
+
+
+def _batches(jobs: list[tuple], workers: int) -> list[tuple]:
+    """
+    Split every domain's ``(domain, charts, file_path, root)`` job into
+    batches, giving each domain a share of ``workers`` proportional to its
+    number of charts (at least one batch, at most one per chart).
+    """
+    total = sum(len(charts) for _, charts, _, _ in jobs) or 1
+    batches = []
+    for domain, charts, file_path, root in jobs:
+        count = min(len(charts), max(1, round(workers * len(charts) / total)))
+        size, extra = divmod(len(charts), count)
+        start = 0
+        for index in range(count):
+            stop = start + size + (index < extra)
+            batches.append((domain, charts[start:stop], file_path, root))
+            start = stop
+    return batches
+
+
+def render_all(domains: list[str] | None = None, workers: int | None = None,
+               data_paths: dict | None = None, root: Path = VISUALIZATIONS_DIR,
+               cache: bool = True, cache_dir: Path | None = None) -> list[dict]:
+    """
+    Render every chart of ``domains`` (all five by default).
+
+    ``workers`` defaults to the number of CPUs; ``workers=1`` renders in
+    the calling process.
+    ``data_paths`` overrides dataset locations per domain. ``cache=False``
+    redraws every chart; ``cache_dir`` moves the plot cache. Results come
+    back in job order.
+    """
+    _use_agg()
+    configure_cache(enabled=cache, directory=cache_dir)
+    domains = domains or list(DOMAINS)
+    data_paths = data_paths or {}
+    workers = workers or os.cpu_count() or 1
+
+    results = []
+    jobs = []
+    for domain in domains:
+        file_path = Path(data_paths.get(domain, DATASET_PATHS[domain]))
+        if not file_path.exists():
+            results.append({
+                "domain": domain,
+                "plot": None,
+                "args": [],
+                "seconds": 0.0,
+                "cached": False,
+                "error": f"Dataset not found: {file_path}",
+            })
+            continue
+        jobs.append((domain, plot_jobs(domain), file_path, root))
+
+    if workers == 1:
+        for job in jobs:
+            results.extend(render_batch(*job))
+        return results
+
+    batches = _batches(jobs, workers)
+    failed = set()
+    with ProcessPoolExecutor(max_workers=min(workers, len(batches)) or 1,
+                             initializer=_init_worker,
+                             initargs=(cache_settings(),)) as pool:
+        futures = [pool.submit(render_batch, *batch) for batch in batches]
+        for future in futures:
+            for result in future.result():
+                if result["plot"] is None:
+                    # Every batch of a domain reports its failed load
+                    if result["domain"] in failed:
+                        continue
+                    failed.add(result["domain"])
+                results.append(result)
+    return results
@@ -0,0 +1,327 @@
+"""
+Resident analytics server.
+
+Keeps every served domain's preprocessed dataset in memory (as an
+``AggregationContext`` where the domain uses one, so its group-bys are
+shared across requests) and answers the analysis functions and insight
+generators as JSON over HTTP:
+
+    GET /                                    domains and their endpoints
+    GET /<domain>                            dataset status and endpoints
+    GET /<domain>/analysis/<function>?k=v    an analysis function
+    GET /<domain>/insights/<generator>       an insight generator
+
+Query parameters become keyword arguments; values are parsed as JSON when
+they are valid JSON (``?top_n=5``, ``?approximate=true``) and passed as
+strings otherwise (``?condition=DIABETES``). Responses are memoised per
+dataset version, and a background thread reloads a dataset once its
+source file changes; requests keep being served from the previous version
+until the new one is ready.
+"""
+
+import json
+import os
+import threading
+import time
+import traceback
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from src.common.data_loader import DATASET_PATHS
+from src.common.domains import (
+    DOMAINS,
+    analysis_jobs,
+    domain_module,
+    insight_functions,
+    load_domain_data,
+)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8050
+
+# Seconds between checks of the source files
+DEFAULT_POLL_INTERVAL = 2.0
+
+
+class EndpointError(Exception):
+    """
+    A request that cannot be answered; carries the HTTP status to send.
+    """
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+# --------------------------------------------------
+# JSON conversion
+# --------------------------------------------------
+def _label(value) -> str:
+    if isinstance(value, tuple):
+        return " / ".join(map(_label, value))
+    return str(to_json_value(value))
+
+
+def to_json_value(value):
+    """
+    Convert an analysis result to plain JSON types.
+
+    Series become ``{index label: value}`` objects and DataFrames
+    ``{"columns", "index", "data"}`` objects (pandas' "split" layout);
+    missing values become ``null``.
+    """
+    if isinstance(value, pd.DataFrame):
+        return {
+            "columns": [_label(column) for column in value.columns],
+            "index": [_label(label) for label in value.index],
+            "data": [[to_json_value(item) for item in row] for row in value.itertuples(index=False)],
+        }
+    if isinstance(value, pd.Series):
+        return {_label(label): to_json_value(item) for label, item in value.items()}
+    if isinstance(value, dict):
+        return {_label(key): to_json_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray, pd.Index)):
+        return [to_json_value(item) for item in value]
+    if isinstance(value, (pd.Timestamp, pd.Timedelta, pd.Period)):
+        return str(value)
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or isinstance(value, (str, bool, int)):
+        return value
+    if isinstance(value, float):
+        return None if np.isnan(value) or np.isinf(value) else value
+    if pd.api.types.is_scalar(value) and pd.isna(value):
+        return None
+    return str(value)
+
+
+def _parse_argument(value: str):
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+# --------------------------------------------------
+# Resident datasets
+# --------------------------------------------------
+def _signature(path: Path) -> tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class DomainState:
+    """
+    One domain's loaded dataset and the responses computed from it.
+    """
+
+    def __init__(self, domain: str, path: Path):
+        self.domain = domain
+        self.path = Path(path)
+        # Endpoint kinds are named after the module holding their functions
+        self.endpoints = {
+            "analysis": sorted({name for name, _ in analysis_jobs(domain)}),
+            "insights": insight_functions(domain),
+        }
+        self.data = None
+        self.signature = None
+        self.loaded_at = None
+        self.load_seconds = None
+        self.reloads = 0
+        self.error = None
+        self._responses = {}
+        self._lock = threading.Lock()
+
+    def load(self):
+        """
+        Load the source file; on failure the previous data stays in place
+        and the file is not retried until it changes again.
+        """
+        try:
+            signature = _signature(self.path)
+        except OSError:
+            self.error = traceback.format_exc()
+            return False
+
+        try:
+            start = time.perf_counter()
+            data = load_domain_data(self.domain, self.path)
+            seconds = time.perf_counter() - start
+        except Exception:
+            self.signature = signature
+            self.error = traceback.format_exc()
+            return False
+
+        with self._lock:
+            if self.data is not None:
+                self.reloads += 1
+            self.data = data
+            self.signature = signature
+            self.loaded_at = time.time()
+            self.load_seconds = seconds
+            self.error = None
+            self._responses = {}
+        return True
+
+    def is_stale(self) -> bool:
+        try:
+            return _signature(self.path) != self.signature
+        except OSError:
+            # Missing while being replaced; keep serving the loaded data
+            return False
+
+    def status(self) -> dict:
+        return {
+            "domain": self.domain,
+            "path": str(self.path),
+            "loaded": self.data is not None,
+            "loaded_at": self.loaded_at,
+            "load_seconds": self.load_seconds,
+            "reloads": self.reloads,
+            "error": self.error,
+            "endpoints": self.endpoints,
+        }
+
+    def call(self, kind: str, name: str, arguments: dict):
+        """
+        JSON result of endpoint ``kind``/``name`` called with ``arguments``.
+        """
+        if name not in self.endpoints.get(kind, ()):
+            raise EndpointError(HTTPStatus.NOT_FOUND, f"Unknown endpoint: {self.domain}/{kind}/{name}")
+        if self.data is None:
+            raise EndpointError(HTTPStatus.SERVICE_UNAVAILABLE, f"{self.domain} data is not loaded")
+
+        key = (kind, name, tuple(sorted(arguments.items())))
+        # Requests for a domain are answered one at a time so its
+        # aggregation cache is filled once
+        with self._lock:
+            if key not in self._responses:
+                function = getattr(domain_module(self.domain, kind), name)
+                kwargs = {argument: _parse_argument(value) for argument, value in arguments.items()}
+                try:
+                    result = function(self.data, **kwargs)
+                except (TypeError, ValueError, KeyError) as error:
+                    raise EndpointError(HTTPStatus.BAD_REQUEST, f"{type(error).__name__}: {error}")
+                self._responses[key] = json.dumps(to_json_value(result)).encode()
+            return self._responses[key]
+
+
+class AnalyticsServer(ThreadingHTTPServer):
+    """
+    HTTP server answering from resident ``DomainState`` objects.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], states: dict,
+                 poll_interval: float | None = DEFAULT_POLL_INTERVAL, log=None,
+                 log_requests: bool = True):
+        super().__init__(address, AnalyticsRequestHandler)
+        self.states = states
+        self.poll_interval = poll_interval
+        self.log = log or (lambda message: None)
+        self.log_requests = log_requests
+        self._stop = threading.Event()
+        self._watcher = None
+
+    def refresh(self):
+        """
+        Reload every dataset whose source file changed since it was loaded.
+        """
+        for state in self.states.values():
+            if state.is_stale():
+                action = "Reloaded" if state.data is not None else "Loaded"
+                if state.load():
+                    self.log(f"{action} {state.domain} in {state.load_seconds:.2f}s")
+                else:
+                    self.log(f"Reloading {state.domain} failed; still serving the previous data\n{state.error}")
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            self.refresh()
+
+    def serve_forever(self, poll_interval: float = 0.5):
+        if self.poll_interval and self._watcher is None:
+            self._watcher = threading.Thread(target=self._watch, name="dataset-watcher", daemon=True)
+            self._watcher.start()
+        super().serve_forever(poll_interval)
+
+    def server_close(self):
+        self._stop.set()
+        super().server_close()
+
+
+class AnalyticsRequestHandler(BaseHTTPRequestHandler):
+    server_version = "AnalyticsServer/1.0"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        try:
+            body = self._route(parts, dict(parse_qsl(url.query)))
+            self._send(HTTPStatus.OK, body)
+        except EndpointError as error:
+            self._send(error.status, json.dumps({"error": str(error)}).encode())
+        except Exception:
+            self._send(
+                HTTPStatus.INTERNAL_SERVER_ERROR,
+                json.dumps({"error": traceback.format_exc()}).encode(),
+            )
+
+    def _route(self, parts: list[str], arguments: dict) -> bytes:
+        states = self.server.states
+        if not parts:
+            return json.dumps({
+                domain: state.endpoints for domain, state in states.items()
+            }).encode()
+
+        domain = parts[0]
+        if domain not in states:
+            raise EndpointError(HTTPStatus.NOT_FOUND, f"Unknown domain: {domain}")
+        if len(parts) == 1:
+            return json.dumps(to_json_value(states[domain].status())).encode()
+        if len(parts) == 3:
+            return states[domain].call(parts[1], parts[2], arguments)
+        raise EndpointError(HTTPStatus.NOT_FOUND, f"Unknown path: {self.path}")
+
+    def _send(self, status: HTTPStatus, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.log_requests:
+            self.server.log(f"{self.address_string()} {format % args}")
+
+
+def create_server(domains: list[str], data_paths: dict | None = None,
+                  host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                  poll_interval: float | None = DEFAULT_POLL_INTERVAL,
+                  log=None, log_requests: bool = True) -> AnalyticsServer:
+    """
+    Load ``domains`` and bind a server for them (``port=0`` picks a free
+    port). ``poll_interval=None`` disables reloading; ``log`` receives
+    load, reload and (with ``log_requests``) request messages.
+    """
+    data_paths = data_paths or {}
+    log = log or (lambda message: None)
+
+    states = {}
+    for domain in domains:
+        if domain not in DOMAINS:
+            raise ValueError(f"Unknown domain: {domain}")
+        state = DomainState(domain, data_paths.get(domain, DATASET_PATHS[domain]))
+        if state.load():
+            log(f"Loaded {domain} in {state.load_seconds:.2f}s")
+        else:
+            log(f"Loading {domain} failed; it is reloaded once its file changes\n{state.error}")
+        states[domain] = state
+
+    return AnalyticsServer((host, port), states, poll_interval, log, log_requests)
@@ -0,0 +1,242 @@
+"""
+Mergeable quantile sketches.
+
+``KLLSketch`` summarises a stream of numbers in space that depends only on
+the requested accuracy: medians and percentiles of a column can then be
+read from a single pass over a chunk stream, and sketches built from
+separate chunks, files or runs can be merged. Answers are approximate in
+rank: the value returned for quantile ``q`` has a true rank within
+``q ± rank_error`` (with high probability).
+"""
+
+import math
+
+import numpy as np
+
+# Normalised rank error targeted when no accuracy is requested
+DEFAULT_RANK_ERROR = 0.01
+
+# Empirical KLL accuracy (Apache DataSketches): rank error ~= A / k ** B
+_ERROR_SCALE = 2.296
+_ERROR_EXPONENT = 0.9723
+
+# Capacity of each compactor relative to the one above it
+_CAPACITY_DECAY = 2 / 3
+_MIN_CAPACITY = 2
+
+
+def k_for_error(rank_error: float) -> int:
+    """
+    Smallest sketch size parameter that meets ``rank_error``.
+    """
+    if not 0 < rank_error < 1:
+        raise ValueError("rank_error must be between 0 and 1")
+    return max(8, math.ceil((_ERROR_SCALE / rank_error) ** (1 / _ERROR_EXPONENT)))
+
+
+class KLLSketch:
+    """
+    KLL quantile sketch over float values.
+
+    Items are kept in a stack of compactors; compactor ``h`` holds items of
+    weight ``2 ** h``. When a compactor overflows it is sorted and every
+    other item (from a random offset) is promoted to the next one, so the
+    sketch keeps O(k) items however many values are fed to it. NaNs are
+    ignored; the exact count, minimum and maximum are tracked alongside.
+    """
+
+    def __init__(self, k: int | None = None, rank_error: float | None = None, seed=None):
+        if k is None:
+            k = k_for_error(DEFAULT_RANK_ERROR if rank_error is None else rank_error)
+        if k < _MIN_CAPACITY:
+            raise ValueError(f"k must be at least {_MIN_CAPACITY}")
+
+        self.k = k
+        self.count = 0
+        self.min = math.nan
+        self.max = math.nan
+        self._levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+        self._sorted = None
+
+    @property
+    def rank_error(self) -> float:
+        """
+        Normalised rank error of single quantile queries.
+        """
+        return _ERROR_SCALE / self.k ** _ERROR_EXPONENT
+
+    @property
+    def retained(self) -> int:
+        return sum(len(items) for items in self._levels)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __repr__(self):
+        return f"KLLSketch(k={self.k}, count={self.count}, retained={self.retained})"
+
+    # --------------------------------------------------
+    # Updates
+    # --------------------------------------------------
+    def update(self, values, weights=None) -> "KLLSketch":
+        """
+        Add ``values`` (any array-like), optionally with integer ``weights``.
+
+        A weighted value is inserted once on every level whose bit is set
+        in its weight, which is exact for the total weight and keeps the
+        cost proportional to the number of distinct values.
+        """
+        values = np.asarray(values, dtype="float64").ravel()
+        valid = ~np.isnan(values)
+        if weights is None:
+            values = values[valid]
+            weights = None
+        else:
+            weights = np.asarray(weights, dtype="int64").ravel()[valid]
+            values = values[valid]
+            if (weights < 0).any():
+                raise ValueError("weights must be non-negative")
+            positive = weights > 0
+            values, weights = values[positive], weights[positive]
+
+        if not len(values):
+            return self
+
+        if weights is None:
+            self._levels[0] = np.concatenate([self._levels[0], values])
+            self.count += len(values)
+        else:
+            for level in range(int(weights.max()).bit_length()):
+                selected = values[(weights >> level) & 1 == 1]
+                while len(self._levels) <= level:
+                    self._levels.append(np.empty(0))
+                self._levels[level] = np.concatenate([self._levels[level], selected])
+            self.count += int(weights.sum())
+
+        self.min = np.fmin(self.min, values.min())
+        self.max = np.fmax(self.max, values.max())
+        self._compress()
+        return self
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """
+        Fold ``other`` into this sketch (in place) and return it.
+        """
+        if other.k != self.k:
+            raise ValueError("Only sketches with the same k can be merged")
+        if not other.count:
+            return self
+
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0))
+        for level, items in enumerate(other._levels):
+            self._levels[level] = np.concatenate([self._levels[level], items])
+
+        self.count += other.count
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+        self._compress()
+        return self
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return max(_MIN_CAPACITY, math.ceil(self.k * _CAPACITY_DECAY ** depth))
+
+    def _compress(self):
+        self._sorted = None
+        level = 0
+        while level < len(self._levels):
+            items = self._levels[level]
+            if len(items) <= self._capacity(level):
+                level += 1
+                continue
+
+            if level + 1 == len(self._levels):
+                self._levels.append(np.empty(0))
+
+            items = np.sort(items)
+            kept = items[:len(items) % 2]
+            items = items[len(items) % 2:]
+            promoted = items[self._rng.integers(2)::2]
+
+            self._levels[level] = kept
+            self._levels[level + 1] = np.concatenate([self._levels[level + 1], promoted])
+            # Adding a level shrinks the capacities below it
+            level = 0
+
+    # --------------------------------------------------
+    # Queries
+    # --------------------------------------------------
+    def _weighted_items(self) -> tuple[np.ndarray, np.ndarray]:
+        if self._sorted is None:
+            values = np.concatenate(self._levels)
+            weights = np.concatenate([
+                np.full(len(items), 1 << level, dtype="int64")
+                for level, items in enumerate(self._levels)
+            ])
+            order = np.argsort(values, kind="stable")
+            self._sorted = values[order], np.cumsum(weights[order])
+        return self._sorted
+
+    def quantile(self, q: float) -> float:
+        """
+        Approximate ``q``-quantile (``0 <= q <= 1``); NaN when empty.
+        """
+        return float(self.quantiles([q])[0])
+
+    def quantiles(self, qs) -> np.ndarray:
+        qs = np.asarray(qs, dtype="float64")
+        if ((qs < 0) | (qs > 1)).any():
+            raise ValueError("Quantiles must be between 0 and 1")
+        if not self.count:
+            return np.full(qs.shape, np.nan)
+
+        values, cumulative = self._weighted_items()
+        positions = np.searchsorted(cumulative, qs * cumulative[-1], side="left")
+        result = values[np.minimum(positions, len(values) - 1)]
+        result = np.where(qs == 0, self.min, result)
+        return np.where(qs == 1, self.max, result)
+
+    def rank(self, value: float) -> float:
+        """
+        Approximate fraction of values less than or equal to ``value``.
+        """
+        if not self.count:
+            return math.nan
+        values, cumulative = self._weighted_items()
+        position = np.searchsorted(values, value, side="right")
+        return float(cumulative[position - 1] / cumulative[-1]) if position else 0.0
+
+    def quantile_bounds(self, q: float) -> tuple[float, float]:
+        """
+        Values whose ranks bracket the true ``q``-quantile.
+        """
+        low = max(0.0, q - self.rank_error)
+        high = min(1.0, q + self.rank_error)
+        low_value, high_value = self.quantiles([low, high])
+        return float(low_value), float(high_value)
+
+
+def sketch_column(values, rank_error: float = DEFAULT_RANK_ERROR) -> KLLSketch:
+    """
+    Sketch a single Series or array.
+    """
+    return KLLSketch(rank_error=rank_error).update(values)
+
+
+def sketch_percentiles(sketch: KLLSketch, percentiles) -> dict:
+    """
+    ``{q: value}`` for the requested ``percentiles`` (fractions in [0, 1]).
+    """
+    return dict(zip(percentiles, sketch.quantiles(list(percentiles)).tolist()))
+
+
+def median_error(sketch: KLLSketch) -> dict:
+    """
+    Bounds of the sketched median and the rank error behind them.
+    """
+    return {
+        "median_bounds": sketch.quantile_bounds(0.5),
+        "rank_error": sketch.rank_error,
+    }
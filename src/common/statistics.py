@@ -1,8 +1,131 @@
+"""
+Descriptive statistics, including a mergeable accumulator for partitioned data.
+
+``RunningStats`` summarises one numeric column in a single pass. States
+built from separate chunks, files or worker processes merge exactly
+(count, mean, variance, min, max) or within the sketch's rank error
+(median, percentiles), so statistics over partitioned data can be
+computed in parallel and combined.
+"""
+
+from pathlib import Path
+
 import numpy as np
+import pandas as pd
+
+from src.common.sketches import (
+    DEFAULT_RANK_ERROR,
+    KLLSketch,
+    median_error,
+    sketch_percentiles,
+)
+
+
+class RunningStats:
+    """
+    Count, mean, variance (Welford/Chan), min, max and a quantile sketch.
+
+    ``update`` folds in a batch of values; ``merge`` combines two states
+    with Chan's parallel formula, which gives the same moments as a
+    single pass over the concatenated data. Missing values are skipped.
+    """
+
+    def __init__(self, rank_error: float = DEFAULT_RANK_ERROR):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.nan
+        self.max = np.nan
+        self.sketch = KLLSketch(rank_error=rank_error)
+
+    @classmethod
+    def from_values(cls, values, rank_error: float = DEFAULT_RANK_ERROR) -> "RunningStats":
+        return cls(rank_error).update(values)
+
+    @classmethod
+    def combine(cls, states, rank_error: float = DEFAULT_RANK_ERROR) -> "RunningStats":
+        """
+        Merge an iterable of states into a new one.
+        """
+        total = cls(rank_error)
+        for state in states:
+            total.merge(state)
+        return total
+
+    def update(self, values) -> "RunningStats":
+        values = np.asarray(values, dtype="float64").ravel()
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return self
+
+        mean = float(values.mean())
+        self._merge_moments(
+            len(values), mean, float(np.square(values - mean).sum()),
+            float(values.min()), float(values.max()),
+        )
+        self.sketch.update(values)
+        return self
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """
+        Fold ``other`` into this state (in place) and return it.
+        """
+        self._merge_moments(other.count, other.mean, other.m2, other.min, other.max)
+        self.sketch.merge(other.sketch)
+        return self
 
+    def _merge_moments(self, count: int, mean: float, m2: float, low: float, high: float):
+        if not count:
+            return
+        if not self.count:
+            self.count, self.mean, self.m2, self.min, self.max = count, mean, m2, low, high
+            return
 
-def descriptive_stats(series):
-    return {
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.min = min(self.min, low)
+        self.max = max(self.max, high)
+
+    @property
+    def variance(self) -> float:
+        # Sample variance, as pandas computes it (ddof=1)
+        return self.m2 / (self.count - 1) if self.count > 1 else np.nan
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.variance))
+
+    def describe(self, percentiles=()) -> dict:
+        """
+        The ``descriptive_stats`` dict for the accumulated values.
+        """
+        stats = {
+            "mean": self.mean if self.count else np.nan,
+            "median": self.sketch.quantile(0.5),
+            "std": self.std,
+            "min": self.min,
+            "max": self.max
+        }
+        stats.update(median_error(self.sketch))
+        if percentiles:
+            stats["percentiles"] = sketch_percentiles(self.sketch, percentiles)
+        return stats
+
+    def __repr__(self):
+        return (
+            f"RunningStats(count={self.count}, mean={self.mean:.6g}, "
+            f"std={self.std:.6g}, min={self.min}, max={self.max})"
+        )
+
+
+def descriptive_stats(series, approximate=False, percentiles=(), rank_error=DEFAULT_RANK_ERROR):
+    if approximate:
+        return RunningStats.from_values(series, rank_error).describe(percentiles)
+
+    stats = {
         "mean": series.mean(),
         "median": series.median(),
         "std": series.std(),
@@ -10,6 +133,173 @@ def descriptive_stats(series):
         "max": series.max()
     }
 
+    if percentiles:
+        stats["percentiles"] = dict(zip(percentiles, series.quantile(list(percentiles)).tolist()))
+
+    return stats
+
+
+def chunk_stats(chunks, column: str, rank_error: float = DEFAULT_RANK_ERROR) -> RunningStats:
+    """
+    Accumulate ``column`` over a chunk stream in one pass.
+    """
+    stats = RunningStats(rank_error)
+    for chunk in chunks:
+        stats.update(chunk[column])
+    return stats
+
+
+def _read_column(path: Path, column: str, read_options: dict) -> pd.Series:
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path, columns=[column], **read_options)[column]
+    return pd.read_csv(path, usecols=[column], **read_options)[column]
+
+
+def _file_stats(path: Path, column: str, rank_error: float, read_options: dict) -> RunningStats:
+    return RunningStats.from_values(_read_column(path, column, read_options), rank_error)
+
+
+def file_stats(paths, column: str, workers: int = 1,
+               rank_error: float = DEFAULT_RANK_ERROR,
+               read_options: dict | None = None) -> RunningStats:
+    """
+    Statistics of ``column`` across several CSV or Parquet files.
+
+    Each file is read (only that column) and summarised independently,
+    across ``workers`` processes when more than one, and the partial
+    states are merged.
+    """
+    paths = [Path(path) for path in paths]
+    read_options = dict(read_options or {})
+    args = (column, rank_error, read_options)
+
+    if workers <= 1 or len(paths) <= 1:
+        partials = [_file_stats(path, *args) for path in paths]
+    else:
+        # multiprocessing is only loaded when a pool is actually used
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+            futures = [pool.submit(_file_stats, path, *args) for path in paths]
+            partials = [future.result() for future in futures]
+
+    return RunningStats.combine(partials, rank_error)
+
+
+class CovarianceAccumulator:
+    """
+    Pairwise sums and cross-products of several columns, for covariance
+    and Pearson correlation matrices.
+
+    Every ``update`` is a handful of matrix products over the batch, and
+    accumulators built over separate chunks, partitions or workers merge
+    by addition. Missing values are excluded pair by pair, as
+    ``DataFrame.corr`` does. Values are shifted by a per-column reference
+    (the first batch's means) before accumulating, which keeps the sums
+    well conditioned for columns with a large offset.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        size = len(self.columns)
+        self.shift = None
+        # n[i, j]: rows where columns i and j are both present;
+        # sums[i, j] / squares[i, j]: sum of x_i / x_i ** 2 over those rows
+        self.n = np.zeros((size, size))
+        self.sums = np.zeros((size, size))
+        self.squares = np.zeros((size, size))
+        self.products = np.zeros((size, size))
+
+    def _matrix(self, frame: pd.DataFrame) -> np.ndarray:
+        return np.column_stack([
+            frame[column].to_numpy(dtype="float64", na_value=np.nan)
+            for column in self.columns
+        ]) if len(frame) else np.empty((0, len(self.columns)))
+
+    def update(self, frame: pd.DataFrame) -> "CovarianceAccumulator":
+        values = self._matrix(frame)
+        if not len(values):
+            return self
+
+        present = ~np.isnan(values)
+        if self.shift is None:
+            with np.errstate(invalid="ignore"):
+                counts = present.sum(axis=0)
+                self.shift = np.where(
+                    counts > 0, np.nansum(values, axis=0) / np.maximum(counts, 1), 0.0
+                )
+
+        centred = np.where(present, values - self.shift, 0.0)
+        mask = present.astype("float64")
+
+        self.n += mask.T @ mask
+        self.sums += centred.T @ mask
+        self.squares += (centred * centred).T @ mask
+        self.products += centred.T @ centred
+        return self
+
+    def merge(self, other: "CovarianceAccumulator") -> "CovarianceAccumulator":
+        """
+        Add ``other`` (over the same columns) into this accumulator.
+        """
+        if other.columns != self.columns:
+            raise ValueError("Only accumulators over the same columns can be merged")
+        if other.shift is None:
+            return self
+        if self.shift is None:
+            self.shift = other.shift.copy()
+
+        sums, squares, products = other._shifted_to(self.shift)
+        self.n += other.n
+        self.sums += sums
+        self.squares += squares
+        self.products += products
+        return self
+
+    def _shifted_to(self, shift: np.ndarray):
+        # Re-express the sums relative to another reference point
+        delta = (self.shift - shift)[:, None]
+        sums = self.sums + self.n * delta
+        squares = self.squares + 2 * delta * self.sums + self.n * delta ** 2
+        products = (
+            self.products
+            + delta * self.sums.T
+            + delta.T * self.sums
+            + self.n * delta * delta.T
+        )
+        return sums, squares, products
+
+    def _comoments(self):
+        n = self.n
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cross = self.products - self.sums * self.sums.T / n
+            spread = self.squares - self.sums ** 2 / n
+        return n, cross, spread
+
+    def covariance(self) -> pd.DataFrame:
+        """
+        Pairwise sample covariance, as ``DataFrame.cov``.
+        """
+        n, cross, _ = self._comoments()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cov = np.where(n > 1, cross / (n - 1), np.nan)
+        return pd.DataFrame(cov, index=self.columns, columns=self.columns)
+
+    def correlation(self) -> pd.DataFrame:
+        """
+        Pairwise Pearson correlation, as ``DataFrame.corr``.
+        """
+        n, cross, spread = self._comoments()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            denominator = np.sqrt(spread * spread.T)
+            corr = np.where((n > 1) & (denominator > 0), cross / denominator, np.nan)
+        corr = np.clip(corr, -1.0, 1.0)
+
+        diagonal = np.diag_indices_from(corr)
+        corr[diagonal] = np.where(np.isnan(corr[diagonal]), np.nan, 1.0)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
 
 def correlation(df):
-    return df.corr(numeric_only=True)
+    columns = df.select_dtypes(include=["number", "bool"]).columns
+    return CovarianceAccumulator(columns).update(df).correlation()
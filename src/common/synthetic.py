@@ -0,0 +1,531 @@
+"""
+Synthetic datasets matching the CSV schemas consumed by each domain.
+
+Every generator returns a raw frame with the same columns, column order,
+value vocabularies and coded sentinels as the real file, so it can be
+written to CSV and pushed through ``load_csv`` and the domain's
+preprocessing unchanged. Values follow the relationships the analyses
+look for (scores driven by study hours and attendance, seasonal and
+diurnal temperature cycles, COVID mortality rising with age and
+comorbidities, evening-heavy sales), so insights and charts stay
+meaningful at any scale.
+
+Large datasets are produced chunk by chunk with ``iter_chunks`` and
+written with ``write_dataset``; memory use is bounded by the chunk size,
+not by the number of rows.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.common.data_loader import _parquet_available
+
+DEFAULT_CHUNK_ROWS = 500_000
+
+# --------------------------------------------------
+# Value vocabularies
+# --------------------------------------------------
+SUPERMARKET_CITIES = {"A": "Yangon", "B": "Mandalay", "C": "Naypyitaw"}
+PRODUCT_LINES = [
+    "Electronic Accessories", "Fashion Accessories", "Food & Beverages",
+    "Health & Beauty", "Home & Lifestyle", "Sports & Travel",
+]
+# Typical unit price range per product line
+PRODUCT_PRICE_RANGES = {
+    "Electronic Accessories": (25, 100),
+    "Fashion Accessories": (10, 80),
+    "Food & Beverages": (10, 60),
+    "Health & Beauty": (10, 70),
+    "Home & Lifestyle": (15, 100),
+    "Sports & Travel": (15, 100),
+}
+PAYMENT_METHODS = ["Cash", "Credit card", "Ewallet"]
+SUPERMARKET_TAX_RATE = 0.05
+
+# Share of transactions per opening hour (10:00-20:59), peaking 17-19
+_HOUR_WEIGHTS = np.array([4, 5, 7, 7, 6, 6, 7, 11, 13, 12, 8], dtype="float64")
+
+WEATHER_SUMMARIES = [
+    "Partly Cloudy", "Mostly Cloudy", "Overcast", "Clear", "Foggy",
+    "Breezy and Overcast", "Breezy and Mostly Cloudy", "Light Rain", "Drizzle",
+]
+DAILY_SUMMARIES = {
+    "Clear": "Clear throughout the day.",
+    "Partly Cloudy": "Partly cloudy throughout the day.",
+    "Mostly Cloudy": "Mostly cloudy throughout the day.",
+    "Overcast": "Overcast throughout the day.",
+    "Foggy": "Foggy in the morning.",
+    "Breezy and Overcast": "Breezy and overcast throughout the day.",
+    "Breezy and Mostly Cloudy": "Breezy and mostly cloudy throughout the day.",
+    "Light Rain": "Light rain until afternoon.",
+    "Drizzle": "Drizzle starting in the evening.",
+}
+# Hourly records cover 2006-2016; longer datasets restart the calendar, as
+# if further stations were appended
+WEATHER_START = "2006-01-01"
+WEATHER_END = "2017-01-01"
+WEATHER_TIMEZONE = "Europe/Budapest"
+
+FINANCE_CHOICES = {
+    "Stock_Marktet": (["Yes", "No"], [0.7, 0.3]),
+    "Factor": (["Returns", "Locking Period", "Risk"], [0.6, 0.2, 0.2]),
+    "Objective": (["Capital Appreciation", "Income", "Growth"], [0.65, 0.2, 0.15]),
+    "Purpose": (["Wealth Creation", "Savings for Future", "Returns"], [0.6, 0.25, 0.15]),
+    "Duration": (["Less than 1 year", "1-3 years", "3-5 years", "More than 5 years"],
+                 [0.15, 0.45, 0.3, 0.1]),
+    "Invest_Monitor": (["Daily", "Weekly", "Monthly"], [0.15, 0.35, 0.5]),
+    "Expect": (["10%-20%", "20%-30%", "30%-40%"], [0.35, 0.55, 0.1]),
+    "Avenue": (["Mutual Fund", "Equity", "Fixed Deposits", "Public Provident Fund"],
+               [0.45, 0.3, 0.15, 0.1]),
+    "What are your savings objectives?": (["Retirement Plan", "Health Care", "Education"],
+                                          [0.6, 0.3, 0.1]),
+    "Reason_Equity": (["Capital Appreciation", "Dividend", "Liquidity"], [0.75, 0.15, 0.1]),
+    "Reason_Mutual": (["Better Returns", "Tax Benefits", "Fund Diversification"],
+                      [0.55, 0.3, 0.15]),
+    "Reason_Bonds": (["Safe Investment", "Assured Returns", "Tax Incentives"],
+                     [0.45, 0.35, 0.2]),
+    "Reason_FD": (["Fixed Returns", "High Interest Rates", "Risk Free"], [0.5, 0.3, 0.2]),
+    "Source": (["Newspapers and Magazines", "Financial Consultants", "Television", "Internet"],
+               [0.3, 0.35, 0.1, 0.25]),
+}
+FINANCE_RANK_COLUMNS = [
+    "Mutual_Funds", "Equity_Market", "Debentures", "Government_Bonds",
+    "Fixed_Deposits", "PPF", "Gold",
+]
+# Relative preference for each instrument (higher = ranked first more often)
+_FINANCE_RANK_WEIGHTS = np.array([3.0, 2.5, 0.6, 0.8, 1.6, 1.2, 1.4])
+
+STUDENT_CHOICES = {
+    "gender": (["male", "female", "other"], [0.48, 0.48, 0.04]),
+    "school_type": (["public", "private"], [0.6, 0.4]),
+    "parent_education": (["no formal", "high school", "diploma", "graduate", "post graduate", "phd"],
+                         [0.08, 0.27, 0.2, 0.25, 0.15, 0.05]),
+    "internet_access": (["yes", "no"], [0.8, 0.2]),
+    "travel_time": (["<15 min", "15-30 min", "30-60 min", ">60 min"], [0.3, 0.35, 0.25, 0.1]),
+    "extra_activities": (["yes", "no"], [0.45, 0.55]),
+    "study_method": (["notes", "textbook", "group study", "coaching", "mixed", "online videos"],
+                     [0.2, 0.2, 0.15, 0.15, 0.15, 0.15]),
+}
+# Lower bound of each grade on the overall score
+GRADE_THRESHOLDS = [(95, "a"), (85, "b"), (70, "c"), (55, "d"), (40, "e")]
+
+COVID_COLUMNS = [
+    "USMER", "MEDICAL_UNIT", "SEX", "PATIENT_TYPE", "DATE_DIED", "INTUBED",
+    "PNEUMONIA", "AGE", "PREGNANT", "DIABETES", "COPD", "ASTHMA", "INMSUPR",
+    "HIPERTENSION", "OTHER_DISEASE", "CARDIOVASCULAR", "OBESITY",
+    "RENAL_CHRONIC", "TOBACCO", "CLASIFFICATION_FINAL", "ICU",
+]
+# Logistic (intercept, per-year-of-age slope) of each comorbidity
+COVID_COMORBIDITY_RISK = {
+    "DIABETES": (-5.0, 0.060),
+    "COPD": (-7.0, 0.060),
+    "ASTHMA": (-3.5, 0.000),
+    "INMSUPR": (-4.5, 0.010),
+    "HIPERTENSION": (-5.0, 0.070),
+    "OTHER_DISEASE": (-3.8, 0.015),
+    "CARDIOVASCULAR": (-5.8, 0.040),
+    "OBESITY": (-2.2, 0.010),
+    "RENAL_CHRONIC": (-5.5, 0.030),
+    "TOBACCO": (-2.4, 0.000),
+}
+COVID_SURVIVED = "9999-99-99"
+_COVID_UNKNOWN_RATE = 0.003
+_MEDICAL_UNIT_WEIGHTS = np.array(
+    [1, 2, 2, 30, 1, 4, 1, 1, 4, 1, 1, 60, 1], dtype="float64"
+)
+
+
+# --------------------------------------------------
+# Helpers
+# --------------------------------------------------
+def _choice(rng: np.random.Generator, choices, rows: int, weights=None) -> np.ndarray:
+    p = None if weights is None else np.asarray(weights, dtype="float64") / np.sum(weights)
+    return np.asarray(choices, dtype=object)[rng.choice(len(choices), rows, p=p)]
+
+
+def _logistic(x: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def _yes_no_codes(flag: np.ndarray) -> np.ndarray:
+    return np.where(flag, 1, 2)
+
+
+def _with_unknowns(codes: np.ndarray, rng: np.random.Generator, sentinel: int = 98,
+                   rate: float = _COVID_UNKNOWN_RATE) -> np.ndarray:
+    return np.where(rng.random(len(codes)) < rate, sentinel, codes)
+
+
+def _clock_times(minutes: np.ndarray) -> np.ndarray:
+    # Hours are not zero-padded, as in the source file ("9:59", "18:05")
+    hours = pd.Series(minutes // 60).astype(str)
+    mins = pd.Series(minutes % 60).astype(str).str.zfill(2)
+    return (hours + ":" + mins).to_numpy(dtype=object)
+
+
+def _sequence_ids(prefix: str, start: int, rows: int, width: int) -> np.ndarray:
+    numbers = pd.Series(np.arange(start + 1, start + rows + 1)).astype(str).str.zfill(width)
+    return (prefix + numbers).to_numpy(dtype=object)
+
+
+# --------------------------------------------------
+# Generators
+# --------------------------------------------------
+# Each generator takes the number of rows, a numpy Generator and the
+# index of the first row, so consecutive chunks continue running
+# identifiers and timestamps.
+def supermarket_sales(rows: int, rng: np.random.Generator, start: int = 0) -> pd.DataFrame:
+    branches = _choice(rng, list(SUPERMARKET_CITIES), rows)
+    product_lines = _choice(rng, PRODUCT_LINES, rows)
+    customer_types = _choice(rng, ["Member", "Normal"], rows)
+
+    low = pd.Series(product_lines).map({k: v[0] for k, v in PRODUCT_PRICE_RANGES.items()}).to_numpy()
+    high = pd.Series(product_lines).map({k: v[1] for k, v in PRODUCT_PRICE_RANGES.items()}).to_numpy()
+    unit_price = np.round(rng.uniform(low, high), 2)
+
+    # Members buy slightly larger baskets
+    basket = np.where(customer_types == "Member", 5.8, 5.0)
+    quantity = np.clip(rng.poisson(basket), 1, 10)
+
+    cogs = unit_price * quantity
+    tax = np.round(cogs * SUPERMARKET_TAX_RATE, 2)
+
+    # Weekends are busier than weekdays
+    days = pd.date_range("2023-01-01", "2023-12-31")
+    day_weights = np.where(days.dayofweek >= 5, 1.35, 1.0)
+    dates = days.strftime("%Y-%m-%d").to_numpy(dtype=object)[
+        rng.choice(len(days), rows, p=day_weights / day_weights.sum())
+    ]
+
+    hours = 10 + rng.choice(len(_HOUR_WEIGHTS), rows, p=_HOUR_WEIGHTS / _HOUR_WEIGHTS.sum())
+    minutes = hours * 60 + rng.integers(0, 60, rows)
+
+    return pd.DataFrame({
+        "Invoice_ID": _sequence_ids("INV", start, rows, 6),
+        "Branch": branches,
+        "City": pd.Series(branches).map(SUPERMARKET_CITIES).to_numpy(dtype=object),
+        "Customer_Type": customer_types,
+        "Gender": _choice(rng, ["Male", "Female"], rows),
+        "Product_Line": product_lines,
+        "Unit_Price": unit_price,
+        "Quantity": quantity,
+        "Tax": tax,
+        "Total": np.round(cogs + tax, 2),
+        "Date": dates,
+        "Time": _clock_times(minutes),
+        "Payment": _choice(rng, PAYMENT_METHODS, rows),
+        "Rating": np.round(np.clip(rng.normal(7.0, 1.7, rows), 4, 10), 1),
+    })
+
+
+def student_performance(rows: int, rng: np.random.Generator, start: int = 0) -> pd.DataFrame:
+    columns = {
+        "student_id": np.arange(start + 1, start + rows + 1),
+        "age": rng.integers(14, 20, rows),
+    }
+    for column in ["gender", "school_type", "parent_education"]:
+        choices, weights = STUDENT_CHOICES[column]
+        columns[column] = _choice(rng, choices, rows, weights)
+
+    study_hours = np.round(rng.uniform(0.5, 8.0, rows), 1)
+    attendance = np.round(rng.uniform(50.0, 100.0, rows), 1)
+    columns["study_hours"] = study_hours
+    columns["attendance_percentage"] = attendance
+
+    for column in ["internet_access", "travel_time", "extra_activities", "study_method"]:
+        choices, weights = STUDENT_CHOICES[column]
+        columns[column] = _choice(rng, choices, rows, weights)
+
+    # Ability is driven mostly by study hours and partly by attendance
+    ability = 31.3 + 7.7 * study_hours + 0.38 * (attendance - 75.0)
+    for column in ["math_score", "science_score", "english_score"]:
+        columns[column] = np.round(np.clip(ability + rng.normal(0, 9.0, rows), 0, 100), 1)
+
+    overall = np.round(np.clip(ability + rng.normal(0, 5.0, rows), 0, 100), 1)
+    columns["overall_score"] = overall
+
+    grades = np.full(rows, "f", dtype=object)
+    for threshold, grade in reversed(GRADE_THRESHOLDS):
+        grades[overall >= threshold] = grade
+    columns["final_grade"] = grades
+
+    return pd.DataFrame(columns)
+
+
+_WEATHER_CALENDAR = {}
+
+
+def _weather_calendar() -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Formatted timestamps, day-of-year and hour of one hourly calendar cycle.
+
+    Built once per process; rows index into it modulo its length.
+    """
+    if not _WEATHER_CALENDAR:
+        stamps = pd.date_range(WEATHER_START, WEATHER_END, freq="h", tz=WEATHER_TIMEZONE,
+                               inclusive="left")
+        _WEATHER_CALENDAR["formatted"] = stamps.strftime("%Y-%m-%d %H:%M:%S.000 %z").to_numpy(dtype=object)
+        _WEATHER_CALENDAR["day_of_year"] = stamps.dayofyear.to_numpy()
+        _WEATHER_CALENDAR["hour"] = stamps.hour.to_numpy()
+    return (
+        _WEATHER_CALENDAR["formatted"],
+        _WEATHER_CALENDAR["day_of_year"],
+        _WEATHER_CALENDAR["hour"],
+    )
+
+
+def weather_history(rows: int, rng: np.random.Generator, start: int = 0) -> pd.DataFrame:
+    formatted, day_of_year, hour = _weather_calendar()
+    positions = np.arange(start, start + rows) % len(formatted)
+    day_of_year = day_of_year[positions]
+    hour = hour[positions]
+
+    # Annual cycle peaking in late July, daily cycle peaking mid-afternoon,
+    # plus a slight warming trend across calendar cycles
+    season = -np.cos(2 * np.pi * (day_of_year - 20) / 365.25)
+    daily = np.cos(2 * np.pi * (hour - 15) / 24)
+    cycle = np.arange(start, start + rows) // len(formatted)
+    temperature = 11.9 + 10.5 * season + 4.0 * daily + 0.1 * cycle + rng.normal(0, 3.0, rows)
+
+    humidity = np.clip(0.74 - 0.012 * (temperature - 11.9) + rng.normal(0, 0.12, rows), 0.1, 1.0)
+    wind = rng.gamma(2.2, 4.9, rows)
+
+    # Wind chill below 10°C, humidity makes heat feel warmer above 26°C
+    apparent = temperature.copy()
+    cold = temperature < 10
+    apparent[cold] -= 0.25 * wind[cold]
+    hot = temperature > 26
+    apparent[hot] += 6.0 * (humidity[hot] - 0.4)
+
+    summary_index = np.clip(
+        (humidity * 6 + rng.normal(0, 1.2, rows)).astype("int64"), 0, len(WEATHER_SUMMARIES) - 1
+    )
+    summaries = np.asarray(
+        ["Clear", "Partly Cloudy", "Partly Cloudy", "Mostly Cloudy", "Mostly Cloudy",
+         "Overcast", "Foggy", "Light Rain", "Drizzle"],
+        dtype=object,
+    )[summary_index]
+    windy = wind > 30
+    summaries[windy & (summaries == "Overcast")] = "Breezy and Overcast"
+    summaries[windy & (summaries == "Mostly Cloudy")] = "Breezy and Mostly Cloudy"
+
+    precip = np.where(temperature > 0, "rain", "snow").astype(object)
+    precip[rng.random(rows) < 0.005] = None
+
+    visibility = np.clip(16.1 - 14 * np.clip(humidity - 0.6, 0, None) + rng.normal(0, 2.5, rows), 0, 16.1)
+
+    return pd.DataFrame({
+        "Formatted Date": formatted[positions],
+        "Summary": summaries,
+        "Precip Type": precip,
+        "Temperature (C)": temperature,
+        "Apparent Temperature (C)": apparent,
+        "Humidity": np.round(humidity, 2),
+        "Wind Speed (km/h)": wind,
+        "Wind Bearing (degrees)": rng.integers(0, 360, rows).astype("float64"),
+        "Visibility (km)": visibility,
+        "Loud Cover": np.zeros(rows),
+        "Pressure (millibars)": rng.normal(1016.0, 7.5, rows),
+        "Daily Summary": pd.Series(summaries).map(DAILY_SUMMARIES).to_numpy(dtype=object),
+    })
+
+
+def covid_data(rows: int, rng: np.random.Generator, start: int = 0) -> pd.DataFrame:
+    age = np.clip(np.round(rng.normal(42, 17, rows)), 0, 120).astype("int64")
+    sex = rng.choice([1, 2], rows)  # 1 = female, 2 = male
+
+    comorbid = {
+        column: rng.random(rows) < _logistic(intercept + slope * age)
+        for column, (intercept, slope) in COVID_COMORBIDITY_RISK.items()
+    }
+    burden = sum(comorbid[c].astype("int64") for c in
+                 ["DIABETES", "HIPERTENSION", "OBESITY", "RENAL_CHRONIC", "COPD", "CARDIOVASCULAR"])
+
+    positive = rng.random(rows) < 0.38
+    # PATIENT_TYPE: 1 = returned home, 2 = hospitalised
+    hospitalised = rng.random(rows) < _logistic(-3.6 + 0.045 * age + 0.5 * burden + 0.6 * positive)
+    pneumonia = (hospitalised & (rng.random(rows) < 0.6)) | (rng.random(rows) < 0.03)
+    icu = hospitalised & (rng.random(rows) < _logistic(-2.2 + 0.8 * pneumonia))
+    intubed = hospitalised & (rng.random(rows) < _logistic(-2.0 + 1.5 * icu + 0.01 * age))
+
+    death_risk = np.where(
+        hospitalised,
+        _logistic(-5.3 + 0.05 * age + 0.35 * burden + 1.0 * pneumonia + 1.6 * intubed + 0.9 * positive),
+        _logistic(-8.0 + 0.05 * age),
+    )
+    died = rng.random(rows) < death_risk
+    death_dates = pd.date_range("2020-03-01", "2021-05-31").strftime("%d/%m/%Y").to_numpy(dtype=object)
+
+    classification = np.where(
+        positive,
+        rng.choice([1, 2, 3], rows, p=[0.03, 0.01, 0.96]),
+        rng.choice([4, 5, 6, 7], rows, p=[0.01, 0.01, 0.20, 0.78]),
+    )
+
+    columns = {
+        "USMER": _yes_no_codes(rng.random(rows) < 0.37),
+        "MEDICAL_UNIT": 1 + rng.choice(13, rows, p=_MEDICAL_UNIT_WEIGHTS / _MEDICAL_UNIT_WEIGHTS.sum()),
+        "SEX": sex,
+        "PATIENT_TYPE": np.where(hospitalised, 2, 1),
+        "DATE_DIED": np.where(died, death_dates[rng.integers(0, len(death_dates), rows)], COVID_SURVIVED),
+        # Not applicable (97) for patients sent home
+        "INTUBED": np.where(hospitalised, _with_unknowns(_yes_no_codes(intubed), rng, 99), 97),
+        "PNEUMONIA": _with_unknowns(_yes_no_codes(pneumonia), rng, 99),
+        "AGE": age,
+        # Not applicable (97) for men
+        "PREGNANT": np.where(
+            sex == 2, 97,
+            _with_unknowns(_yes_no_codes((age > 15) & (age < 45) & (rng.random(rows) < 0.04)), rng),
+        ),
+        **{column: _with_unknowns(_yes_no_codes(flag), rng) for column, flag in comorbid.items()},
+        "CLASIFFICATION_FINAL": classification,
+        "ICU": np.where(hospitalised, _with_unknowns(_yes_no_codes(icu), rng, 99), 97),
+    }
+    return pd.DataFrame({column: columns[column] for column in COVID_COLUMNS})
+
+
+def finance_data(rows: int, rng: np.random.Generator, start: int = 0) -> pd.DataFrame:
+    age = rng.integers(21, 36, rows)
+
+    # Rankings 1-7 from noisy preferences (Plackett-Luce via Gumbel noise);
+    # younger respondents lean further towards equity
+    preference = np.log(_FINANCE_RANK_WEIGHTS) + rng.gumbel(size=(rows, len(FINANCE_RANK_COLUMNS)))
+    preference[:, FINANCE_RANK_COLUMNS.index("Equity_Market")] += 0.06 * (28 - age)
+    ranks = (-preference).argsort(axis=1).argsort(axis=1) + 1
+
+    columns = {
+        "gender": _choice(rng, ["Female", "Male"], rows, [0.35, 0.65]),
+        "age": age,
+        "Investment_Avenues": _choice(rng, ["Yes", "No"], rows, [0.9, 0.1]),
+    }
+    columns.update(zip(FINANCE_RANK_COLUMNS, ranks.T))
+    columns.update(
+        (column, _choice(rng, choices, rows, weights))
+        for column, (choices, weights) in FINANCE_CHOICES.items()
+    )
+    return pd.DataFrame(columns)
+
+
+GENERATORS = {
+    "supermarket": supermarket_sales,
+    "education": student_performance,
+    "weather": weather_history,
+    "healthcare": covid_data,
+    "finance": finance_data,
+}
+
+
+# --------------------------------------------------
+# In-memory and streamed output
+# --------------------------------------------------
+def generate(name: str, rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Generate ``rows`` raw rows for the dataset registered under ``name``.
+    """
+    return pd.concat(iter_chunks(name, rows, seed=seed), ignore_index=True)
+
+
+def iter_chunks(name: str, rows: int, chunk_rows: int = DEFAULT_CHUNK_ROWS, seed: int = 0):
+    """
+    Yield the dataset as consecutive frames of at most ``chunk_rows`` rows.
+
+    Each chunk draws from its own seeded stream, so output is reproducible
+    for a given ``(seed, chunk_rows)``.
+    """
+    generator = GENERATORS[name]
+    for index, start in enumerate(range(0, max(rows, 1), chunk_rows)):
+        size = min(chunk_rows, rows - start)
+        if size <= 0:
+            break
+        rng = np.random.default_rng([seed, index])
+        chunk = generator(size, rng, start)
+        chunk.index = pd.RangeIndex(start, start + size)
+        yield chunk
+
+
+def _csv_table(chunk: pd.DataFrame):
+    import pyarrow as pa
+
+    # Arrow prints 296.0 as "296"; float columns holding only whole numbers
+    # (wind bearing, cloud cover) keep their ".0" so they read back as floats
+    whole = {
+        column for column in chunk.columns
+        if chunk[column].dtype.kind == "f"
+        and np.all(np.mod(chunk[column].dropna().to_numpy(), 1) == 0)
+    }
+    if whole:
+        chunk = chunk.assign(**{
+            column: chunk[column].map("{:.1f}".format, na_action="ignore").astype(object)
+            for column in whole
+        })
+    return pa.Table.from_pandas(chunk, preserve_index=False)
+
+
+def _write_csv_chunks(chunks, path: Path):
+    if _parquet_available():
+        import pyarrow.csv as pa_csv
+
+        writer = None
+        try:
+            for chunk in chunks:
+                table = _csv_table(chunk)
+                if writer is None:
+                    schema = table.schema
+                    writer = pa_csv.CSVWriter(str(path), schema)
+                writer.write_table(table.cast(schema))
+        finally:
+            if writer is not None:
+                writer.close()
+        return
+
+    for index, chunk in enumerate(chunks):
+        chunk.to_csv(path, mode="w" if index == 0 else "a", header=index == 0, index=False)
+
+
+def _write_parquet_chunks(chunks, path: Path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                schema = table.schema
+                writer = pq.ParquetWriter(str(path), schema)
+            writer.write_table(table.cast(schema))
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_dataset(name: str, rows: int, path: Path, format: str = "csv",
+                  chunk_rows: int = DEFAULT_CHUNK_ROWS, seed: int = 0) -> Path:
+    """
+    Stream a generated dataset to ``path`` as CSV or Parquet.
+
+    Only one chunk is held in memory at a time. The file is written under
+    a temporary name and moved into place once complete.
+    """
+    if format not in ("csv", "parquet"):
+        raise ValueError(f"Unsupported output format: {format}")
+    if format == "parquet" and not _parquet_available():
+        raise ImportError("Writing Parquet requires pyarrow")
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+
+    chunks = iter_chunks(name, rows, chunk_rows, seed)
+    try:
+        if format == "csv":
+            _write_csv_chunks(chunks, tmp_path)
+        else:
+            _write_parquet_chunks(chunks, tmp_path)
+        tmp_path.replace(path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return path
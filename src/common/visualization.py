@@ -2,6 +2,17 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 
 
+def apply_style(style: str = "whitegrid", **theme):
+    """
+    Set the seaborn theme of the charts about to be drawn.
+
+    Called per chart rather than at import, so importing a visualization
+    module leaves the global style alone and every chart gets its module's
+    style whatever else the process has drawn before.
+    """
+    sns.set_theme(style=style, **theme)
+
+
 def save_plot(fig, path):
     fig.tight_layout()
     fig.savefig(path, dpi=300)
@@ -4,20 +4,26 @@ Preprocessing utilities for Finance / Stock Market Analysis
 
 import pandas as pd
 
+from src.common.dtypes import compact_dtypes
+from src.common.features import bin_values, binary_flag
+from src.common.parsing import map_unique
+
+AGE_BINS = [18, 25, 35, 45, 60, 100]
+AGE_LABELS = ["18–25", "26–35", "36–45", "46–60", "60+"]
+
 
 def preprocess_finance_data(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
+    df = compact_dtypes(df, "finance")
 
     # Age grouping (derived, non-destructive)
-    df["AGE_GROUP"] = pd.cut(
-        df["age"],
-        bins=[18, 25, 35, 45, 60, 100],
-        labels=["18–25", "26–35", "36–45", "46–60", "60+"]
-    )
+    df["AGE_GROUP"] = bin_values(df["age"], AGE_BINS, AGE_LABELS)
 
     # Binary equity participation (derived)
-    df["EQUITY_INVESTOR"] = df["Equity_Market"].apply(
-        lambda x: 1 if str(x).lower() == "yes" else 0
+    is_yes = map_unique(
+        df["Equity_Market"],
+        lambda answers: answers.astype(str).str.lower() == "yes",
+        fill_value=False,
     )
+    df["EQUITY_INVESTOR"] = binary_flag(is_yes)
 
     return df
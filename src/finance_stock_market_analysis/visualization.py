@@ -1,6 +1,9 @@
 """
 Static visualization exports for Finance / Stock Market Analysis
 (Logic preserved exactly from notebook)
+
+Charts whose drawn data has not changed are copied from the plot cache
+instead of being redrawn.
 """
 
 from pathlib import Path
@@ -8,6 +11,10 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import pandas as pd
 
+from src.common.aggregation import correlation_matrix
+from src.common.plot_cache import chart_key, restore_chart, store_chart
+from src.common.visualization import apply_style
+
 
 def _ensure_dir(path: Path):
     path.mkdir(parents=True, exist_ok=True)
@@ -20,11 +27,19 @@ def save_plot(fig, output_path: Path):
 
 # 1️⃣ Preferred Investment Avenues
 def plot_preferred_investment_avenues(df, output_dir: Path):
+    apply_style()
     _ensure_dir(output_dir)
 
+    answers = df[["Investment_Avenues"]]
+
+    output_path = output_dir / "preferred_investment_avenues.png"
+    key = chart_key(plot_preferred_investment_avenues, answers)
+    if restore_chart(key, output_path):
+        return
+
     fig, ax = plt.subplots(figsize=(6, 5))
     sns.countplot(
-        data=df,
+        data=answers,
         x="Investment_Avenues",
         hue="Investment_Avenues",
         palette="Set2",
@@ -35,15 +50,24 @@ def plot_preferred_investment_avenues(df, output_dir: Path):
     ax.set_xlabel("Investment Avenue")
     ax.set_ylabel("Number of Investors")
 
-    save_plot(fig, output_dir / "preferred_investment_avenues.png")
+    save_plot(fig, output_path)
+    store_chart(key, output_path)
 
 
 # 2️⃣ Equity Market Participation
 def plot_equity_market_participation(df, output_dir: Path):
+    apply_style()
     _ensure_dir(output_dir)
 
+    participation = df["Equity_Market"].value_counts()
+
+    output_path = output_dir / "equity_market_participation.png"
+    key = chart_key(plot_equity_market_participation, participation)
+    if restore_chart(key, output_path):
+        return
+
     fig, ax = plt.subplots()
-    df["Equity_Market"].value_counts().plot(
+    participation.plot(
         kind="pie",
         autopct="%1.1f%%",
         ax=ax
@@ -51,14 +75,25 @@ def plot_equity_market_participation(df, output_dir: Path):
     ax.set_title("Equity Market Participation")
     ax.set_ylabel("")
 
-    save_plot(fig, output_dir / "equity_market_participation.png")
+    save_plot(fig, output_path)
+    store_chart(key, output_path)
 
 
 # 3️⃣ Investment Objective Distribution
 def plot_investment_objective_distribution(df, output_dir: Path):
+    apply_style()
+    _ensure_dir(output_dir)
+
+    answers = df[["Objective"]]
+
+    output_path = output_dir / "investment_objectives_distribution.png"
+    key = chart_key(plot_investment_objective_distribution, answers)
+    if restore_chart(key, output_path):
+        return
+
     fig, ax = plt.subplots(figsize=(10, 5))
     sns.countplot(
-        data=df,
+        data=answers,
         y="Objective",
         hue="Objective",
         palette="Set3",
@@ -69,14 +104,25 @@ def plot_investment_objective_distribution(df, output_dir: Path):
     ax.set_xlabel("Number of Investors")
     ax.set_ylabel("Objective")
 
-    save_plot(fig, output_dir / "investment_objectives_distribution.png")
+    save_plot(fig, output_path)
+    store_chart(key, output_path)
 
 
 # 4️⃣ Risk Factor vs Investment Avenue
 def plot_risk_factor_vs_avenue(df, output_dir: Path):
+    apply_style()
+    _ensure_dir(output_dir)
+
+    answers = df[["Factor", "Investment_Avenues"]]
+
+    output_path = output_dir / "risk_factor_vs_avenue.png"
+    key = chart_key(plot_risk_factor_vs_avenue, answers)
+    if restore_chart(key, output_path):
+        return
+
     fig, ax = plt.subplots(figsize=(7, 5))
     sns.countplot(
-        data=df,
+        data=answers,
         x="Factor",
         hue="Investment_Avenues",
         palette="tab10",
@@ -86,14 +132,25 @@ def plot_risk_factor_vs_avenue(df, output_dir: Path):
     ax.set_xlabel("Risk Factor")
     ax.set_ylabel("Count")
 
-    save_plot(fig, output_dir / "risk_factor_vs_avenue.png")
+    save_plot(fig, output_path)
+    store_chart(key, output_path)
 
 
 # 5️⃣ Duration vs Investment Type
 def plot_duration_vs_avenue(df, output_dir: Path):
+    apply_style()
+    _ensure_dir(output_dir)
+
+    answers = df[["Duration", "Investment_Avenues"]]
+
+    output_path = output_dir / "duration_vs_investment_avenue.png"
+    key = chart_key(plot_duration_vs_avenue, answers)
+    if restore_chart(key, output_path):
+        return
+
     fig, ax = plt.subplots(figsize=(10, 5))
     sns.countplot(
-        data=df,
+        data=answers,
         x="Duration",
         hue="Investment_Avenues",
         palette="Set1",
@@ -103,14 +160,25 @@ def plot_duration_vs_avenue(df, output_dir: Path):
     ax.set_xlabel("Investment Duration")
     ax.set_ylabel("Count")
 
-    save_plot(fig, output_dir / "duration_vs_investment_avenue.png")
+    save_plot(fig, output_path)
+    store_chart(key, output_path)
 
 
 # 6️⃣ Age vs Investment Avenue
 def plot_age_vs_avenue(df, output_dir: Path):
+    apply_style()
+    _ensure_dir(output_dir)
+
+    answers = df[["AGE_GROUP", "Investment_Avenues"]]
+
+    output_path = output_dir / "age_vs_investment_avenue.png"
+    key = chart_key(plot_age_vs_avenue, answers)
+    if restore_chart(key, output_path):
+        return
+
     fig, ax = plt.subplots(figsize=(10, 6))
     sns.countplot(
-        data=df,
+        data=answers,
         x="AGE_GROUP",
         hue="Investment_Avenues",
         palette="Set2",
@@ -120,14 +188,25 @@ def plot_age_vs_avenue(df, output_dir: Path):
     ax.set_xlabel("Age Group")
     ax.set_ylabel("Number of Investors")
 
-    save_plot(fig, output_dir / "age_vs_investment_avenue.png")
+    save_plot(fig, output_path)
+    store_chart(key, output_path)
 
 
 # 7️⃣ Savings Objective vs Investment Avenue
 def plot_savings_objective_vs_avenue(df, output_dir: Path):
+    apply_style()
+    _ensure_dir(output_dir)
+
+    answers = df[["What are your savings objectives?", "Investment_Avenues"]]
+
+    output_path = output_dir / "savings_objective_vs_avenue.png"
+    key = chart_key(plot_savings_objective_vs_avenue, answers)
+    if restore_chart(key, output_path):
+        return
+
     fig, ax = plt.subplots(figsize=(12, 6))
     sns.countplot(
-        data=df,
+        data=answers,
         x="What are your savings objectives?",
         hue="Investment_Avenues",
         palette="tab10",
@@ -138,15 +217,26 @@ def plot_savings_objective_vs_avenue(df, output_dir: Path):
     ax.set_ylabel("Count")
     plt.setp(ax.get_xticklabels(), rotation=40, ha="right")
 
-    save_plot(fig, output_dir / "savings_objective_vs_avenue.png")
+    save_plot(fig, output_path)
+    store_chart(key, output_path)
 
 
 # 8️⃣ Reasons: Equity vs Mutual Funds
 def plot_reasons_equity_vs_mutual(df, output_dir: Path):
+    apply_style()
+    _ensure_dir(output_dir)
+
+    answers = df[["Reason_Equity", "Reason_Mutual"]]
+
+    output_path = output_dir / "reasons_equity_vs_mutual.png"
+    key = chart_key(plot_reasons_equity_vs_mutual, answers)
+    if restore_chart(key, output_path):
+        return
+
     fig, axes = plt.subplots(1, 2, figsize=(14, 5))
 
     sns.countplot(
-        data=df,
+        data=answers,
         y="Reason_Equity",
         hue="Reason_Equity",
         palette="Blues",
@@ -156,7 +246,7 @@ def plot_reasons_equity_vs_mutual(df, output_dir: Path):
     axes[0].set_title("Reasons for Investing in Equity", fontsize=13)
 
     sns.countplot(
-        data=df,
+        data=answers,
         y="Reason_Mutual",
         hue="Reason_Mutual",
         palette="Greens",
@@ -165,14 +255,25 @@ def plot_reasons_equity_vs_mutual(df, output_dir: Path):
     )
     axes[1].set_title("Reasons for Investing in Mutual Funds", fontsize=13)
 
-    save_plot(fig, output_dir / "reasons_equity_vs_mutual.png")
+    save_plot(fig, output_path)
+    store_chart(key, output_path)
 
 
 # 9️⃣ Investment Monitoring vs Avenue
 def plot_investment_monitoring_vs_avenue(df, output_dir: Path):
+    apply_style()
+    _ensure_dir(output_dir)
+
+    answers = df[["Invest_Monitor", "Investment_Avenues"]]
+
+    output_path = output_dir / "investment_monitoring_vs_avenue.png"
+    key = chart_key(plot_investment_monitoring_vs_avenue, answers)
+    if restore_chart(key, output_path):
+        return
+
     fig, ax = plt.subplots(figsize=(10, 5))
     sns.countplot(
-        data=df,
+        data=answers,
         x="Invest_Monitor",
         hue="Investment_Avenues",
         palette="Set3",
@@ -182,17 +283,26 @@ def plot_investment_monitoring_vs_avenue(df, output_dir: Path):
     ax.set_xlabel("Investment Monitoring Frequency")
     ax.set_ylabel("Count")
 
-    save_plot(fig, output_dir / "investment_monitoring_vs_avenue.png")
+    save_plot(fig, output_path)
+    store_chart(key, output_path)
 
 
 # 🔟 Clustered Correlation Heatmap
 def plot_clustered_correlation_heatmap(df, output_dir: Path):
+    apply_style()
+    _ensure_dir(output_dir)
+
     binary_cols = [
         "Mutual_Funds", "Equity_Market", "Debentures",
         "Government_Bonds", "Fixed_Deposits", "PPF", "Gold"
     ]
 
-    corr = df[binary_cols].corr()
+    corr = correlation_matrix(df, binary_cols)
+
+    output_path = output_dir / "clustered_correlation_heatmap.png"
+    key = chart_key(plot_clustered_correlation_heatmap, corr)
+    if restore_chart(key, output_path):
+        return
 
     g = sns.clustermap(
         corr,
@@ -213,8 +323,9 @@ def plot_clustered_correlation_heatmap(df, output_dir: Path):
     )
 
     g.fig.savefig(
-        output_dir / "clustered_correlation_heatmap.png",
+        output_path,
         dpi=300,
         bbox_inches="tight"
     )
     plt.close(g.fig)
+    store_chart(key, output_path)
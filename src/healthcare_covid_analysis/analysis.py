@@ -1,29 +1,69 @@
 """
 Core analytical computations for COVID Healthcare Analysis
+
+Every function accepts either a preprocessed DataFrame or an iterable of
+preprocessed chunks (see ``common.data_loader.stream_dataset``).
 """
 
 import pandas as pd
 
+from src.common.aggregation import FrameSource, grouped_reduce, iter_frames, summarize
+from src.healthcare_covid_analysis.bitmap_index import CovidBitmapIndex, condition_mask
+from src.healthcare_covid_analysis.stratification import RiskTable
+
+# Conditions reported (and charted) individually
+COMORBIDITIES = ["DIABETES", "HIPERTENSION", "OBESITY"]
 
-def overview_metrics(df: pd.DataFrame) -> dict:
-    total_cases = df.shape[0]
-    deaths = df["DIED"].sum()
+
+def overview_metrics(df: FrameSource) -> dict:
+    total_cases, stats = summarize(df, {"DIED": ["sum"], "AGE": ["mean"]})
+    deaths = stats["DIED"]["sum"]
 
     return {
         "total_cases": total_cases,
         "mortality_rate": (deaths / total_cases) * 100,
-        "average_age": df["AGE"].mean(),
-        "icu_mortality_rate": df.groupby("ICU")["DIED"].mean().get(1, 0) * 100,
+        "average_age": stats["AGE"]["mean"],
+        "icu_mortality_rate": grouped_reduce(df, "ICU", "DIED", "mean").get(1, 0) * 100,
     }
 
 
-def mortality_by_age_group(df: pd.DataFrame) -> pd.Series:
-    return df.groupby("AGE_GROUP", observed=True)["DIED"].mean()
+def mortality_by_age_group(df: FrameSource) -> pd.Series:
+    return grouped_reduce(df, "AGE_GROUP", "DIED", "mean")
+
+
+def comorbidity_mortality(df: FrameSource, condition: str) -> float:
+    return grouped_reduce(df, condition, "DIED", "mean").get(1, 0) * 100
+
+
+def combined_mortality(df: FrameSource, all_of=(), any_of=()) -> float:
+    """
+    Mortality rate (%) of patients with every condition in ``all_of`` and
+    at least one in ``any_of``. Conditions are flag columns (the flag is
+    set) or ``(column, value)`` pairs; a ``CovidBitmapIndex`` answers from
+    its bitsets without scanning rows.
+    """
+    if isinstance(df, CovidBitmapIndex):
+        return df.rate("DIED", all_of, any_of) * 100
+
+    cases = deaths = 0
+    for frame in iter_frames(df):
+        mask = condition_mask(frame, all_of, any_of)
+        cases += int(mask.sum())
+        deaths += int(frame["DIED"].to_numpy()[mask].sum())
+    return deaths / cases * 100 if cases else float("nan")
 
 
-def comorbidity_mortality(df: pd.DataFrame, condition: str) -> float:
-    return df.groupby(condition)["DIED"].mean().get(1, 0) * 100
+def icu_vs_mortality(df: FrameSource) -> pd.Series:
+    return grouped_reduce(df, "ICU", "DIED", "mean")
 
 
-def icu_vs_mortality(df: pd.DataFrame) -> pd.Series:
-    return df.groupby("ICU")["DIED"].mean()
+def risk_stratification(df: FrameSource, by=None, dimensions=None) -> pd.DataFrame:
+    """
+    Cases, deaths and mortality rate (%) per observed combination of
+    ``by`` (default: every dimension), derived from a ``RiskTable`` over
+    ``dimensions`` (default: AGE_GROUP, SEX, ICU and every comorbidity)
+    built in one pass.
+    """
+    if dimensions is None and by is not None:
+        dimensions = [by] if isinstance(by, str) else list(by)
+    return RiskTable.build(df, dimensions).marginal(by)
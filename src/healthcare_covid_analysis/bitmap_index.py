@@ -0,0 +1,277 @@
+"""
+Bitmap index over the COVID patient flags
+
+``CovidBitmapIndex`` keeps one bitset per observed value of every indexed
+flag column (the comorbidities, SEX, ICU, INTUBED, PATIENT_TYPE, DIED,
+...): bit ``i`` is set when row ``i`` holds that value. Bitsets are packed
+64 rows to a word, so each costs one bit per patient, and they are built
+in one pass over the rows (chunk by chunk for a chunk stream, each chunk
+padded to whole words with unset bits).
+
+Any group-by over indexed flags, reducing another indexed flag or counting
+rows, is then answered by ANDing bitsets and counting their set bits
+instead of scanning rows; so are mortality rates for any AND/OR
+combination of conditions (``rate``). The index is an
+``AggregationContext``, so other groupings (e.g. AGE_GROUP) and summaries
+fall back to the rows it was built from.
+"""
+
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+from src.common.aggregation import AggregationContext, FrameSource, iter_frames
+
+# Comorbidities and risk factors, flagged 1 = yes and 2 = no
+CONDITION_COLUMNS = [
+    "DIABETES", "COPD", "ASTHMA", "INMSUPR", "HIPERTENSION", "OTHER_DISEASE",
+    "CARDIOVASCULAR", "OBESITY", "RENAL_CHRONIC", "TOBACCO", "PNEUMONIA", "PREGNANT",
+]
+
+# Patient attributes and outcomes
+PATIENT_COLUMNS = ["SEX", "USMER", "PATIENT_TYPE", "INTUBED", "ICU", "DIED", "COVID_POSITIVE"]
+
+INDEX_COLUMNS = CONDITION_COLUMNS + PATIENT_COLUMNS
+
+# Flag value meaning "yes"
+PRESENT = 1
+
+_INDEXED_REDUCERS = ("sum", "count", "mean", "size")
+
+# Integer columns spanning fewer values than this are indexed by comparison
+_DENSE_VALUE_RANGE = 64
+
+
+def _pack(mask: np.ndarray) -> np.ndarray:
+    """
+    Pack a boolean mask into 64-bit words, padding with unset bits.
+    """
+    padded = np.zeros(-(-len(mask) // 64) * 64, dtype=bool)
+    padded[:len(mask)] = mask
+    return np.packbits(padded).view(np.uint64)
+
+
+def _popcount(bits: np.ndarray) -> int:
+    return int(np.bitwise_count(bits).sum(dtype=np.int64))
+
+
+def _value_masks(series: pd.Series) -> dict:
+    """
+    Boolean mask of every value of ``series``, in ascending value order.
+    """
+    if pd.api.types.is_integer_dtype(series.dtype):
+        # Flags span a handful of codes: compare against each instead of hashing
+        values = series.to_numpy(dtype="float64", na_value=np.nan)
+        present = values[~np.isnan(values)]
+        if not len(present):
+            return {}
+        low, high = int(present.min()), int(present.max())
+        if high - low < _DENSE_VALUE_RANGE:
+            masks = {value: values == value for value in range(low, high + 1)}
+            return {value: mask for value, mask in masks.items() if mask.any()}
+
+    codes, uniques = pd.factorize(series, sort=True)
+    return {value: codes == code for code, value in enumerate(uniques.tolist())}
+
+
+def _terms(conditions) -> list[tuple]:
+    """
+    ``(column, value)`` terms of ``conditions``; a bare column name stands
+    for the flag being set.
+    """
+    single_pair = (
+        isinstance(conditions, tuple) and len(conditions) == 2
+        and not isinstance(conditions[1], str)
+    )
+    if isinstance(conditions, str) or single_pair:
+        conditions = [conditions]
+    return [
+        (item, PRESENT) if isinstance(item, str) else tuple(item)
+        for item in conditions or ()
+    ]
+
+
+def condition_mask(frame: pd.DataFrame, all_of=(), any_of=()) -> np.ndarray:
+    """
+    Boolean mask of the rows matching every term of ``all_of`` and at
+    least one term of ``any_of`` (either may be empty).
+    """
+    mask = np.ones(len(frame), dtype=bool)
+    for column, value in _terms(all_of):
+        mask &= frame[column].eq(value).to_numpy(dtype=bool, na_value=False)
+    terms = _terms(any_of)
+    if terms:
+        matches = np.zeros(len(frame), dtype=bool)
+        for column, value in terms:
+            matches |= frame[column].eq(value).to_numpy(dtype=bool, na_value=False)
+        mask &= matches
+    return mask
+
+
+class CovidBitmapIndex(AggregationContext):
+    """
+    Per-value bitsets of the COVID flag columns.
+
+    Build one with ``CovidBitmapIndex.build`` from a preprocessed frame or
+    chunk stream.
+    """
+
+    def __init__(self, data: FrameSource, bitmaps: dict, dtypes: dict, universe: np.ndarray):
+        super().__init__(data)
+        # column -> {value: packed bitset}, values in ascending order
+        self.bitmaps = bitmaps
+        self.dtypes = dtypes
+        # Set for every row, unset in the padding
+        self.universe = universe
+        self.rows = _popcount(universe)
+
+    @classmethod
+    def build(cls, data: FrameSource, columns: list[str] | None = None) -> "CovidBitmapIndex":
+        """
+        Index ``columns`` (default: those of ``INDEX_COLUMNS`` present in
+        the data); missing values get no bitset.
+        """
+        chunks = []
+        dtypes = {}
+        for frame in iter_frames(data):
+            if columns is None:
+                columns = [c for c in INDEX_COLUMNS if c in frame.columns]
+            parts = {}
+            for column in columns:
+                dtypes.setdefault(column, frame[column].dtype)
+                parts[column] = {
+                    value: _pack(mask) for value, mask in _value_masks(frame[column]).items()
+                }
+            chunks.append((_pack(np.ones(len(frame), dtype=bool)), parts))
+
+        if not chunks:
+            raise ValueError("Cannot build a bitmap index from no rows")
+
+        # Values missing from a chunk have no set bits there
+        bitmaps = {}
+        for column in columns:
+            values = sorted({value for _, parts in chunks for value in parts[column]})
+            bitmaps[column] = {
+                value: np.concatenate([
+                    parts[column].get(value, np.zeros_like(words)) for words, parts in chunks
+                ])
+                for value in values
+            }
+        universe = np.concatenate([words for words, _ in chunks])
+        return cls(data, bitmaps, dtypes, universe)
+
+    # --------------------------------------------------
+    # Queries
+    # --------------------------------------------------
+    def _bits(self, column: str, value) -> np.ndarray:
+        if column not in self.bitmaps:
+            raise KeyError(f"{column} is not indexed")
+        return self.bitmaps[column].get(value, np.zeros_like(self.universe))
+
+    def select(self, all_of=(), any_of=()) -> np.ndarray:
+        """
+        Bitset of the rows matching every term of ``all_of`` and at least
+        one term of ``any_of``; terms are flag columns (meaning the flag
+        is set) or ``(column, value)`` pairs.
+        """
+        bits = self.universe.copy()
+        for column, value in _terms(all_of):
+            bits &= self._bits(column, value)
+        terms = _terms(any_of)
+        if terms:
+            matches = np.zeros_like(self.universe)
+            for column, value in terms:
+                matches |= self._bits(column, value)
+            bits &= matches
+        return bits
+
+    def count(self, all_of=(), any_of=()) -> int:
+        return _popcount(self.select(all_of, any_of))
+
+    def rate(self, outcome, all_of=(), any_of=()) -> float:
+        """
+        Share of the rows selected by ``all_of``/``any_of`` that also match
+        ``outcome`` (e.g. ``"DIED"``); NaN when no row is selected.
+        """
+        selected = self.select(all_of, any_of)
+        total = _popcount(selected)
+        if not total:
+            return float("nan")
+        return _popcount(selected & self.select(outcome)) / total
+
+    # --------------------------------------------------
+    # AggregationContext interface
+    # --------------------------------------------------
+    def _indexed(self, by, column: str | None, reducer: str) -> bool:
+        keys = list(by) if isinstance(by, (list, tuple)) else [by]
+        if not keys or any(key not in self.bitmaps for key in keys):
+            return False
+        if reducer == "size":
+            return True
+        return (
+            reducer in _INDEXED_REDUCERS
+            and column in self.bitmaps
+            and pd.api.types.is_numeric_dtype(self.dtypes[column])
+        )
+
+    def _from_bitmaps(self, by, column: str | None, reducer: str) -> pd.Series:
+        keys = list(by) if isinstance(by, (list, tuple)) else [by]
+
+        labels, values = [], []
+        for members in product(*(self.bitmaps[key].items() for key in keys)):
+            group = self.universe.copy()
+            for _, bits in members:
+                group &= bits
+            size = _popcount(group)
+            if not size:
+                # Unobserved combinations are left out, as with observed=True
+                continue
+
+            if reducer == "size":
+                value = size
+            else:
+                counts = {v: _popcount(group & bits) for v, bits in self.bitmaps[column].items()}
+                total = sum(value * n for value, n in counts.items())
+                count = sum(counts.values())
+                value = {
+                    "sum": total,
+                    "count": count,
+                    "mean": total / count if count else np.nan,
+                }[reducer]
+            labels.append(tuple(label for label, _ in members))
+            values.append(value)
+
+        if len(keys) == 1:
+            index = pd.Index([label for (label,) in labels], dtype=self.dtypes[keys[0]], name=keys[0])
+        else:
+            index = pd.MultiIndex.from_arrays(
+                [
+                    pd.array([label[level] for label in labels], dtype=self.dtypes[key])
+                    for level, key in enumerate(keys)
+                ],
+                names=keys,
+            )
+        # Nullable columns reduce to nullable results, as in pandas
+        nullable = reducer != "size" and pd.api.types.is_extension_array_dtype(self.dtypes[column])
+        dtype = {"mean": "float64", "sum": "int64"}.get(reducer, "int64")
+        if nullable and reducer in ("mean", "sum"):
+            dtype = dtype.capitalize()
+        return pd.Series(values, index=index, dtype=dtype, name=None if reducer == "size" else column)
+
+    def prefetch(self, requests: list[tuple]):
+        """
+        Answer the requests over indexed flags from the bitsets and pass
+        the others to the rows.
+        """
+        remaining = []
+        for by, column, reducer in requests:
+            key = (tuple(by) if isinstance(by, (list, tuple)) else (by,), column, reducer)
+            if key in self._grouped:
+                continue
+            if self._indexed(by, column, reducer):
+                self._grouped[key] = self._from_bitmaps(by, column, reducer)
+            else:
+                remaining.append((by, column, reducer))
+        if remaining:
+            super().prefetch(remaining)
@@ -2,23 +2,24 @@
 Insight generation for COVID Healthcare Analysis
 """
 
-import pandas as pd
+from src.common.aggregation import FrameSource, grouped_reduce
 
 
-def generate_healthcare_insights(df: pd.DataFrame) -> list[str]:
+def generate_healthcare_insights(df: FrameSource) -> list[str]:
     insights = []
 
-    if df.groupby("AGE_GROUP", observed=True)["DIED"].mean().idxmax() in ["Senior", "Elderly"]:
+    if grouped_reduce(df, "AGE_GROUP", "DIED", "mean").idxmax() in ["Senior", "Elderly"]:
         insights.append(
             "Older age groups show significantly higher mortality rates."
         )
 
-    if df.groupby("ICU", observed=True)["DIED"].mean().get(1, 0) > 0.3:
+    if grouped_reduce(df, "ICU", "DIED", "mean").get(1, 0) > 0.3:
         insights.append(
             "ICU admission is associated with higher mortality, indicating severe disease cases."
         )
 
-    if df.groupby("DIABETES", observed=True)["DIED"].mean().get(1, 0) > df.groupby("DIABETES")["DIED"].mean().get(0, 0):
+    diabetes_mortality = grouped_reduce(df, "DIABETES", "DIED", "mean")
+    if diabetes_mortality.get(1, 0) > diabetes_mortality.get(0, 0):
         insights.append(
             "Patients with diabetes have a higher mortality risk compared to non-diabetic patients."
         )
@@ -4,25 +4,26 @@ Preprocessing utilities for Healthcare COVID Analysis
 
 import pandas as pd
 
+from src.common.dtypes import compact_dtypes
+from src.common.features import bin_values, binary_flag
+
+# DATE_DIED value used for patients who survived
+SURVIVED_SENTINEL = "9999-99-99"
+
+AGE_BINS = [0, 18, 40, 60, 80, 120]
+AGE_LABELS = ["Child", "Young Adult", "Adult", "Senior", "Elderly"]
+
 
 def preprocess_covid_data(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
+    df = compact_dtypes(df, "healthcare")
 
     # Mortality outcome
-    df["DIED"] = df["DATE_DIED"].apply(
-        lambda x: 0 if x == "9999-99-99" else 1
-    )
+    df["DIED"] = binary_flag(df["DATE_DIED"] != SURVIVED_SENTINEL)
 
     # Age groups
-    df["AGE_GROUP"] = pd.cut(
-        df["AGE"],
-        bins=[0, 18, 40, 60, 80, 120],
-        labels=["Child", "Young Adult", "Adult", "Senior", "Elderly"]
-    )
+    df["AGE_GROUP"] = bin_values(df["AGE"], AGE_BINS, AGE_LABELS)
 
     # COVID-positive classification (1–3)
-    df["COVID_POSITIVE"] = df["CLASIFFICATION_FINAL"].apply(
-        lambda x: 1 if x in [1, 2, 3] else 0
-    )
+    df["COVID_POSITIVE"] = binary_flag(df["CLASIFFICATION_FINAL"].isin([1, 2, 3]))
 
     return df
@@ -0,0 +1,190 @@
+"""
+Multi-dimensional COVID risk stratification
+
+``RiskTable`` counts the patients and deaths of every observed
+combination (cell) of the chosen dimensions, e.g. AGE_GROUP x SEX x ICU x
+every comorbidity. Each dimension is coded against a fixed list of levels
+(plus one code for missing or unknown values), the codes are combined into
+one mixed-radix cell key, and a chunk's cases and deaths are counted for
+all cells with one ``np.bincount`` over that key. Chunks of a stream are
+folded into the same table, so the full dataset never has to be in memory.
+
+Marginals over any subset of the dimensions and their mortality rates are
+regrouped from the cells. As with ``groupby(..., observed=True)``, a
+marginal leaves out the combinations no patient falls in and the patients
+missing one of its dimensions.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.common.aggregation import FrameSource, iter_frames
+from src.common.cells import sum_by_key
+from src.healthcare_covid_analysis.bitmap_index import CONDITION_COLUMNS
+from src.healthcare_covid_analysis.preprocessing import AGE_LABELS
+
+STRATIFICATION_DIMENSIONS = ["AGE_GROUP", "SEX", "ICU", *CONDITION_COLUMNS]
+
+# Levels of the coded columns; categorical columns use their categories
+DEFAULT_LEVELS = {
+    **{column: [1, 2] for column in ["SEX", "USMER", "PATIENT_TYPE", "INTUBED", "ICU", *CONDITION_COLUMNS]},
+    "DIED": [0, 1],
+    "COVID_POSITIVE": [0, 1],
+    "AGE_GROUP": AGE_LABELS,
+}
+
+
+def _level_codes(series: pd.Series, levels: list) -> np.ndarray:
+    """
+    Position of every value of ``series`` in ``levels``; missing values and
+    values outside ``levels`` get ``len(levels)``.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype) and list(series.cat.categories) == list(levels):
+        codes = series.cat.codes.to_numpy().astype("int64")
+        return np.where(codes < 0, len(levels), codes)
+
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        # A handful of levels: compare against each instead of hashing
+        values = series.to_numpy(dtype="float64", na_value=np.nan)
+        codes = np.full(len(values), len(levels), dtype="int64")
+        for code, level in enumerate(levels):
+            codes[values == level] = code
+        return codes
+
+    codes = pd.Index(levels).get_indexer(series)
+    return np.where(codes < 0, len(levels), codes)
+
+
+class RiskTable:
+    """
+    Patients and deaths per observed cell of the stratification dimensions.
+
+    Build one with ``RiskTable.build`` from a preprocessed frame or chunk
+    stream.
+    """
+
+    def __init__(self, dimensions: list[str], levels: dict, dtypes: dict,
+                 keys: np.ndarray, cases: np.ndarray, deaths: np.ndarray,
+                 outcome: str = "DIED"):
+        self.dimensions = list(dimensions)
+        self.levels = {dimension: list(levels[dimension]) for dimension in self.dimensions}
+        self.dtypes = dtypes
+        self.outcome = outcome
+        # Sorted mixed-radix cell keys; the last code of every dimension
+        # stands for a missing value
+        self.keys = keys
+        self.cases = cases
+        self.deaths = deaths
+        self.radices = [len(self.levels[dimension]) + 1 for dimension in self.dimensions]
+        self.rows = int(cases.sum())
+
+    @classmethod
+    def build(cls, data: FrameSource, dimensions: list[str] | None = None,
+              outcome: str = "DIED", levels: dict | None = None) -> "RiskTable":
+        """
+        Count ``data`` per cell of ``dimensions`` (default:
+        ``STRATIFICATION_DIMENSIONS``), with ``outcome`` (a 0/1 column)
+        summed as the deaths.
+
+        ``levels`` overrides the levels of ``DEFAULT_LEVELS``; other
+        categorical dimensions use the categories of the first chunk.
+        """
+        dimensions = list(dimensions or STRATIFICATION_DIMENSIONS)
+        levels = {**DEFAULT_LEVELS, **(levels or {})}
+        dtypes = {}
+
+        parts = []
+        radices = None
+        for frame in iter_frames(data):
+            if radices is None:
+                for dimension in dimensions:
+                    series = frame[dimension]
+                    dtypes[dimension] = series.dtype
+                    if dimension not in levels:
+                        if not isinstance(series.dtype, pd.CategoricalDtype):
+                            raise ValueError(f"No levels given for stratification dimension {dimension}")
+                        levels[dimension] = list(series.cat.categories)
+                radices = [len(levels[dimension]) + 1 for dimension in dimensions]
+                size = int(np.prod(radices, dtype="float64"))
+
+            codes = [_level_codes(frame[dimension], levels[dimension]) for dimension in dimensions]
+            keys = np.ravel_multi_index(codes, radices)
+            deaths = frame[outcome].to_numpy(dtype="float64", na_value=0.0)
+            observed, (cases, deaths) = sum_by_key(keys, size, [None, deaths])
+            parts.append((observed, cases, deaths))
+
+        if not parts:
+            raise ValueError("Cannot stratify no rows")
+
+        if len(parts) == 1:
+            keys, cases, deaths = parts[0]
+        else:
+            # Fold the chunk tables into one
+            keys, (cases, deaths) = sum_by_key(
+                np.concatenate([part[0] for part in parts]), size,
+                [np.concatenate([part[1] for part in parts]), np.concatenate([part[2] for part in parts])],
+            )
+
+        return cls(
+            dimensions, levels, dtypes, keys,
+            np.rint(cases).astype("int64"), np.rint(deaths).astype("int64"), outcome,
+        )
+
+    # --------------------------------------------------
+    # Marginals
+    # --------------------------------------------------
+    def _member_codes(self, dimension: str) -> np.ndarray:
+        position = self.dimensions.index(dimension)
+        stride = int(np.prod(self.radices[position + 1:], dtype="int64"))
+        return (self.keys // stride) % self.radices[position]
+
+    def _labels(self, dimension: str, codes: np.ndarray):
+        levels = self.levels[dimension]
+        dtype = self.dtypes.get(dimension)
+        if isinstance(dtype, pd.CategoricalDtype):
+            return pd.Categorical.from_codes(codes, dtype=dtype)
+        return pd.array(np.asarray(levels, dtype=object)[codes].tolist(), dtype=dtype)
+
+    def marginal(self, by=None) -> pd.DataFrame:
+        """
+        Cases, deaths and mortality rate (%) per observed combination of
+        ``by`` (default: all dimensions).
+        """
+        by = self.dimensions if by is None else [by] if isinstance(by, str) else list(by)
+        for dimension in by:
+            if dimension not in self.dimensions:
+                raise KeyError(f"{dimension} is not a stratification dimension")
+
+        codes = [self._member_codes(dimension) for dimension in by]
+        sizes = [len(self.levels[dimension]) for dimension in by]
+        known = np.ones(len(self.keys), dtype=bool)
+        for member_codes, size in zip(codes, sizes):
+            known &= member_codes < size
+
+        keys = np.ravel_multi_index([member_codes[known] for member_codes in codes], sizes)
+        observed, (cases, deaths) = sum_by_key(
+            keys, int(np.prod(sizes, dtype="float64")),
+            [self.cases[known].astype("float64"), self.deaths[known].astype("float64")],
+        )
+
+        members = np.unravel_index(observed, sizes)
+        arrays = [self._labels(dimension, member) for dimension, member in zip(by, members)]
+        index = (
+            pd.Index(arrays[0], name=by[0]) if len(by) == 1
+            else pd.MultiIndex.from_arrays(arrays, names=by)
+        )
+
+        table = pd.DataFrame(
+            {"cases": np.rint(cases).astype("int64"), "deaths": np.rint(deaths).astype("int64")},
+            index=index,
+        )
+        table["mortality_rate"] = table["deaths"] / table["cases"] * 100
+        return table
+
+    def rate(self, by) -> pd.Series:
+        """
+        Share of deaths per observed combination of ``by``, like
+        ``groupby(by, observed=True)[outcome].mean()``.
+        """
+        table = self.marginal(by)
+        return (table["deaths"] / table["cases"]).rename(self.outcome)
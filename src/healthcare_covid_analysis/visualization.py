@@ -1,32 +1,43 @@
 """
 Static visualization exports for COVID Healthcare Analysis
+
+Plot functions take a preprocessed DataFrame or an ``AggregationContext``
+wrapping one. Charts whose drawn data has not changed are copied from the
+plot cache instead of being redrawn.
 """
 
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
-import numpy as np
 
-sns.set_theme(
-    style="whitegrid",
-    palette="muted",
-    font_scale=1.05
-)
+from src.common.aggregation import correlation_matrix, grouped_reduce
+from src.common.plot_cache import chart_key, restore_chart, store_chart
+from src.common.visualization import apply_style
 
 
 def _ensure_dir(path: Path):
     path.mkdir(parents=True, exist_ok=True)
 
 
+# Theme of every chart of this module
+_THEME = {"palette": "muted", "font_scale": 1.05}
+
+
 def save_plot(fig, output_path: Path):
     fig.savefig(output_path, dpi=300, bbox_inches="tight")
     plt.close(fig)
 
 
 def plot_mortality_distribution(df, output_dir: Path):
+    apply_style(**_THEME)
     _ensure_dir(output_dir)
 
-    counts = df["DIED"].value_counts().sort_index()
+    counts = grouped_reduce(df, "DIED", None, "size")
+
+    output_path = output_dir / "mortality_distribution.png"
+    key = chart_key(plot_mortality_distribution, counts)
+    if restore_chart(key, output_path):
+        return
 
     fig, ax = plt.subplots(figsize=(6, 4))
 
@@ -57,13 +68,20 @@ def plot_mortality_distribution(df, output_dir: Path):
     ax.spines["top"].set_visible(False)
     ax.spines["right"].set_visible(False)
 
-    save_plot(fig, output_dir / "mortality_distribution.png")
+    save_plot(fig, output_path)
+    store_chart(key, output_path)
 
 
 def plot_age_group_mortality(df, output_dir: Path):
+    apply_style(**_THEME)
     _ensure_dir(output_dir)
 
-    data = (df.groupby("AGE_GROUP", observed=True)["DIED"].mean().reset_index())
+    data = grouped_reduce(df, "AGE_GROUP", "DIED", "mean").reset_index()
+
+    output_path = output_dir / "age_group_mortality.png"
+    key = chart_key(plot_age_group_mortality, data)
+    if restore_chart(key, output_path):
+        return
 
     fig, ax = plt.subplots(figsize=(8, 5))
     sns.barplot(
@@ -78,17 +96,20 @@ def plot_age_group_mortality(df, output_dir: Path):
     ax.set_xlabel("Age Group")
     ax.set_ylabel("Mortality Rate")
 
-    save_plot(fig, output_dir / "age_group_mortality.png")
+    save_plot(fig, output_path)
+    store_chart(key, output_path)
 
 
 def plot_comorbidity_impact(df, output_dir: Path, condition: str):
+    apply_style(**_THEME)
     _ensure_dir(output_dir)
 
-    data = (
-        df.groupby(condition, observed=True)["DIED"]
-        .mean()
-        .reset_index()
-    )
+    data = grouped_reduce(df, condition, "DIED", "mean").reset_index()
+
+    output_path = output_dir / f"mortality_by_{condition.lower()}.png"
+    key = chart_key(plot_comorbidity_impact, data)
+    if restore_chart(key, output_path):
+        return
 
     fig, ax = plt.subplots(figsize=(6, 4))
 
@@ -99,43 +120,53 @@ def plot_comorbidity_impact(df, output_dir: Path, condition: str):
         hue=condition,
         palette="viridis",
         legend=False,
-        errorbar=None
+        errorbar=None,
+        ax=ax
     )
 
     ax.set_title(f"Mortality Rate by {condition}", fontsize=13)
     ax.set_xlabel(condition)
     ax.set_ylabel("Mortality Rate")
 
-    plt.tight_layout()
-    plt.savefig(output_dir / f"mortality_by_{condition.lower()}.png", dpi=300)
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=300)
+    plt.close(fig)
+    store_chart(key, output_path)
 
 
 def plot_icu_mortality(df, output_dir: Path):
+    apply_style(**_THEME)
     _ensure_dir(output_dir)
 
-    data = df.groupby("ICU")["DIED"].mean().reset_index()
+    data = grouped_reduce(df, "ICU", "DIED", "mean").reset_index()
+
+    output_path = output_dir / "icu_mortality.png"
+    key = chart_key(plot_icu_mortality, data)
+    if restore_chart(key, output_path):
+        return
 
     fig, ax = plt.subplots(figsize=(6, 4))
     sns.barplot(
-        data=df,
+        data=data,
         x="ICU",
         y="DIED",
         hue="ICU",
         palette="coolwarm",
         legend=False,
-        estimator=np.mean,
-        errorbar=None
+        errorbar=None,
+        ax=ax
     )
 
     ax.set_title("Mortality Rate by ICU Admission", fontsize=14)
     ax.set_xlabel("ICU Admission (0 = No, 1 = Yes)")
     ax.set_ylabel("Mortality Rate")
 
-    save_plot(fig, output_dir / "icu_mortality.png")
+    save_plot(fig, output_path)
+    store_chart(key, output_path)
 
 
 def plot_clinical_correlation_heatmap(df, output_dir: Path):
+    apply_style(**_THEME)
     _ensure_dir(output_dir)
 
     clinical_cols = [
@@ -143,9 +174,16 @@ def plot_clinical_correlation_heatmap(df, output_dir: Path):
         "OBESITY", "RENAL_CHRONIC", "ICU", "DIED"
     ]
 
+    corr = correlation_matrix(df, clinical_cols)
+
+    output_path = output_dir / "clinical_correlation_heatmap.png"
+    key = chart_key(plot_clinical_correlation_heatmap, corr)
+    if restore_chart(key, output_path):
+        return
+
     fig, ax = plt.subplots(figsize=(12, 7))
     sns.heatmap(
-        df[clinical_cols].corr(),
+        corr,
         annot=True,
         fmt=".2f",
         cmap="coolwarm",
@@ -155,4 +193,5 @@ def plot_clinical_correlation_heatmap(df, output_dir: Path):
 
     ax.set_title("Clinical Variable Correlation Heatmap", fontsize=14)
 
-    save_plot(fig, output_dir / "clinical_correlation_heatmap.png")
+    save_plot(fig, output_path)
+    store_chart(key, output_path)
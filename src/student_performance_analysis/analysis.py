@@ -4,22 +4,49 @@ Core analytical computations for Student Performance
 
 import pandas as pd
 
-
-def overview_metrics(df: pd.DataFrame) -> dict:
+from src.common.aggregation import as_context, frame_of
+from src.common.parsing import map_unique
+from src.common.sketches import (
+    DEFAULT_RANK_ERROR,
+    median_error,
+    sketch_column,
+    sketch_percentiles,
+)
+
+# Alphabetical, matching the order of the former string column
+RESULT_LABELS = ["Fail", "Pass"]
+
+
+def overview_metrics(df: pd.DataFrame, approximate: bool = False, percentiles=(),
+                     rank_error: float = DEFAULT_RANK_ERROR) -> dict:
+    df = frame_of(df)
     result_series = _resolve_result_column(df)
 
     total_students = df.shape[0]
     pass_count = (result_series == "Pass").sum()
+    scores = df["overall_score"]
+    sketch = sketch_column(scores, rank_error) if approximate else None
+    median = sketch.quantile(0.5) if sketch is not None else scores.median()
 
-    return {
+    overview = {
         "total_students": total_students,
         "pass_percentage": (pass_count / total_students) * 100,
-        "average_score": df["overall_score"].mean(),
-        "median_score": df["overall_score"].median(),
-        "attendance_correlation": df["attendance_percentage"].corr(df["overall_score"]),
-        "study_hours_correlation": df["study_hours"].corr(df["overall_score"]),
+        "average_score": scores.mean(),
+        "median_score": median,
+        "attendance_correlation": df["attendance_percentage"].corr(scores),
+        "study_hours_correlation": df["study_hours"].corr(scores),
     }
 
+    if sketch is not None:
+        overview.update(median_error(sketch))
+    if percentiles:
+        overview["score_percentiles"] = (
+            sketch_percentiles(sketch, percentiles) if sketch is not None
+            else dict(zip(percentiles, scores.quantile(list(percentiles)).tolist()))
+        )
+
+    return overview
+
 
 def _resolve_result_column(df: pd.DataFrame) -> pd.Series:
     """
@@ -34,23 +61,55 @@ def _resolve_result_column(df: pd.DataFrame) -> pd.Series:
         return df["Result"]
 
     if "final_grade" in df.columns:
-        return df["final_grade"].apply(
-            lambda x: "Pass" if str(x).lower() not in ["f", "fail"] else "Fail"
+        grades = df["final_grade"]
+        passed = map_unique(
+            grades,
+            lambda labels: ~labels.astype(str).str.lower().isin(["f", "fail"]),
+            fill_value=True,
         )
+        return _result_series(passed.to_numpy(dtype=bool), df.index, grades.name)
 
     # Fallback: derive from score threshold
-    return df["overall_score"].apply(
-        lambda x: "Pass" if x >= 40 else "Fail"
+    scores = df["overall_score"]
+    return _result_series((scores >= 40).to_numpy(), df.index, scores.name)
+
+
+def _result_series(passed, index, name) -> pd.Series:
+    return pd.Series(
+        pd.Categorical.from_codes(passed.astype("int8"), categories=RESULT_LABELS),
+        index=index,
+        name=name,
     )
 
 
+def add_result_column(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Attach the resolved pass/fail ``Result`` column used by the charts.
+    """
+    return df.assign(Result=_resolve_result_column(df))
+
+
 def subject_average_scores(df: pd.DataFrame) -> pd.Series:
-    return df[["math_score", "science_score", "english_score"]].mean()
+    return frame_of(df)[["math_score", "science_score", "english_score"]].mean()
 
 
 def gender_wise_scores(df: pd.DataFrame) -> pd.Series:
-    return df.groupby("gender")["overall_score"].mean()
+    return frame_of(df).groupby("gender")["overall_score"].mean()
 
 
 def pass_fail_distribution(df: pd.DataFrame) -> pd.Series:
-    return df["Result"].value_counts()
+    return frame_of(df)["Result"].value_counts()
+
+
+def cohort_summary(df, **members) -> dict:
+    """
+    Students, pass rate (%) and score means and standard deviations of the
+    cohort whose dimensions equal ``members`` (e.g. ``school_type="public"``),
+    answered from precomputed ``CohortStats``. An ``AggregationContext``
+    builds them on its first cohort query and keeps them for the next.
+    """
+    # Imported here: the cohort statistics reuse this module's pass/fail rule
+    from src.student_performance_analysis.cohorts import CohortStats
+
+    cohorts = df if isinstance(df, CohortStats) else as_context(df).derived(CohortStats.build)
+    return cohorts.summary(**members)
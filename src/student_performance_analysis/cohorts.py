@@ -0,0 +1,210 @@
+"""
+Precomputed cohort statistics for student drill-downs
+
+``CohortStats`` reduces the students to the count, pass count and, for
+every score column, the count, sum and sum of squares per observed
+combination (cell) of the cohort dimensions, in one pass per chunk
+(``np.bincount`` over a mixed-radix cell key). From the cells it
+precomputes the same totals for every single dimension and every pair of
+dimensions, so the mean, standard deviation and pass rate of a cohort
+defined by up to two dimensions are table lookups::
+
+    cohorts = CohortStats.build(df)
+    cohorts.summary(school_type="public", internet_access="yes")
+
+Cohorts over three or more dimensions are summed from the cells, which
+are far fewer than the students. Scores are accumulated relative to the
+first chunk's means so the sums of squares keep their precision.
+"""
+
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from src.common.aggregation import FrameSource, iter_frames
+from src.common.cells import sum_by_key
+from src.student_performance_analysis.analysis import _resolve_result_column
+
+COHORT_DIMENSIONS = [
+    "gender", "school_type", "parent_education", "study_method",
+    "internet_access", "travel_time", "extra_activities",
+    "attendance_band", "study_hours_band",
+]
+
+SCORE_COLUMNS = ["math_score", "science_score", "english_score", "overall_score"]
+
+def _codes(series: pd.Series) -> tuple[np.ndarray, list]:
+    """
+    Integer codes (-1 for missing) and labels of ``series``.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), series.cat.categories.tolist()
+    codes, uniques = pd.factorize(series)
+    return codes, uniques.tolist()
+
+
+class CohortStats:
+    """
+    Score totals per cohort cell, with single and pairwise marginals.
+
+    Build one with ``CohortStats.build`` from a preprocessed frame or
+    chunk stream.
+    """
+
+    def __init__(self, dimensions: list[str], scores: list[str], labels: dict,
+                 codes: np.ndarray, totals: np.ndarray, shift: np.ndarray):
+        self.dimensions = list(dimensions)
+        self.scores = list(scores)
+        # Labels of every dimension; code len(labels) stands for missing
+        self.labels = labels
+        self._codes_of = {
+            dimension: {label: code for code, label in enumerate(labels[dimension])}
+            for dimension in self.dimensions
+        }
+        # One row per cell: its member code in every dimension, and its
+        # [students, passes, (count, sum, sum of squares) per score] totals
+        self.codes = codes
+        # Column-major, so every total is contiguous for np.bincount
+        self.totals = np.asfortranarray(totals)
+        self.shift = shift
+        self.rows = int(totals[:, 0].sum())
+
+        self._radices = [len(labels[dimension]) + 1 for dimension in self.dimensions]
+        self._marginals = {}
+        for size in (1, 2):
+            for members in combinations(range(len(self.dimensions)), size):
+                self._marginals[members] = self._marginal(members)
+
+    @classmethod
+    def build(cls, data: FrameSource, dimensions: list[str] | None = None,
+              scores: list[str] | None = None) -> "CohortStats":
+        """
+        Reduce preprocessed students to cohort cells.
+
+        Dimensions and scores default to those of ``COHORT_DIMENSIONS`` and
+        ``SCORE_COLUMNS`` present in the data.
+        """
+        labels = {}
+        shift = None
+        parts = []
+        for frame in iter_frames(data):
+            if dimensions is None:
+                dimensions = [d for d in COHORT_DIMENSIONS if d in frame.columns]
+            if scores is None:
+                scores = [s for s in SCORE_COLUMNS if s in frame.columns]
+            if shift is None:
+                shift = np.nan_to_num(frame[scores].mean().to_numpy(dtype="float64"))
+
+            local_codes, global_codes, radices = [], [], []
+            for dimension in dimensions:
+                codes, uniques = _codes(frame[dimension])
+                registry = labels.setdefault(dimension, {})
+                # Chunk codes to codes shared by all chunks; -1 is missing
+                mapping = np.array(
+                    [registry.setdefault(label, len(registry)) for label in uniques] + [-1]
+                )
+                local_codes.append(np.where(codes < 0, len(uniques), codes))
+                global_codes.append(mapping)
+                radices.append(len(uniques) + 1)
+
+            values = [
+                np.ones(len(frame)),
+                (_resolve_result_column(frame) == "Pass").to_numpy(dtype="float64"),
+            ]
+            for score, offset in zip(scores, shift):
+                centred = frame[score].to_numpy(dtype="float64", na_value=np.nan) - offset
+                present = ~np.isnan(centred)
+                centred = np.where(present, centred, 0.0)
+                values += [present.astype("float64"), centred, centred * centred]
+
+            keys = np.ravel_multi_index(local_codes, radices)
+            observed, totals = sum_by_key(keys, int(np.prod(radices, dtype="float64")), values)
+            cell_codes = np.unravel_index(observed, radices)
+            parts.append((
+                np.column_stack([m[c] for m, c in zip(global_codes, cell_codes)]),
+                np.column_stack(totals),
+            ))
+
+        if not parts:
+            raise ValueError("Cannot build cohort statistics from no rows")
+
+        labels = {dimension: list(labels[dimension]) for dimension in dimensions}
+        radices = [len(labels[dimension]) + 1 for dimension in dimensions]
+        codes = np.concatenate([part[0] for part in parts])
+        # Missing members take the last code of their dimension
+        codes = np.where(codes < 0, np.array(radices) - 1, codes)
+        keys, totals = sum_by_key(
+            np.ravel_multi_index(codes.T, radices), int(np.prod(radices, dtype="float64")),
+            list(np.concatenate([part[1] for part in parts]).T),
+        )
+        codes = np.column_stack(np.unravel_index(keys, radices))
+        return cls(dimensions, scores, labels, codes, np.column_stack(totals), shift)
+
+    # --------------------------------------------------
+    # Queries
+    # --------------------------------------------------
+    def _marginal(self, members: tuple[int, ...]) -> np.ndarray:
+        radices = [self._radices[member] for member in members]
+        keys = np.ravel_multi_index([self.codes[:, member] for member in members], radices)
+        table = np.stack([
+            np.bincount(keys, weights=self.totals[:, part], minlength=int(np.prod(radices)))
+            for part in range(self.totals.shape[1])
+        ], axis=-1)
+        return table.reshape(*radices, self.totals.shape[1])
+
+    def _member_code(self, dimension: str, label) -> int | None:
+        if dimension not in self._codes_of:
+            raise KeyError(f"{dimension} is not a cohort dimension")
+        return self._codes_of[dimension].get(label)
+
+    def totals_of(self, **members) -> np.ndarray:
+        """
+        ``[students, passes, (count, sum, sum of squares) per score]`` of
+        the cohort whose dimensions equal ``members``.
+        """
+        wanted = []
+        for dimension, label in members.items():
+            code = self._member_code(dimension, label)
+            wanted.append((self.dimensions.index(dimension), code))
+        wanted.sort(key=lambda member: member[0])
+        if any(code is None for _, code in wanted):
+            # A label no student has
+            return np.zeros(self.totals.shape[1])
+
+        positions = tuple(position for position, _ in wanted)
+        if not positions:
+            return self.totals.sum(axis=0)
+        if positions in self._marginals:
+            return self._marginals[positions][tuple(code for _, code in wanted)]
+
+        mask = np.ones(len(self.codes), dtype=bool)
+        for position, code in wanted:
+            mask &= self.codes[:, position] == code
+        return self.totals[mask].sum(axis=0)
+
+    def summary(self, **members) -> dict:
+        """
+        Number of students, pass rate (%) and per-score count, mean and
+        standard deviation of a cohort, e.g. ``summary(gender="female")``.
+        """
+        totals = self.totals_of(**members)
+        students, passes = totals[0], totals[1]
+        count, total, squares = (totals[2 + part::3] for part in range(3))
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = total / count
+            variance = (squares - total * mean) / (count - 1)
+        scores = pd.DataFrame(
+            {
+                "count": count.astype("int64"),
+                "mean": mean + self.shift,
+                "std": np.sqrt(np.clip(variance, 0, None)),
+            },
+            index=pd.Index(self.scores),
+        )
+        return {
+            "students": int(students),
+            "pass_rate": passes / students * 100 if students else float("nan"),
+            "scores": scores,
+        }
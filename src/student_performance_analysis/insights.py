@@ -1,10 +1,13 @@
 import pandas as pd
+
+from src.common.aggregation import frame_of
 from src.student_performance_analysis.analysis import _resolve_result_column
 
 
 def generate_insights(df: pd.DataFrame) -> list[str]:
     insights = []
 
+    df = frame_of(df)
     result_series = _resolve_result_column(df)
 
     if df["attendance_percentage"].corr(df["overall_score"]) > 0.4:
@@ -4,23 +4,27 @@ Preprocessing utilities for Student Performance Analysis
 
 import pandas as pd
 
+from src.common.dtypes import compact_dtypes
+from src.common.features import bin_values
+
+ATTENDANCE_BINS = [0, 60, 75, 90, 100]
+ATTENDANCE_LABELS = ["Low", "Medium", "High", "Excellent"]
+
+STUDY_HOURS_BINS = [0, 2, 4, 6, 10]
+STUDY_HOURS_LABELS = ["Very Low", "Low", "Moderate", "High"]
+
 
 def preprocess_student_data(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
+    df = compact_dtypes(df, "education")
 
     # Attendance bands
-    df["attendance_band"] = pd.cut(
-        df["attendance_percentage"],
-        bins=[0, 60, 75, 90, 100],
-        labels=["Low", "Medium", "High", "Excellent"]
+    df["attendance_band"] = bin_values(
+        df["attendance_percentage"], ATTENDANCE_BINS, ATTENDANCE_LABELS
     )
 
     # Study hours bands
-    df["study_hours_band"] = pd.cut(
-        df["study_hours"],
-        bins=[0, 2, 4, 6, 10],
-        labels=["Very Low", "Low", "Moderate", "High"]
+    df["study_hours_band"] = bin_values(
+        df["study_hours"], STUDY_HOURS_BINS, STUDY_HOURS_LABELS
     )
 
     return df
-
@@ -1,12 +1,23 @@
 """
 Static visualization exports for Student Performance Analysis
+
+Charts whose drawn data has not changed are copied from the plot cache
+instead of being redrawn.
 """
 
 from pathlib import Path
 import matplotlib.pyplot as plt
 import seaborn as sns
 
-sns.set(style="whitegrid")
+from src.common.aggregation import correlation_matrix, frame_of
+from src.common.density import (
+    DEFAULT_DENSITY_THRESHOLD,
+    density_grid,
+    draw_density,
+    use_density,
+)
+from src.common.plot_cache import chart_key, restore_chart, store_chart
+from src.common.visualization import apply_style
 
 
 def _ensure_dir(path: Path):
@@ -19,70 +30,107 @@ def save_plot(fig, output_path: Path):
 
 
 def plot_pass_fail(df, output_dir: Path):
+    apply_style()
     _ensure_dir(output_dir)
 
+    result_counts = frame_of(df)["Result"].value_counts()
+
+    output_path = output_dir / "pass_fail_distribution.png"
+    key = chart_key(plot_pass_fail, result_counts)
+    if restore_chart(key, output_path):
+        return
+
     fig, ax = plt.subplots()
-    df["Result"].value_counts().plot(kind="bar", ax=ax)
+    result_counts.plot(kind="bar", ax=ax)
     ax.set_title("Pass vs Fail Distribution")
 
-    save_plot(fig, output_dir / "pass_fail_distribution.png")
+    save_plot(fig, output_path)
+    store_chart(key, output_path)
 
 
 def plot_avg_score_by_subject(df, output_dir: Path):
+    apply_style()
     _ensure_dir(output_dir)
 
     subject_columns = ["math_score", "science_score", "english_score"]
 
     subject_means = (
-        df[subject_columns]
+        frame_of(df)[subject_columns]
         .dropna()
         .mean()
         .sort_values()
     )
 
-    plt.figure(figsize=(9, 5))
+    output_path = output_dir / "avg_score_by_subject.png"
+    key = chart_key(plot_avg_score_by_subject, subject_means)
+    if restore_chart(key, output_path):
+        return
+
+    fig, ax = plt.subplots(figsize=(9, 5))
     sns.barplot(
         x=subject_means.values,
         y=subject_means.index,
         hue=subject_means.index,
         palette="Set2",
-        legend=False
+        legend=False,
+        ax=ax
     )
 
-    plt.title("Average Score by Subject", fontsize=14)
-    plt.xlabel("Average Score")
-    plt.ylabel("Subject")
-    plt.grid(axis="x", linestyle="--", alpha=0.4)
-    plt.tight_layout()
+    ax.set_title("Average Score by Subject", fontsize=14)
+    ax.set_xlabel("Average Score")
+    ax.set_ylabel("Subject")
+    ax.grid(axis="x", linestyle="--", alpha=0.4)
+    fig.tight_layout()
 
-    plt.savefig(output_dir / "avg_score_by_subject.png", dpi=300)
-    plt.close()
+    fig.savefig(output_path, dpi=300)
+    plt.close(fig)
+    store_chart(key, output_path)
 
 
-def plot_attendance_vs_score(df, output_dir: Path):
+def plot_attendance_vs_score(df, output_dir: Path,
+                             density_threshold: int | None = DEFAULT_DENSITY_THRESHOLD):
+    apply_style()
     _ensure_dir(output_dir)
 
-    plt.figure(figsize=(9, 5))
-    sns.scatterplot(
-        data=df,
-        x="attendance_percentage",
-        y="overall_score",
-        hue="Result",
-        palette="Set2",
-        alpha=0.7
-    )
-
-    plt.title("Attendance vs Overall Score", fontsize=14)
-    plt.xlabel("Attendance Percentage")
-    plt.ylabel("Overall Score")
-    plt.legend(title="Result")
-    plt.tight_layout()
-
-    plt.savefig(output_dir / "attendance_vs_score.png", dpi=300)
-    plt.close()
+    # Large inputs are drawn (and keyed) as one density grid per result
+    grid = points = None
+    if use_density(df, density_threshold):
+        grid = density_grid(df, "attendance_percentage", "overall_score", by="Result")
+    else:
+        points = frame_of(df)[["attendance_percentage", "overall_score", "Result"]]
+
+    output_path = output_dir / "attendance_vs_score.png"
+    key = chart_key(plot_attendance_vs_score, draw_density, grid, points)
+    if restore_chart(key, output_path):
+        return
+
+    fig, ax = plt.subplots(figsize=(9, 5))
+    if grid is not None:
+        draw_density(ax, grid, palette="Set2", legend_title="Result")
+    else:
+        sns.scatterplot(
+            data=points,
+            x="attendance_percentage",
+            y="overall_score",
+            hue="Result",
+            palette="Set2",
+            alpha=0.7,
+            ax=ax
+        )
+        ax.legend(title="Result")
+
+    ax.set_title("Attendance vs Overall Score", fontsize=14)
+    ax.set_xlabel("Attendance Percentage")
+    ax.set_ylabel("Overall Score")
+    fig.tight_layout()
+
+    fig.savefig(output_path, dpi=300)
+    plt.close(fig)
+    store_chart(key, output_path)
 
 
 def plot_correlation_heatmap(df, output_dir: Path):
+    apply_style()
     _ensure_dir(output_dir)
 
     corr_cols = [
@@ -93,64 +141,91 @@ def plot_correlation_heatmap(df, output_dir: Path):
         "overall_score"
     ]
 
-    corr_matrix = df[corr_cols].corr()
+    corr_matrix = correlation_matrix(df, corr_cols)
+
+    output_path = output_dir / "correlation_heatmap.png"
+    key = chart_key(plot_correlation_heatmap, corr_matrix)
+    if restore_chart(key, output_path):
+        return
 
-    plt.figure(figsize=(10, 7))
+    fig, ax = plt.subplots(figsize=(10, 7))
     sns.heatmap(
         corr_matrix,
         annot=True,
         cmap="coolwarm",
         fmt=".2f",
         linewidths=0.5,
-        cbar_kws={"shrink": 0.8}
+        cbar_kws={"shrink": 0.8},
+        ax=ax
     )
 
-    plt.title("Correlation Heatmap of Academic Metrics", fontsize=15)
-    plt.tight_layout()
+    ax.set_title("Correlation Heatmap of Academic Metrics", fontsize=15)
+    fig.tight_layout()
 
-    plt.savefig(output_dir / "correlation_heatmap.png", dpi=300)
-    plt.close()
+    fig.savefig(output_path, dpi=300)
+    plt.close(fig)
+    store_chart(key, output_path)
 
 
 def plot_overall_score_distribution(df, output_dir: Path):
+    apply_style()
     _ensure_dir(output_dir)
 
-    plt.figure(figsize=(9, 5))
+    scores = frame_of(df)["overall_score"]
+
+    output_path = output_dir / "overall_score_distribution.png"
+    key = chart_key(plot_overall_score_distribution, scores)
+    if restore_chart(key, output_path):
+        return
+
+    fig, ax = plt.subplots(figsize=(9, 5))
     sns.histplot(
-        df["overall_score"],
+        scores,
         bins=20,
         kde=True,
-        color="teal"
+        color="teal",
+        ax=ax
     )
 
-    plt.title("Distribution of Overall Scores", fontsize=14)
-    plt.xlabel("Overall Score")
-    plt.ylabel("Student Count")
-    plt.tight_layout()
+    ax.set_title("Distribution of Overall Scores", fontsize=14)
+    ax.set_xlabel("Overall Score")
+    ax.set_ylabel("Student Count")
+    fig.tight_layout()
 
-    plt.savefig(output_dir / "overall_score_distribution.png", dpi=300)
-    plt.close()
+    fig.savefig(output_path, dpi=300)
+    plt.close(fig)
+    store_chart(key, output_path)
 
 
 def plot_gender_score_distribution(df, output_dir: Path):
+    apply_style()
     _ensure_dir(output_dir)
 
-    plt.figure(figsize=(9, 5))
+    scores = frame_of(df)[["gender", "overall_score", "Result"]]
+
+    output_path = output_dir / "gender_score_distribution.png"
+    key = chart_key(plot_gender_score_distribution, scores)
+    if restore_chart(key, output_path):
+        return
+
+    fig, ax = plt.subplots(figsize=(9, 5))
     sns.boxplot(
-        data=df,
+        data=scores,
         x="gender",
         y="overall_score",
         hue="Result",
-        palette="pastel"
+        palette="pastel",
+        ax=ax
     )
 
-    plt.title("Score Distribution by Gender", fontsize=14)
-    plt.xlabel("Gender")
-    plt.ylabel("Overall Score")
-    plt.legend(title="Result")
-    plt.tight_layout()
+    ax.set_title("Score Distribution by Gender", fontsize=14)
+    ax.set_xlabel("Gender")
+    ax.set_ylabel("Overall Score")
+    ax.legend(title="Result")
+    fig.tight_layout()
 
-    plt.savefig(output_dir / "gender_score_distribution.png", dpi=300)
-    plt.close()
+    fig.savefig(output_path, dpi=300)
+    plt.close(fig)
+    store_chart(key, output_path)
 
 
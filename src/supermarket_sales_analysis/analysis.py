@@ -1,35 +1,71 @@
 """
 Core analytical computations
+
+Every function accepts either a preprocessed DataFrame or an iterable of
+preprocessed chunks (see ``common.data_loader.stream_dataset``).
 """
 
 import pandas as pd
 
+from src.common.aggregation import (
+    FrameSource,
+    column_quantiles,
+    grouped_reduce,
+    summarize,
+)
+from src.common.sketches import DEFAULT_RANK_ERROR, median_error, sketch_percentiles
+
+
+def sales_overview(df: FrameSource, approximate: bool = False, percentiles=(),
+                   rank_error: float = DEFAULT_RANK_ERROR) -> dict:
+    """
+    Headline sales figures.
 
-def sales_overview(df: pd.DataFrame) -> dict:
-    return {
-        "total_sales": df["Total"].sum(),
-        "total_transactions": len(df),
-        "average_transaction": df["Total"].mean(),
-        "median_transaction": df["Total"].median(),
-        "max_transaction": df["Total"].max(),
-        "period_start": df["Date"].min(),
-        "period_end": df["Date"].max(),
+    With ``approximate=True`` the median (and any ``percentiles``) of
+    ``Total`` come from a quantile sketch built in the same pass, and the
+    median's bounds and the sketch's rank error are reported next to it.
+    """
+    median_reducer = "sketch" if approximate else "median"
+    rows, stats = summarize(df, {
+        "Total": ["sum", "mean", median_reducer, "max"],
+        "Date": ["min", "max"],
+    }, rank_error)
+    sketch = stats["Total"].get("sketch")
+    median = sketch.quantile(0.5) if sketch is not None else stats["Total"]["median"]
+
+    overview = {
+        "total_sales": stats["Total"]["sum"],
+        "total_transactions": rows,
+        "average_transaction": stats["Total"]["mean"],
+        "median_transaction": median,
+        "max_transaction": stats["Total"]["max"],
+        "period_start": stats["Date"]["min"],
+        "period_end": stats["Date"]["max"],
     }
 
+    if sketch is not None:
+        overview.update(median_error(sketch))
+    if percentiles:
+        overview["transaction_percentiles"] = (
+            sketch_percentiles(sketch, percentiles) if sketch is not None
+            else column_quantiles(df, "Total", percentiles)
+        )
+
+    return overview
+
 
-def product_line_performance(df: pd.DataFrame, top_n: int = 3) -> pd.DataFrame:
+def product_line_performance(df: FrameSource, top_n: int = 3) -> pd.DataFrame:
     return (
-        df.groupby("Product_Line")["Total"]
-        .sum()
+        grouped_reduce(df, "Product_Line", "Total", "sum")
         .sort_values(ascending=False)
         .head(top_n)
         .reset_index()
     )
 
 
-def hourly_sales(df: pd.DataFrame) -> pd.Series:
-    return df.groupby("Hour")["Total"].sum()
+def hourly_sales(df: FrameSource) -> pd.Series:
+    return grouped_reduce(df, "Hour", "Total", "sum")
 
 
-def daily_sales(df: pd.DataFrame) -> pd.Series:
-    return df.groupby("Date")["Total"].sum()
+def daily_sales(df: FrameSource) -> pd.Series:
+    return grouped_reduce(df, "Date", "Total", "sum")
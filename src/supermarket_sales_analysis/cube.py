@@ -0,0 +1,483 @@
+"""
+Materialised OLAP cube of supermarket sales
+
+``SalesCube`` holds the sum, count, minimum and maximum of every sales
+measure for each observed combination of Branch, City, Product_Line,
+Customer_Type, Gender, Payment, Date and Hour. Each dimension is
+integer-coded and the codes are combined into one mixed-radix cell key, so
+the rows are reduced in one vectorised pass of ``np.bincount`` and
+``ufunc.at`` over that key (per chunk for a chunk stream). Month and
+weekday are rolled up from the Date level.
+
+Any group-by over a subset of the dimensions is a roll-up of the cells,
+computed the same way over the cells' member codes, and
+``slice`` keeps only chosen members, so the cube is an
+``AggregationContext``: the analysis, insight, dashboard and plot
+functions are answered from the cells without touching raw rows.
+A value-count table of ``Total`` keeps its median exact. Only charts that
+draw individual rows (the Quantity/Total scatter) still need the frame the
+cube was built from.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.common.aggregation import AggregationContext, FrameSource, iter_frames
+from src.common.cells import DENSE_KEY_LIMIT
+from src.common.features import DAY_NAMES, MONTH_NAMES, label_codes
+from src.common.sketches import DEFAULT_RANK_ERROR, KLLSketch
+from src.supermarket_sales_analysis.incremental import _median_from_counts
+
+CUBE_VERSION = 1
+CUBE_FILE = "cube.json"
+CELLS_FILE = "cells.parquet"
+VALUES_FILE = "values.parquet"
+
+CUBE_DIMENSIONS = [
+    "Branch", "City", "Product_Line", "Customer_Type", "Gender", "Payment", "Date", "Hour",
+]
+
+CUBE_MEASURES = ["Total", "Quantity", "Unit_Price", "Tax", "Rating"]
+
+# Measures with a value-count table, for exact medians
+QUANTILE_MEASURES = ["Total"]
+
+# Levels rolled up from the Date dimension
+DATE_DERIVED_KEYS = {
+    "Month": lambda dates: label_codes(dates.dt.month, MONTH_NAMES, offset=1),
+    "Day": lambda dates: label_codes(dates.dt.dayofweek, DAY_NAMES),
+    "Day_Name": lambda dates: label_codes(dates.dt.dayofweek, DAY_NAMES),
+}
+
+_PARTS = ["sum", "count", "min", "max"]
+
+_PART_RULES = {"sum": "sum", "count": "sum", "min": "min", "max": "max", "size": "sum"}
+
+_GROUPED_REDUCERS = ("sum", "count", "mean", "min", "max", "size")
+
+def _part(measure: str, part: str) -> str:
+    return f"{measure}_{part}"
+
+
+def _encode(values: pd.Series) -> tuple[np.ndarray, pd.Index]:
+    """
+    Integer codes of ``values`` in sorted label order; missing values get
+    the code one past the last label.
+    """
+    codes, labels = pd.factorize(values, sort=True)
+    codes = np.where(codes < 0, len(labels), codes)
+    return codes, pd.Index(labels, name=values.name)
+
+
+def _group_ids(codes: list[np.ndarray], sizes: list[int]) -> tuple[np.ndarray, np.ndarray, int]:
+    """
+    Combine per-dimension codes into one mixed-radix key per row.
+
+    Returns ``(group id per row, key of every group, number of groups)``;
+    rows with a missing member get the id one past the last group.
+    """
+    if len(codes) == 1:
+        return codes[0], np.arange(sizes[0]), sizes[0]
+
+    shape = tuple(sizes)
+    valid = np.ones(len(codes[0]), dtype=bool)
+    for dimension_codes, size in zip(codes, sizes):
+        valid &= dimension_codes < size
+    try:
+        keys = np.ravel_multi_index([np.where(valid, c, 0) for c in codes], shape)
+    except ValueError:
+        raise ValueError(f"Too many member combinations to aggregate ({shape})")
+
+    total = int(np.prod(shape, dtype="float64"))
+    if total <= DENSE_KEY_LIMIT:
+        return np.where(valid, keys, total), np.arange(total), total
+
+    group_keys, ids = np.unique(keys[valid], return_inverse=True)
+    row_ids = np.full(len(keys), len(group_keys))
+    row_ids[valid] = ids
+    return row_ids, group_keys, len(group_keys)
+
+
+def _reduce(ids: np.ndarray, groups: int, values: np.ndarray, rule: str) -> np.ndarray:
+    """
+    Reduce ``values`` per group id (ids equal to ``groups`` are dropped);
+    values summed must not be missing.
+    """
+    if rule == "sum":
+        return np.bincount(ids, weights=values, minlength=groups + 1)[:groups]
+    out = np.full(groups + 1, np.nan)
+    (np.fmin if rule == "min" else np.fmax).at(out, ids, values)
+    return out[:groups]
+
+
+def _cell_table(frame: pd.DataFrame, dimensions: list[str], measures: list[str]) -> pd.DataFrame:
+    """
+    One row per observed dimension combination of ``frame`` (missing
+    members included), with the partial aggregates of every measure and
+    the row count.
+    """
+    encoded = [_encode(frame[dimension]) for dimension in dimensions]
+    # Missing members are a level of their own here
+    sizes = [len(labels) + 1 for _, labels in encoded]
+    ids, group_keys, groups = _group_ids([codes for codes, _ in encoded], sizes)
+
+    size = np.bincount(ids, minlength=groups + 1)[:groups]
+    observed = np.flatnonzero(size)
+    table = {"size": size[observed]}
+    for measure in measures:
+        values = frame[measure].to_numpy(dtype="float64", na_value=np.nan)
+        present = ~np.isnan(values)
+        table[_part(measure, "sum")] = _reduce(ids, groups, np.where(present, values, 0.0), "sum")[observed]
+        table[_part(measure, "count")] = _reduce(ids, groups, present, "sum")[observed]
+        for part in ("min", "max"):
+            table[_part(measure, part)] = _reduce(ids, groups, values, part)[observed]
+
+    cell_codes = np.unravel_index(group_keys[observed], sizes)
+    cells = pd.DataFrame({
+        dimension: labels.array.take(np.where(codes == len(labels), -1, codes), allow_fill=True)
+        for (_, labels), dimension, codes in zip(encoded, dimensions, cell_codes)
+    })
+    for column in [_part(m, p) for m in measures for p in _PARTS] + ["size"]:
+        cells[column] = table[column]
+    cells["size"] = cells["size"].astype("int64")
+    return cells
+
+
+def _merge_cells(parts: list[pd.DataFrame], dimensions: list[str]) -> pd.DataFrame:
+    combined = pd.concat(parts, ignore_index=True)
+    rules = {
+        column: _PART_RULES[column.rsplit("_", 1)[-1]]
+        for column in combined.columns if column not in dimensions
+    }
+    return (
+        combined.groupby(dimensions, observed=True, dropna=False, sort=True)
+        .agg(rules)
+        .reset_index()
+    )
+
+
+def _value_counts(frame: pd.DataFrame, measures: list[str]) -> dict:
+    return {measure: frame[measure].value_counts() for measure in measures}
+
+
+def _merge_value_counts(current: dict, update: dict) -> dict:
+    return {
+        measure: current[measure].add(counts, fill_value=0) if measure in current else counts
+        for measure, counts in update.items()
+    }
+
+
+class SalesCube(AggregationContext):
+    """
+    Sales aggregates per observed combination of the cube dimensions.
+
+    Build one with ``SalesCube.build`` from a preprocessed frame or chunk
+    stream, or open a saved one with ``SalesCube.load``.
+    """
+
+    def __init__(self, cells: pd.DataFrame, dimensions: list[str], measures: list[str],
+                 value_counts: dict | None = None, integer_measures: list[str] = (),
+                 data: FrameSource | None = None):
+        super().__init__(data)
+        self.cells = cells
+        self.dimensions = list(dimensions)
+        self.measures = list(measures)
+        self.integer_measures = [m for m in integer_measures if m in self.measures]
+        self.rows = int(cells["size"].sum())
+        # Slices have no value counts, so no exact medians
+        self._value_counts = value_counts
+        # Per-cell member codes of each dimension, computed on first use
+        self._encoded = {}
+
+    @classmethod
+    def build(cls, data: FrameSource, dimensions: list[str] | None = None,
+              measures: list[str] | None = None) -> "SalesCube":
+        """
+        Reduce preprocessed sales rows to a cube.
+
+        Dimensions and measures default to those of ``CUBE_DIMENSIONS`` and
+        ``CUBE_MEASURES`` present in the data. A full frame is kept as the
+        cube's ``data`` for computations that need rows.
+        """
+        parts, counts = [], {}
+        integer_measures = []
+        for frame in iter_frames(data):
+            if dimensions is None:
+                dimensions = [d for d in CUBE_DIMENSIONS if d in frame.columns]
+            if measures is None:
+                measures = [m for m in CUBE_MEASURES if m in frame.columns]
+                integer_measures = [
+                    m for m in measures if pd.api.types.is_integer_dtype(frame[m].dtype)
+                ]
+            parts.append(_cell_table(frame, dimensions, measures))
+            counts = _merge_value_counts(
+                counts, _value_counts(frame, [m for m in measures if m in QUANTILE_MEASURES])
+            )
+
+        if not parts:
+            raise ValueError("Cannot build a sales cube from no rows")
+        cells = parts[0] if len(parts) == 1 else _merge_cells(parts, dimensions)
+
+        counts = {measure: values.astype("int64").sort_index() for measure, values in counts.items()}
+        source = data if isinstance(data, pd.DataFrame) else None
+        return cls(cells, dimensions, measures, counts, integer_measures, source)
+
+    @property
+    def columns(self) -> list[str]:
+        derived = list(DATE_DERIVED_KEYS) if "Date" in self.dimensions else []
+        return self.dimensions + derived + self.measures
+
+    # --------------------------------------------------
+    # Queries
+    # --------------------------------------------------
+    def _level(self, key: str) -> pd.Series:
+        """
+        Every cell's member of dimension ``key``.
+        """
+        if key in self.dimensions:
+            return self.cells[key]
+        if key in DATE_DERIVED_KEYS and "Date" in self.dimensions:
+            return DATE_DERIVED_KEYS[key](self.cells["Date"]).rename(key)
+        raise ValueError(f"The sales cube has no dimension {key!r}")
+
+    def _codes(self, key: str) -> tuple[np.ndarray, pd.Index]:
+        if key not in self._encoded:
+            self._encoded[key] = _encode(self._level(key))
+        return self._encoded[key]
+
+    def _check_measure(self, measure: str):
+        if measure not in self.measures:
+            raise ValueError(f"The sales cube does not track {measure}")
+
+    def _aggregate(self, keys: list[str], columns: list[str]) -> tuple[pd.Index, dict]:
+        """
+        Roll the cells up to the members of ``keys``.
+
+        Returns the observed members (sorted, without missing ones, as
+        ``groupby(keys, observed=True)`` would) and ``{column: values}``
+        for the row count and each of the cell ``columns``.
+        """
+        encoded = [self._codes(key) for key in keys]
+        sizes = [len(labels) for _, labels in encoded]
+        ids, group_keys, groups = _group_ids([codes for codes, _ in encoded], sizes)
+
+        size = _reduce(ids, groups, self.cells["size"].to_numpy(dtype="float64"), "sum")
+        observed = np.flatnonzero(size)
+        values = {"size": size[observed].astype("int64")}
+        for column in columns:
+            rule = _PART_RULES[column.rsplit("_", 1)[-1]]
+            values[column] = _reduce(ids, groups, self.cells[column].to_numpy(dtype="float64"), rule)[observed]
+
+        member_codes = np.unravel_index(group_keys[observed], sizes)
+        members = [labels.take(codes) for (_, labels), codes in zip(encoded, member_codes)]
+        index = members[0] if len(members) == 1 else pd.MultiIndex.from_arrays(members)
+        return index, values
+
+    def rollup(self, by, measures: list[str] | None = None) -> pd.DataFrame:
+        """
+        Sum, count, mean, minimum and maximum of ``measures`` (default: all)
+        and the row count per member of the ``by`` dimensions.
+
+        Members are sorted and rows with a missing member are left out, as
+        in ``groupby(by, observed=True)``.
+        """
+        keys = [by] if isinstance(by, str) else list(by)
+        measures = self.measures if measures is None else list(measures)
+        for measure in measures:
+            self._check_measure(measure)
+
+        index, values = self._aggregate(keys, [_part(m, p) for m in measures for p in _PARTS])
+        result = pd.DataFrame(index=index)
+        for measure in measures:
+            for part in _PARTS:
+                result[_part(measure, part)] = values[_part(measure, part)]
+            result[_part(measure, "count")] = result[_part(measure, "count")].astype("int64")
+            result[_part(measure, "mean")] = result[_part(measure, "sum")] / result[_part(measure, "count")]
+        result["size"] = values["size"]
+        return result
+
+    def slice(self, **members) -> "SalesCube":
+        """
+        Cube restricted to the given members, e.g.
+        ``cube.slice(Branch="A", Month=["January", "February"])``.
+        """
+        mask = np.ones(len(self.cells), dtype=bool)
+        for key, wanted in members.items():
+            wanted = list(wanted) if isinstance(wanted, (list, tuple, set)) else [wanted]
+            mask &= self._level(key).isin(wanted).to_numpy(dtype=bool)
+
+        return SalesCube(
+            self.cells.loc[mask].reset_index(drop=True),
+            self.dimensions,
+            self.measures,
+            integer_measures=self.integer_measures,
+        )
+
+    # --------------------------------------------------
+    # AggregationContext interface
+    # --------------------------------------------------
+    def grouped(self, by, column: str | None, reducer: str) -> pd.Series:
+        if reducer not in _GROUPED_REDUCERS:
+            raise ValueError(f"The sales cube does not track {reducer} of {column}")
+        keys = list(by) if isinstance(by, (list, tuple)) else [by]
+        cache_key = (tuple(keys), column, reducer)
+
+        if cache_key not in self._grouped:
+            if reducer == "size":
+                index, values = self._aggregate(keys, [])
+                result = pd.Series(values["size"], index=index)
+            else:
+                self._check_measure(column)
+                parts = ["sum", "count"] if reducer == "mean" else [reducer]
+                index, values = self._aggregate(keys, [_part(column, part) for part in parts])
+                if reducer == "mean":
+                    result = (
+                        pd.Series(values[_part(column, "sum")], index=index)
+                        / pd.Series(values[_part(column, "count")], index=index)
+                    )
+                else:
+                    result = pd.Series(values[_part(column, reducer)], index=index)
+                    whole = reducer == "count" or (
+                        column in self.integer_measures and not result.hasnans
+                    )
+                    if whole:
+                        result = result.astype("int64")
+                result.name = column
+            self._grouped[cache_key] = result
+        return self._grouped[cache_key].copy()
+
+    def prefetch(self, requests: list[tuple]):
+        # Roll-ups of the cells are cheap enough to compute on demand
+        return None
+
+    def summarize(self, spec: dict[str, list[str]],
+                  rank_error: float = DEFAULT_RANK_ERROR) -> tuple[int, dict]:
+        result = {}
+        for column, reducers in spec.items():
+            result[column] = {reducer: self._scalar(column, reducer, rank_error) for reducer in reducers}
+        return self.rows, result
+
+    def _scalar(self, column: str, reducer: str, rank_error: float):
+        if column in self.measures:
+            if reducer in ("median", "sketch"):
+                if self._value_counts is None:
+                    raise ValueError(f"A sliced sales cube cannot compute the {reducer} of {column}")
+                if column not in self._value_counts:
+                    raise ValueError(f"The sales cube does not track the {reducer} of {column}")
+                counts = self._value_counts[column]
+                if reducer == "median":
+                    return _median_from_counts(counts)
+                return KLLSketch(rank_error=rank_error).update(counts.index, counts.to_numpy())
+
+            total_sum = self.cells[_part(column, "sum")].sum()
+            total_count = int(self.cells[_part(column, "count")].sum())
+            if reducer == "sum":
+                return total_sum
+            if reducer == "count":
+                return total_count
+            if reducer == "mean":
+                return total_sum / total_count if total_count else float("nan")
+            if reducer in ("min", "max"):
+                return getattr(self.cells[_part(column, reducer)], reducer)()
+
+        elif column in self.columns and reducer in ("min", "max", "count"):
+            level = self._level(column)
+            if reducer == "count":
+                return int(self.cells["size"][level.notna()].sum())
+            return getattr(level, reducer)()
+
+        raise ValueError(f"The sales cube does not track {reducer} of {column}")
+
+    def correlation(self, columns: list[str]) -> pd.DataFrame:
+        raise ValueError("The sales cube does not track correlations")
+
+    # --------------------------------------------------
+    # Persistence
+    # --------------------------------------------------
+    def save(self, path: Path, source: Path | None = None):
+        """
+        Write the cube to the directory ``path``. With ``source``, the
+        size and modification time of that file are recorded so
+        ``is_current`` can tell whether the cube still matches it.
+        """
+        if self._value_counts is None:
+            raise ValueError("A sliced sales cube cannot be saved")
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        values = pd.DataFrame({
+            "measure": np.repeat(list(self._value_counts), [len(c) for c in self._value_counts.values()]),
+            "value": np.concatenate([c.index.to_numpy(dtype="float64") for c in self._value_counts.values()]),
+            "count": np.concatenate([c.to_numpy(dtype="int64") for c in self._value_counts.values()]),
+        })
+        meta = {
+            "version": CUBE_VERSION,
+            "dimensions": self.dimensions,
+            "measures": self.measures,
+            "integer_measures": self.integer_measures,
+            "quantile_measures": list(self._value_counts),
+            "source": _signature(source) if source is not None else None,
+        }
+
+        for name, table in ((CELLS_FILE, self.cells), (VALUES_FILE, values)):
+            tmp_path = path / f"{name}.tmp"
+            table.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path / name)
+
+        # Written last: a cube directory is complete once it exists
+        tmp_path = path / f"{CUBE_FILE}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(meta, handle)
+        os.replace(tmp_path, path / CUBE_FILE)
+
+    @classmethod
+    def load(cls, path: Path) -> "SalesCube":
+        path = Path(path)
+        meta = _read_meta(path)
+        if meta is None or meta.get("version") != CUBE_VERSION:
+            raise ValueError(f"No sales cube of version {CUBE_VERSION} in {path}")
+
+        values = pd.read_parquet(path / VALUES_FILE)
+        counts = {
+            measure: pd.Series(
+                group["count"].to_numpy(), index=pd.Index(group["value"].to_numpy()), dtype="int64"
+            )
+            for measure, group in values.groupby("measure", sort=False)
+        }
+        return cls(
+            pd.read_parquet(path / CELLS_FILE),
+            meta["dimensions"],
+            meta["measures"],
+            {measure: counts.get(measure, pd.Series(dtype="int64")) for measure in meta["quantile_measures"]},
+            meta["integer_measures"],
+        )
+
+
+def _signature(path: Path) -> list[int]:
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _read_meta(path: Path) -> dict | None:
+    try:
+        with open(Path(path) / CUBE_FILE, encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+def is_current(path: Path, source: Path) -> bool:
+    """
+    Whether the cube saved in ``path`` was built from ``source`` as it is now.
+    """
+    meta = _read_meta(path)
+    if meta is None or meta.get("version") != CUBE_VERSION or meta.get("source") is None:
+        return False
+    try:
+        return meta["source"] == _signature(source)
+    except OSError:
+        return False
@@ -0,0 +1,372 @@
+"""
+Incremental aggregate store for continuously arriving sales
+
+``SalesAggregateStore`` keeps running sums, counts, minima and maxima of
+``Total`` per Date, Hour, Product_Line, Branch and Customer_Type, plus a
+value-count table of ``Total`` for exact medians. ``ingest`` folds in only
+invoices it has not seen before (by ``Invoice_ID``), so replaying a batch
+is harmless and the cost of an update depends on the size of the batch
+and the number of distinct keys, not on the history already absorbed:
+the IDs seen are kept as sorted part files that are memory-mapped and
+binary-searched, never read whole. ``ingest_csv`` reads only the rows
+appended to a CSV file since the store last read it.
+
+The store is an ``AggregationContext``: pass it to the analysis, insight
+and dashboard functions in place of a DataFrame and they are answered
+from the running state. Month and weekday groupings are derived from the
+daily table.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.common.aggregation import AggregationContext, FrameSource, iter_frames
+from src.common.data_loader import DATASET_SCHEMAS, read_appended
+from src.common.sketches import DEFAULT_RANK_ERROR, KLLSketch
+
+STATE_VERSION = 2
+STATE_FILE = "state.json"
+
+# Grouping keys with running totals, and the dtype their index is kept in
+STORE_KEYS = {
+    "Date": "datetime64[ns]",
+    "Hour": "int64",
+    "Product_Line": "str",
+    "Branch": "str",
+    "Customer_Type": "str",
+}
+
+# Groupings answered by regrouping the daily table
+DATE_DERIVED_KEYS = {
+    "Month": lambda dates: dates.month_name(),
+    "Day": lambda dates: dates.day_name(),
+    "Day_Name": lambda dates: dates.day_name(),
+}
+
+_TABLE_RULES = {
+    "sum": "sum",
+    "count": "sum",
+    "size": "sum",
+    "min": "min",
+    "max": "max",
+}
+
+_SCALAR_REDUCERS = {
+    "Total": ("sum", "count", "mean", "min", "max", "median", "sketch"),
+    "Date": ("min", "max"),
+}
+
+
+def _empty_table(dtype: str) -> pd.DataFrame:
+    return pd.DataFrame(
+        {part: pd.Series(dtype="float64") for part in _TABLE_RULES},
+        index=pd.Index([], dtype=dtype),
+    )
+
+
+def _key_table(batch: pd.DataFrame, key: str) -> pd.DataFrame:
+    grouped = batch.groupby(key, observed=True)
+    table = grouped["Total"].agg(["sum", "count", "min", "max"])
+    table["size"] = grouped.size()
+    table.index = table.index.astype(STORE_KEYS[key])
+    return table[list(_TABLE_RULES)]
+
+
+def _merge_tables(current: pd.DataFrame, update: pd.DataFrame) -> pd.DataFrame:
+    if current.empty:
+        return update
+    combined = pd.concat([current, update])
+    return combined.groupby(level=0).agg(_TABLE_RULES)
+
+
+def _median_from_counts(counts: pd.Series) -> float:
+    """
+    Exact median of the values in a ``{value: count}`` table.
+    """
+    total = int(counts.sum())
+    if not total:
+        return float("nan")
+    cumulative = counts.cumsum().to_numpy()
+    values = counts.index.to_numpy(dtype="float64")
+    low = np.searchsorted(cumulative, (total - 1) // 2, side="right")
+    high = np.searchsorted(cumulative, total // 2, side="right")
+    return (values[low] + values[high]) / 2
+
+
+def _finalise(table: pd.DataFrame, reducer: str) -> pd.Series:
+    if reducer == "mean":
+        result = table["sum"] / table["count"]
+    else:
+        result = table[reducer]
+    if reducer in ("count", "size"):
+        result = result.astype("int64")
+    return result
+
+
+def _contains(sorted_ids: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    """
+    Which of ``ids`` occur in the sorted array ``sorted_ids``.
+    """
+    if not len(sorted_ids):
+        return np.zeros(len(ids), dtype=bool)
+    positions = np.searchsorted(sorted_ids, ids).clip(max=len(sorted_ids) - 1)
+    return sorted_ids[positions] == ids
+
+
+def _write_ids(path: Path, ids: np.ndarray):
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    with open(tmp_path, "wb") as handle:
+        np.save(handle, ids, allow_pickle=False)
+    os.replace(tmp_path, path)
+
+
+def _index_to_json(index: pd.Index) -> list:
+    if isinstance(index, pd.DatetimeIndex):
+        return index.strftime("%Y-%m-%dT%H:%M:%S").tolist()
+    return index.tolist()
+
+
+class SalesAggregateStore(AggregationContext):
+    """
+    Running supermarket aggregates, optionally persisted in ``path``.
+
+    Opening a directory that already holds a saved state resumes from it;
+    ``save`` writes the aggregate tables and appends the invoice IDs seen
+    since the previous save as a new sorted part file.
+    """
+
+    def __init__(self, path: Path | None = None):
+        super().__init__(None)
+        self.path = Path(path) if path is not None else None
+
+        self.rows = 0
+        self._total_sum = 0.0
+        self._total_count = 0
+        self._tables = {key: _empty_table(dtype) for key, dtype in STORE_KEYS.items()}
+        self._total_counts = pd.Series(dtype="int64")
+
+        # Sorted invoice IDs: one array per saved part (memory-mapped) and
+        # per batch ingested since the last save
+        self._id_parts = []
+        self._saved_ids = []
+        self._pending_ids = []
+        # Read position of every CSV file fed through ingest_csv
+        self._sources = {}
+
+        if self.path is not None and (self.path / STATE_FILE).exists():
+            self._load()
+
+    # --------------------------------------------------
+    # Updates
+    # --------------------------------------------------
+    def ingest(self, data: FrameSource) -> int:
+        """
+        Fold preprocessed sales rows into the running aggregates.
+
+        Rows whose ``Invoice_ID`` was already ingested (or repeats within
+        the batch) are skipped, as are rows without an ID. Returns the
+        number of rows added.
+        """
+        added = 0
+        for frame in iter_frames(data):
+            added += self._ingest_frame(frame)
+        return added
+
+    def ingest_csv(self, source: Path, transform=None) -> int:
+        """
+        Fold in the rows appended to the CSV file ``source`` since this
+        store last read it, passed through ``transform`` (the
+        preprocessing) first. Only the new bytes are read; a file that was
+        truncated or rewritten is read again from the start, and its
+        invoices already in the store are skipped.
+        """
+        key = str(Path(source).resolve())
+        frame, position = read_appended(
+            Path(source), self._sources.get(key), **DATASET_SCHEMAS["supermarket"]
+        )
+        added = self.ingest(transform(frame) if transform and not frame.empty else frame)
+        self._sources[key] = position
+        return added
+
+    def _known(self, ids: np.ndarray) -> np.ndarray:
+        known = np.zeros(len(ids), dtype=bool)
+        for sorted_ids in self._saved_ids + self._pending_ids:
+            known |= _contains(sorted_ids, ids)
+        return known
+
+    def _ingest_frame(self, frame: pd.DataFrame) -> int:
+        ids = frame["Invoice_ID"]
+        fresh = (ids.notna() & ~ids.duplicated()).to_numpy(copy=True)
+        if fresh.any():
+            values = ids.astype("str").to_numpy(dtype=str)
+            fresh[fresh] = ~self._known(values[fresh])
+
+        batch = frame.loc[fresh]
+        if batch.empty:
+            return 0
+
+        for key in STORE_KEYS:
+            self._tables[key] = _merge_tables(self._tables[key], _key_table(batch, key))
+
+        totals = batch["Total"]
+        self._total_counts = (
+            self._total_counts.add(totals.value_counts(), fill_value=0)
+            .astype("int64")
+            .sort_index()
+        )
+        self._total_sum += float(totals.sum())
+        self._total_count += int(totals.count())
+        self.rows += len(batch)
+
+        self._pending_ids.append(np.sort(batch["Invoice_ID"].astype("str").to_numpy(dtype=str)))
+        return len(batch)
+
+    # --------------------------------------------------
+    # AggregationContext interface
+    # --------------------------------------------------
+    def grouped(self, by, column: str | None, reducer: str) -> pd.Series:
+        key = by[0] if isinstance(by, (list, tuple)) and len(by) == 1 else by
+        tracked = reducer == "mean" or reducer in _TABLE_RULES
+        if column not in ("Total", None) or not tracked:
+            raise ValueError(f"The sales store does not track {reducer} of {column}")
+
+        if not isinstance(key, str):
+            raise ValueError(f"The sales store does not group by {by!r}")
+        if key in STORE_KEYS:
+            table = self._tables[key]
+        elif key in DATE_DERIVED_KEYS:
+            daily = self._tables["Date"]
+            labels = DATE_DERIVED_KEYS[key](daily.index)
+            table = daily.groupby(labels).agg(_TABLE_RULES)
+        else:
+            raise ValueError(f"The sales store does not group by {by!r}")
+
+        result = _finalise(table, reducer).copy()
+        result.index.name = key
+        result.name = None if reducer == "size" else column
+        return result
+
+    def prefetch(self, requests: list[tuple]):
+        # Everything is answered from the running tables
+        return None
+
+    def summarize(self, spec: dict[str, list[str]],
+                  rank_error: float = DEFAULT_RANK_ERROR) -> tuple[int, dict]:
+        result = {}
+        for column, reducers in spec.items():
+            supported = _SCALAR_REDUCERS.get(column, ())
+            result[column] = {}
+            for reducer in reducers:
+                if reducer not in supported:
+                    raise ValueError(f"The sales store does not track {reducer} of {column}")
+                if reducer == "sketch":
+                    # Weighted by the value counts, so the cost follows
+                    # the number of distinct totals
+                    result[column][reducer] = KLLSketch(rank_error=rank_error).update(
+                        self._total_counts.index, self._total_counts.to_numpy()
+                    )
+                else:
+                    result[column][reducer] = self._scalar(column, reducer)
+        return self.rows, result
+
+    def _scalar(self, column: str, reducer: str):
+        if column == "Date":
+            dates = self._tables["Date"].index
+            return getattr(dates, reducer)()
+
+        values = self._total_counts.index
+        if reducer == "sum":
+            return self._total_sum
+        if reducer == "count":
+            return self._total_count
+        if reducer == "mean":
+            return self._total_sum / self._total_count if self._total_count else float("nan")
+        if reducer == "median":
+            return _median_from_counts(self._total_counts)
+        return getattr(values, reducer)() if len(values) else float("nan")
+
+    # --------------------------------------------------
+    # Persistence
+    # --------------------------------------------------
+    def save(self, path: Path | None = None):
+        """
+        Persist the state to ``path`` (defaults to the path it was opened from).
+        """
+        path = Path(path) if path is not None else self.path
+        if path is None:
+            raise ValueError("No path to save the sales store to")
+        path.mkdir(parents=True, exist_ok=True)
+
+        if path != self.path:
+            # Saving somewhere new: the complete ID history goes in one part
+            self._pending_ids = [np.asarray(ids) for ids in self._saved_ids] + self._pending_ids
+            self._saved_ids = []
+            self._id_parts = []
+            self.path = path
+
+        if self._pending_ids:
+            part = f"invoices-{len(self._id_parts):05d}.npy"
+            ids = np.sort(np.concatenate(self._pending_ids))
+            _write_ids(path / part, ids)
+            self._id_parts.append(part)
+            self._saved_ids.append(ids)
+            self._pending_ids = []
+
+        state = {
+            "version": STATE_VERSION,
+            "rows": self.rows,
+            "total_sum": self._total_sum,
+            "total_count": self._total_count,
+            "invoice_parts": self._id_parts,
+            "sources": self._sources,
+            "total_counts": {
+                "values": self._total_counts.index.tolist(),
+                "counts": self._total_counts.tolist(),
+            },
+            "tables": {
+                key: {
+                    "index": _index_to_json(table.index),
+                    **{part: table[part].tolist() for part in _TABLE_RULES},
+                }
+                for key, table in self._tables.items()
+            },
+        }
+
+        tmp_path = path / f"{STATE_FILE}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(state, handle)
+        os.replace(tmp_path, path / STATE_FILE)
+
+    def _load(self):
+        with open(self.path / STATE_FILE, encoding="utf-8") as handle:
+            state = json.load(handle)
+        version = state.get("version")
+        if version not in (1, STATE_VERSION):
+            raise ValueError(f"Unsupported sales store version in {self.path}")
+
+        self.rows = state["rows"]
+        self._total_sum = state["total_sum"]
+        self._total_count = state["total_count"]
+        self._total_counts = pd.Series(
+            state["total_counts"]["counts"],
+            index=pd.Index(state["total_counts"]["values"], dtype="float64"),
+            dtype="int64",
+        )
+        for key, dtype in STORE_KEYS.items():
+            stored = state["tables"][key]
+            self._tables[key] = pd.DataFrame(
+                {part: pd.Series(stored[part], dtype="float64") for part in _TABLE_RULES}
+            ).set_axis(pd.Index(stored["index"]).astype(dtype))
+
+        self._id_parts = list(state["invoice_parts"])
+        if version == 1:
+            # Parts used to be written unsorted; sort them once
+            for part in self._id_parts:
+                _write_ids(self.path / part, np.sort(np.load(self.path / part, allow_pickle=False)))
+        # Sorted when saved; mapped so that only the probed pages are read
+        self._saved_ids = [np.load(self.path / part, mmap_mode="r") for part in self._id_parts]
+        self._sources = dict(state.get("sources", {}))
@@ -2,20 +2,20 @@
 Business insight generation
 """
 
-import pandas as pd
+from src.common.aggregation import FrameSource, grouped_reduce
 
 
-def generate_business_insights(df: pd.DataFrame) -> list[str]:
+def generate_business_insights(df: FrameSource) -> list[str]:
     insights = []
 
     # Peak hours
-    peak_hour = df.groupby("Hour")["Total"].sum().idxmax()
+    peak_hour = grouped_reduce(df, "Hour", "Total", "sum").idxmax()
     insights.append(
         f"Peak sales occur around {peak_hour}:00 hours, indicating strong evening demand."
     )
 
     # Customer type behavior
-    avg_spend = df.groupby("Customer_Type")["Total"].mean()
+    avg_spend = grouped_reduce(df, "Customer_Type", "Total", "mean")
     if avg_spend["Member"] > avg_spend["Normal"]:
         insights.append(
             "Members spend more per transaction compared to normal customers."
@@ -23,7 +23,7 @@ def generate_business_insights(df: pd.DataFrame) -> list[str]:
 
     # Product dominance
     top_product = (
-        df.groupby("Product_Line")["Total"].sum().idxmax()
+        grouped_reduce(df, "Product_Line", "Total", "sum").idxmax()
     )
     insights.append(
         f"{top_product} is the highest revenue-generating product category."
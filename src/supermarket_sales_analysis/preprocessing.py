@@ -4,6 +4,10 @@ Data preprocessing and feature engineering
 
 import pandas as pd
 
+from src.common.dtypes import compact_dtypes
+from src.common.features import DAY_NAMES, MONTH_NAMES, label_codes
+from src.common.parsing import parse_datetimes
+
 
 def preprocess_sales_data(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -16,21 +20,21 @@ def preprocess_sales_data(df: pd.DataFrame) -> pd.DataFrame:
         pd.DataFrame: Processed dataset
     """
 
-    df = df.copy()
+    df = compact_dtypes(df, "supermarket")
 
     # Parse Date column
-    df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
+    df["Date"] = parse_datetimes(df["Date"], errors="coerce")
 
     # Derived time features
-    df["Month"] = df["Date"].dt.month_name()
-    df["Day_Name"] = df["Date"].dt.day_name()
+    df["Month"] = label_codes(df["Date"].dt.month, MONTH_NAMES, offset=1)
+    df["Day_Name"] = label_codes(df["Date"].dt.dayofweek, DAY_NAMES)
 
     # Time → Hour
-    df["Hour"] = pd.to_datetime(
+    df["Hour"] = parse_datetimes(
         df["Time"],
         format="%H:%M",
         errors="coerce"
     ).dt.hour
 
 
-    return df
\ No newline at end of file
+    return df
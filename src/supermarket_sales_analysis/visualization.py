@@ -1,13 +1,29 @@
 """
 Visualization Module for Supermarket Sales Analysis
 Exports publication-ready charts as PNG files
+
+Plot functions take a preprocessed DataFrame or an ``AggregationContext``
+wrapping one, so aggregated charts reuse groupings already computed by
+the analysis and insight modules. Each chart is keyed on the data it
+draws and copied from the plot cache when that data has not changed.
 """
 
 from pathlib import Path
 import matplotlib.pyplot as plt
 import seaborn as sns
 
-sns.set(style="whitegrid")
+from src.common.aggregation import as_context, frame_of, grouped_reduce
+from src.common.density import (
+    DEFAULT_DENSITY_THRESHOLD,
+    density_grid,
+    draw_density,
+    use_density,
+)
+from src.common.downsampling import DEFAULT_MAX_POINTS, downsample_positions
+from src.common.features import MONTH_NAMES
+from src.common.plot_cache import chart_key, restore_chart, store_chart
+from src.common.visualization import apply_style
+
 
 COLOR_PALETTE = {
     "primary": "#1f77b4",     # blue
@@ -23,7 +39,7 @@ def _ensure_dir(path: Path):
 
 
 def _require_columns(df, columns):
-    missing = [c for c in columns if c not in df.columns]
+    missing = [c for c in columns if c not in as_context(df).columns]
     if missing:
         raise KeyError(f"Missing required columns: {missing}")
 
@@ -34,10 +50,18 @@ def save_plot(fig, output_path: Path):
 
 
 # 1️⃣ Daily Sales Trend
-def plot_daily_sales(df, output_dir: Path):
+def plot_daily_sales(df, output_dir: Path, max_points: int | None = DEFAULT_MAX_POINTS,
+                     method: str = "minmax"):
+    apply_style()
     _ensure_dir(output_dir)
 
-    daily = df.groupby("Date")["Total"].sum()
+    daily = grouped_reduce(df, "Date", "Total", "sum")
+    daily = daily.iloc[downsample_positions(daily.index, daily, max_points, method)]
+
+    output_path = output_dir / "sales_trend_daily.png"
+    key = chart_key(plot_daily_sales, daily)
+    if restore_chart(key, output_path):
+        return
 
     fig, ax = plt.subplots(figsize=(10, 5))
     daily.plot(ax=ax)
@@ -45,36 +69,41 @@ def plot_daily_sales(df, output_dir: Path):
     ax.set_xlabel("Date")
     ax.set_ylabel("Total Sales")
 
-    save_plot(fig, output_dir / "sales_trend_daily.png")
+    save_plot(fig, output_path)
+    store_chart(key, output_path)
 
 
 # 2️⃣ Monthly Sales
 def plot_monthly_sales(df, output_dir: Path):
+    apply_style()
     _ensure_dir(output_dir)
 
-    import calendar
-
-    # 1️⃣ Convert numeric month to names
-    df['Month_Name'] = df['Month'].apply(lambda x: calendar.month_name[int(x)])
+    # "Month" already holds month names; reindex into calendar order
+    monthly = grouped_reduce(df, "Month", "Total", "sum").reindex(MONTH_NAMES)
 
-    # print(df[['Month', 'Month_Name']].head())
+    output_path = output_dir / "sales_trend_monthly.png"
+    key = chart_key(plot_monthly_sales, monthly)
+    if restore_chart(key, output_path):
+        return
 
-    # 2️⃣ Define calendar order
-    month_order = list(calendar.month_name[1:])
+    fig, ax = plt.subplots(figsize=(10, 6))
+    monthly.plot(kind="bar", ax=ax, title="Monthly Sales")
 
-    # 3️⃣ Group and reindex
-    monthly = df.groupby("Month_Name")["Total"].sum().reindex(month_order)
-
-    # 4️⃣ Plot
-    fig = monthly.plot(kind='bar', figsize=(10, 6), title='Monthly Sales').get_figure()
-
-    # 5️⃣ Save plot
-    save_plot(fig, output_dir / "sales_trend_monthly.png")
+    save_plot(fig, output_path)
+    store_chart(key, output_path)
 
 
 # 3️⃣ Hourly Sales
 def plot_hourly_sales(df, output_dir: Path):
-    hourly = df.groupby("Hour")["Total"].sum()
+    apply_style()
+    _ensure_dir(output_dir)
+
+    hourly = grouped_reduce(df, "Hour", "Total", "sum")
+
+    output_path = output_dir / "hourly_sales.png"
+    key = chart_key(plot_hourly_sales, hourly)
+    if restore_chart(key, output_path):
+        return
 
     fig, ax = plt.subplots(figsize=(8, 5))
     hourly.plot(ax=ax)
@@ -82,42 +111,78 @@ def plot_hourly_sales(df, output_dir: Path):
     ax.set_xlabel("Hour of Day")
     ax.set_ylabel("Total Sales")
 
-    save_plot(fig, output_dir / "hourly_sales.png")
+    save_plot(fig, output_path)
+    store_chart(key, output_path)
 
 
 # 4️⃣ Product Line Revenue
 def plot_product_line_revenue(df, output_dir: Path):
-    revenue = df.groupby("Product_Line")["Total"].sum().sort_values()
+    apply_style()
+    _ensure_dir(output_dir)
+
+    revenue = grouped_reduce(df, "Product_Line", "Total", "sum").sort_values()
+
+    output_path = output_dir / "product_line_revenue.png"
+    key = chart_key(plot_product_line_revenue, revenue)
+    if restore_chart(key, output_path):
+        return
 
     fig, ax = plt.subplots(figsize=(9, 6))
     revenue.plot(kind="barh", ax=ax)
     ax.set_title("Revenue by Product Line")
     ax.set_xlabel("Total Sales")
 
-    save_plot(fig, output_dir / "product_line_revenue.png")
+    save_plot(fig, output_path)
+    store_chart(key, output_path)
 
 
 # 5️⃣ Quantity vs Total (Correlation)
-def plot_quantity_vs_total(df, output_dir: Path):
+def plot_quantity_vs_total(df, output_dir: Path,
+                           density_threshold: int | None = DEFAULT_DENSITY_THRESHOLD):
+    apply_style()
+    _ensure_dir(output_dir)
+
+    # Large inputs are drawn (and keyed) as a density grid
+    grid = points = None
+    if use_density(df, density_threshold):
+        grid = density_grid(df, "Quantity", "Total")
+    else:
+        points = frame_of(df)[["Quantity", "Total"]]
+
+    output_path = output_dir / "quantity_vs_total.png"
+    key = chart_key(plot_quantity_vs_total, draw_density, grid, points)
+    if restore_chart(key, output_path):
+        return
+
     fig, ax = plt.subplots(figsize=(7, 5))
-    sns.scatterplot(
-        data=df, x="Quantity", y="Total", alpha=0.6, ax=ax
-    )
+    if grid is not None:
+        draw_density(ax, grid)
+    else:
+        sns.scatterplot(
+            data=points, x="Quantity", y="Total", alpha=0.6, ax=ax
+        )
     ax.set_title("Quantity vs Total Sales")
 
-    save_plot(fig, output_dir / "quantity_vs_total.png")
+    save_plot(fig, output_path)
+    store_chart(key, output_path)
 
 
 def plot_product_line_quantity(df, output_dir: Path):
+    apply_style()
     _ensure_dir(output_dir)
+
     _require_columns(df, ["Product_Line", "Quantity"])
 
     quantity_by_product = (
-        df.groupby("Product_Line")["Quantity"]
-          .sum()
-          .sort_values(ascending=False)
+        grouped_reduce(df, "Product_Line", "Quantity", "sum")
+        .sort_values(ascending=False)
     )
 
+    output_path = output_dir / "product_line_quantity.png"
+    key = chart_key(plot_product_line_quantity, quantity_by_product)
+    if restore_chart(key, output_path):
+        return
+
     fig, ax = plt.subplots(figsize=(8, 5))
     quantity_by_product.plot(kind="bar", ax=ax)
 
@@ -125,59 +190,93 @@ def plot_product_line_quantity(df, output_dir: Path):
     ax.set_xlabel("Product Line")
     ax.set_ylabel("Total Quantity")
 
-    plt.tight_layout()
-    # plt.show()
-    plt.savefig(output_dir / "product_line_quantity.png")
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(output_path)
+    plt.close(fig)
+    store_chart(key, output_path)
 
 
 def plot_customer_type_avg_spend(df, output_dir: Path):
+    apply_style()
     _ensure_dir(output_dir)
+
     _require_columns(df, ["Customer_Type", "Total"])
 
-    avg_spend = df.groupby("Customer_Type")["Total"].mean()
+    avg_spend = grouped_reduce(df, "Customer_Type", "Total", "mean")
+
+    output_path = output_dir / "customer_type_avg_spend.png"
+    key = chart_key(plot_customer_type_avg_spend, avg_spend)
+    if restore_chart(key, output_path):
+        return
 
     fig, ax = plt.subplots(figsize=(7, 5))
     avg_spend.plot(kind="bar", ax=ax, color=["green", "orange"])
     ax.set_title("Average Spend by Customer Type")
     ax.set_ylabel("Average Transaction Value")
 
-    save_plot(fig, output_dir / "customer_type_avg_spend.png")
+    save_plot(fig, output_path)
+    store_chart(key, output_path)
 
 
 def plot_gender_wise_sales(df, output_dir: Path):
+    apply_style()
     _ensure_dir(output_dir)
+
     _require_columns(df, ["Gender", "Total"])
 
-    gender_sales = df.groupby("Gender")["Total"].sum()
+    gender_sales = grouped_reduce(df, "Gender", "Total", "sum")
+
+    output_path = output_dir / "gender_wise_sales.png"
+    key = chart_key(plot_gender_wise_sales, gender_sales)
+    if restore_chart(key, output_path):
+        return
 
     fig, ax = plt.subplots(figsize=(7, 5))
     gender_sales.plot(kind="bar", ax=ax, color=["purple", "pink"])
     ax.set_title("Total Sales by Gender")
     ax.set_ylabel("Total Sales")
 
-    save_plot(fig, output_dir / "gender_wise_sales.png")
+    save_plot(fig, output_path)
+    store_chart(key, output_path)
 
 
 def plot_branch_revenue(df, output_dir: Path):
+    apply_style()
     _ensure_dir(output_dir)
+
     _require_columns(df, ["Branch", "Total"])
 
-    branch_sales = df.groupby("Branch")["Total"].sum()
+    branch_sales = grouped_reduce(df, "Branch", "Total", "sum")
+
+    output_path = output_dir / "branch_revenue_comparison.png"
+    key = chart_key(plot_branch_revenue, branch_sales)
+    if restore_chart(key, output_path):
+        return
 
     fig, ax = plt.subplots(figsize=(7, 5))
     branch_sales.plot(kind="bar", ax=ax, color="teal")
     ax.set_title("Revenue by Branch")
     ax.set_ylabel("Total Sales")
 
-    save_plot(fig, output_dir / "branch_revenue_comparison.png")
+    save_plot(fig, output_path)
+    store_chart(key, output_path)
 
 
 def plot_payment_method_share(df, output_dir: Path):
+    apply_style()
     _ensure_dir(output_dir)
+
     _require_columns(df, ["Payment"])
 
-    payment_counts = df["Payment"].value_counts()
+    payment_counts = (
+        grouped_reduce(df, "Payment", None, "size")
+        .sort_values(ascending=False, kind="stable")
+    )
+
+    output_path = output_dir / "payment_method_share.png"
+    key = chart_key(plot_payment_method_share, payment_counts)
+    if restore_chart(key, output_path):
+        return
 
     fig, ax = plt.subplots(figsize=(7, 7))
     payment_counts.plot(
@@ -189,4 +288,5 @@ def plot_payment_method_share(df, output_dir: Path):
     ax.set_title("Payment Method Distribution")
     ax.set_ylabel("")
 
-    save_plot(fig, output_dir / "payment_method_share.png")
+    save_plot(fig, output_path)
+    store_chart(key, output_path)
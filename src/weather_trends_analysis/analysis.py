@@ -1,33 +1,72 @@
 """
 Core analytical computations for Weather Trends
+
+Every function accepts either a preprocessed DataFrame or an iterable of
+preprocessed chunks (see ``common.data_loader.stream_dataset``).
 """
 
 import pandas as pd
 
+from src.common.aggregation import (
+    FrameSource,
+    column_quantiles,
+    correlation_matrix,
+    grouped_reduce,
+    summarize,
+)
+from src.common.sketches import DEFAULT_RANK_ERROR, median_error, sketch_percentiles
+
+CORRELATION_COLUMNS = [
+    "Temperature (C)",
+    "Apparent Temperature (C)",
+    "Humidity",
+    "Wind Speed (km/h)",
+    "Pressure (millibars)",
+]
+
+
+def temperature_overview(df: FrameSource, approximate: bool = False, percentiles=(),
+                         rank_error: float = DEFAULT_RANK_ERROR) -> dict:
+    """
+    Temperature summary.
 
-def temperature_overview(df: pd.DataFrame) -> dict:
-    return {
-        "mean_temperature": df["Temperature (C)"].mean(),
-        "median_temperature": df["Temperature (C)"].median(),
-        "min_temperature": df["Temperature (C)"].min(),
-        "max_temperature": df["Temperature (C)"].max(),
+    With ``approximate=True`` the median (and any ``percentiles``) come
+    from a quantile sketch built in the same pass over the data, with the
+    median's bounds and the sketch's rank error alongside.
+    """
+    median_reducer = "sketch" if approximate else "median"
+    _, stats = summarize(
+        df, {"Temperature (C)": ["mean", median_reducer, "min", "max"]}, rank_error
+    )
+    temperature = stats["Temperature (C)"]
+    sketch = temperature.get("sketch")
+    median = sketch.quantile(0.5) if sketch is not None else temperature["median"]
+
+    overview = {
+        "mean_temperature": temperature["mean"],
+        "median_temperature": median,
+        "min_temperature": temperature["min"],
+        "max_temperature": temperature["max"],
     }
 
+    if sketch is not None:
+        overview.update(median_error(sketch))
+    if percentiles:
+        overview["temperature_percentiles"] = (
+            sketch_percentiles(sketch, percentiles) if sketch is not None
+            else column_quantiles(df, "Temperature (C)", percentiles)
+        )
+
+    return overview
+
 
-def yearly_temperature_trend(df: pd.DataFrame) -> pd.Series:
-    return df.groupby("Year")["Temperature (C)"].mean()
+def yearly_temperature_trend(df: FrameSource) -> pd.Series:
+    return grouped_reduce(df, "Year", "Temperature (C)", "mean")
 
 
-def monthly_average_temperature(df: pd.DataFrame) -> pd.Series:
-    return df.groupby("Month_Name")["Temperature (C)"].mean()
+def monthly_average_temperature(df: FrameSource) -> pd.Series:
+    return grouped_reduce(df, "Month_Name", "Temperature (C)", "mean")
 
 
-def weather_variable_correlation(df: pd.DataFrame) -> pd.DataFrame:
-    cols = [
-        "Temperature (C)",
-        "Apparent Temperature (C)",
-        "Humidity",
-        "Wind Speed (km/h)",
-        "Pressure (millibars)",
-    ]
-    return df[cols].corr()
+def weather_variable_correlation(df: FrameSource) -> pd.DataFrame:
+    return correlation_matrix(df, CORRELATION_COLUMNS)
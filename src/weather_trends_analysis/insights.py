@@ -2,26 +2,28 @@
 Insight generation for Weather Trends Analysis
 """
 
-import pandas as pd
+from src.common.aggregation import FrameSource, correlation_matrix, grouped_reduce
 
 
-def generate_weather_insights(df: pd.DataFrame) -> list[str]:
+def generate_weather_insights(df: FrameSource) -> list[str]:
     insights = []
 
-    yearly_trend = df.groupby("Year")["Temperature (C)"].mean()
+    yearly_trend = grouped_reduce(df, "Year", "Temperature (C)", "mean")
 
     if yearly_trend.iloc[-1] > yearly_trend.iloc[0]:
         insights.append(
             "Average temperature shows an increasing trend over the observed years."
         )
 
-    humidity_corr = df["Humidity"].corr(df["Temperature (C)"])
+    corr = correlation_matrix(df, ["Temperature (C)", "Humidity", "Wind Speed (km/h)"])
+
+    humidity_corr = corr.loc["Humidity", "Temperature (C)"]
     if humidity_corr < 0:
         insights.append(
             "Humidity is negatively correlated with temperature, indicating drier conditions during warmer periods."
         )
 
-    wind_corr = df["Wind Speed (km/h)"].corr(df["Temperature (C)"])
+    wind_corr = corr.loc["Wind Speed (km/h)", "Temperature (C)"]
     if abs(wind_corr) > 0.3:
         insights.append(
             "Wind speed demonstrates a noticeable relationship with temperature variations."
@@ -0,0 +1,241 @@
+"""
+Year/month partitioned storage for the weather history
+
+``WeatherPartitionStore`` keeps the raw observations in a Hive-style
+layout, one Parquet file per UTC calendar month::
+
+    <root>/Year=2006/Month=01/data.parquet
+    <root>/Year=2006/Month=02/data.parquet
+    ...
+
+Rows are assigned to the Year and Month that ``preprocess_weather_data``
+derives from ``Formatted Date``, so a partition holds exactly the rows of
+one (Year, Month) group; rows whose date cannot be parsed go to the
+``__HIVE_DEFAULT_PARTITION__`` partition. ``read`` with a date range only
+opens the partitions overlapping it, and ``append`` rewrites only the
+partitions that receive new observations. Timestamps repeat in the
+history, so an observation is identified by its whole raw row: a batch
+only adds the copies of a row beyond those its partition already holds.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.common.parsing import parse_offset_datetimes
+
+STORE_VERSION = 1
+STORE_FILE = "store.json"
+DATA_FILE = "data.parquet"
+
+PARTITION_KEYS = ["Year", "Month"]
+DATE_COLUMN = "Formatted Date"
+
+# Odd multiplier spreading the occurrence of a repeated row over the hash
+_OCCURRENCE_STEP = np.uint64(0x9E3779B97F4A7C15)
+
+# Hive's name for the partition of rows without a key value
+DEFAULT_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+
+def _partition_names(df: pd.DataFrame) -> pd.Series:
+    """
+    Relative partition directory of every row of a raw weather frame.
+    """
+    timestamps = parse_offset_datetimes(df[DATE_COLUMN])
+    years = timestamps.dt.year.to_numpy(dtype="float64", na_value=np.nan)
+    months = timestamps.dt.month.to_numpy(dtype="float64", na_value=np.nan)
+
+    # Few distinct months: format each once
+    keys = pd.Series(years * 100 + months, index=df.index)
+    names = {
+        key: f"Year={int(key) // 100}/Month={int(key) % 100:02d}"
+        for key in keys.dropna().unique()
+    }
+    default = f"Year={DEFAULT_PARTITION}/Month={DEFAULT_PARTITION}"
+    return keys.map(names).fillna(default)
+
+
+def _partition_key(name: str) -> tuple[int, int] | None:
+    year, month = (part.partition("=")[2] for part in name.split("/"))
+    if DEFAULT_PARTITION in (year, month):
+        return None
+    return int(year), int(month)
+
+
+def _as_utc(value) -> pd.Timestamp | None:
+    if value is None:
+        return None
+    value = pd.Timestamp(value)
+    return value.tz_localize("UTC") if value.tzinfo is None else value.tz_convert("UTC")
+
+
+def _row_keys(df: pd.DataFrame) -> np.ndarray:
+    """
+    64-bit identity of every raw row: a hash of its values mixed with how
+    many identical rows precede it, so repeated rows stay distinct.
+    """
+    hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    occurrence = pd.Series(hashes).groupby(hashes, sort=False).cumcount().to_numpy()
+    return hashes + occurrence.astype("uint64") * _OCCURRENCE_STEP
+
+
+def _signature(path: Path) -> list[int]:
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+class WeatherPartitionStore:
+    """
+    Raw weather observations partitioned by UTC year and month.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.sources = {}
+
+        meta_path = self.root / STORE_FILE
+        if meta_path.exists():
+            with open(meta_path, encoding="utf-8") as handle:
+                meta = json.load(handle)
+            if meta.get("version") != STORE_VERSION:
+                raise ValueError(f"Unsupported partition store version in {self.root}")
+            self.sources = meta["sources"]
+
+    # --------------------------------------------------
+    # Layout
+    # --------------------------------------------------
+    def partitions(self) -> list[str]:
+        """
+        Relative directories of the stored partitions, in date order (the
+        default partition last).
+        """
+        names = [
+            path.parent.relative_to(self.root).as_posix()
+            for path in self.root.glob(f"Year=*/Month=*/{DATA_FILE}")
+        ]
+        return sorted(names, key=lambda name: (_partition_key(name) is None, _partition_key(name) or ()))
+
+    def _write_partition(self, name: str, df: pd.DataFrame):
+        path = self.root / name / DATA_FILE
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".parquet.tmp")
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+    # --------------------------------------------------
+    # Writing
+    # --------------------------------------------------
+    def append(self, df: pd.DataFrame) -> int:
+        """
+        Add the raw observations of ``df`` and return how many were new.
+
+        Only the partitions receiving rows are rewritten. Rows their
+        partition already holds (as many times as it holds them) are
+        skipped, so replaying a batch, or a longer version of an ingested
+        file, is harmless.
+        """
+        added = 0
+        codes, names = pd.factorize(_partition_names(df))
+        # One reorder groups every partition's rows into a contiguous slice
+        order = np.argsort(codes, kind="stable")
+        df = df.take(order)
+        # Identical rows share a partition, so keys can be taken batch-wide
+        keys = _row_keys(df)
+        bounds = np.searchsorted(codes[order], np.arange(len(names) + 1))
+        for name, start, stop in zip(names, bounds[:-1], bounds[1:]):
+            rows = df.iloc[start:stop]
+            path = self.root / name / DATA_FILE
+            if path.exists():
+                existing = pd.read_parquet(path)
+                stored = _row_keys(existing[rows.columns])
+                rows = rows[~np.isin(keys[start:stop], stored)]
+                if rows.empty:
+                    continue
+                combined = pd.concat([existing, rows], ignore_index=True)
+            else:
+                combined = rows.reset_index(drop=True)
+            self._write_partition(name, combined)
+            added += len(rows)
+        return added
+
+    def ingest(self, source: Path) -> int:
+        """
+        Append the CSV file ``source`` unless this version of it was
+        already ingested; returns the number of new observations.
+        """
+        from src.common.data_loader import load_csv
+
+        source = Path(source)
+        if self.is_ingested(source):
+            return 0
+        added = self.append(load_csv(source))
+        self.sources[str(source.resolve())] = _signature(source)
+        self.save()
+        return added
+
+    def is_ingested(self, source: Path) -> bool:
+        """
+        Whether ``source`` as it is now was already appended to the store.
+        """
+        try:
+            return self.sources.get(str(Path(source).resolve())) == _signature(source)
+        except OSError:
+            return False
+
+    def save(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.root / f"{STORE_FILE}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump({"version": STORE_VERSION, "sources": self.sources}, handle)
+        os.replace(tmp_path, self.root / STORE_FILE)
+
+    # --------------------------------------------------
+    # Reading
+    # --------------------------------------------------
+    def read(self, start=None, end=None) -> pd.DataFrame:
+        """
+        Raw observations with ``start <= Formatted Date < end``.
+
+        Bounds are timestamps or date strings, taken as UTC when they carry
+        no offset; either may be omitted. Partitions outside the range are
+        never opened, and dates are only parsed in the partitions the
+        range cuts through. Undated rows are returned only without bounds.
+        """
+        start, end = _as_utc(start), _as_utc(end)
+        bounded = start is not None or end is not None
+
+        frames = []
+        names = self.partitions()
+        for name in names:
+            key = _partition_key(name)
+            if key is None:
+                if not bounded:
+                    frames.append(pd.read_parquet(self.root / name / DATA_FILE))
+                continue
+
+            first = pd.Timestamp(year=key[0], month=key[1], day=1, tz="UTC")
+            last = first + pd.offsets.MonthBegin()
+            if (end is not None and first >= end) or (start is not None and last <= start):
+                continue
+
+            frame = pd.read_parquet(self.root / name / DATA_FILE)
+            if (start is not None and first < start) or (end is not None and last > end):
+                timestamps = parse_offset_datetimes(frame[DATE_COLUMN])
+                mask = pd.Series(True, index=frame.index)
+                if start is not None:
+                    mask &= timestamps >= start
+                if end is not None:
+                    mask &= timestamps < end
+                frame = frame[mask.to_numpy()]
+            frames.append(frame)
+
+        if frames:
+            return pd.concat(frames, ignore_index=True)
+        if names:
+            # Keep the columns when the range matches nothing
+            return pd.read_parquet(self.root / names[0] / DATA_FILE).iloc[:0]
+        return pd.DataFrame()
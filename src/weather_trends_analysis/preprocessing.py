@@ -4,18 +4,20 @@ Preprocessing utilities for Weather Trends Analysis
 
 import pandas as pd
 
+from src.common.dtypes import compact_dtypes
+from src.common.features import MONTH_NAMES, label_codes
+from src.common.parsing import parse_offset_datetimes
+
 
 def preprocess_weather_data(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
+    df = compact_dtypes(df, "weather")
 
     # Parse date column (case-sensitive)
-    df["Formatted Date"] = pd.to_datetime(
-        df["Formatted Date"], utc=True, errors="coerce"
-    )
+    df["Formatted Date"] = parse_offset_datetimes(df["Formatted Date"])
 
     # Time-based features
     df["Year"] = df["Formatted Date"].dt.year
     df["Month"] = df["Formatted Date"].dt.month
-    df["Month_Name"] = df["Formatted Date"].dt.month_name()
+    df["Month_Name"] = label_codes(df["Month"], MONTH_NAMES, offset=1)
 
     return df
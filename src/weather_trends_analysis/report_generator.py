@@ -4,9 +4,14 @@ Report text generation for Weather Trends Analysis
 
 
 def overview_text(stats: dict) -> list[str]:
+    median = f"Median Temperature: {stats['median_temperature']:.2f} °C"
+    if "median_bounds" in stats:
+        low, high = stats["median_bounds"]
+        median += f" (approx., {low:.2f} – {high:.2f} °C within ±{stats['rank_error']:.1%} rank)"
+
     return [
         f"Mean Temperature: {stats['mean_temperature']:.2f} °C",
-        f"Median Temperature: {stats['median_temperature']:.2f} °C",
+        median,
         f"Min Temperature: {stats['min_temperature']:.2f} °C",
         f"Max Temperature: {stats['max_temperature']:.2f} °C",
     ]
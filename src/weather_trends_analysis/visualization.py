@@ -1,12 +1,26 @@
 """
 Static visualization exports for Weather Trends Analysis
+
+Plot functions take a preprocessed DataFrame or an ``AggregationContext``
+wrapping one. Charts whose drawn data has not changed are copied from the
+plot cache instead of being redrawn.
 """
 
 from pathlib import Path
 import matplotlib.pyplot as plt
 import seaborn as sns
 
-sns.set(style="whitegrid")
+from src.common.aggregation import correlation_matrix, frame_of, grouped_reduce
+from src.common.density import (
+    DEFAULT_DENSITY_THRESHOLD,
+    density_grid,
+    draw_density,
+    use_density,
+)
+from src.common.downsampling import DEFAULT_MAX_POINTS, downsample_positions
+from src.common.features import MONTH_NAMES
+from src.common.plot_cache import chart_key, restore_chart, store_chart
+from src.common.visualization import apply_style
 
 
 def _ensure_dir(path: Path):
@@ -19,68 +33,135 @@ def save_plot(fig, output_path: Path):
 
 
 # 1️⃣ Temperature Trend Over Time
-def plot_temperature_trend(df, output_dir: Path):
+def plot_temperature_trend(df, output_dir: Path, max_points: int | None = DEFAULT_MAX_POINTS,
+                           method: str = "minmax"):
+    apply_style()
     _ensure_dir(output_dir)
 
+    df = frame_of(df)
+
+    # Only the points that shape the drawn line reach matplotlib
+    dates, temperatures = df["Formatted Date"], df["Temperature (C)"]
+    keep = downsample_positions(dates, temperatures, max_points, method)
+    dates, temperatures = dates.iloc[keep], temperatures.iloc[keep]
+
+    output_path = output_dir / "temperature_trend.png"
+    key = chart_key(plot_temperature_trend, dates, temperatures)
+    if restore_chart(key, output_path):
+        return
+
     fig, ax = plt.subplots(figsize=(12, 5))
-    ax.plot(df["Formatted Date"], df["Temperature (C)"], alpha=0.6)
+    ax.plot(dates, temperatures, alpha=0.6)
     ax.set_title("Temperature Trend Over Time")
     ax.set_xlabel("Date")
     ax.set_ylabel("Temperature (°C)")
 
-    save_plot(fig, output_dir / "temperature_trend.png")
+    save_plot(fig, output_path)
+    store_chart(key, output_path)
 
 
 # 2️⃣ Monthly Average Temperature
 def plot_monthly_average_temperature(df, output_dir: Path):
-    monthly = df.groupby("Month_Name")["Temperature (C)"].mean()
+    apply_style()
+    _ensure_dir(output_dir)
+
+    monthly = grouped_reduce(df, "Month_Name", "Temperature (C)", "mean")
+
+    output_path = output_dir / "monthly_average_temperature.png"
+    key = chart_key(plot_monthly_average_temperature, monthly)
+    if restore_chart(key, output_path):
+        return
 
     fig, ax = plt.subplots(figsize=(10, 5))
     monthly.plot(kind="bar", ax=ax, color="tomato")
     ax.set_title("Average Monthly Temperature")
     ax.set_ylabel("Temperature (°C)")
 
-    save_plot(fig, output_dir / "monthly_average_temperature.png")
+    save_plot(fig, output_path)
+    store_chart(key, output_path)
 
 
 # 3️⃣ Humidity Distribution
 def plot_humidity_distribution(df, output_dir: Path):
+    apply_style()
+    _ensure_dir(output_dir)
+
+    humidity = frame_of(df)["Humidity"]
+
+    output_path = output_dir / "humidity_distribution.png"
+    key = chart_key(plot_humidity_distribution, humidity)
+    if restore_chart(key, output_path):
+        return
+
     fig, ax = plt.subplots()
-    ax.hist(df["Humidity"], bins=30)
+    ax.hist(humidity, bins=30)
     ax.set_title("Humidity Distribution")
     ax.set_xlabel("Humidity")
 
-    save_plot(fig, output_dir / "humidity_distribution.png")
+    save_plot(fig, output_path)
+    store_chart(key, output_path)
 
 
 # 4️⃣ Actual vs Apparent Temperature
-def plot_actual_vs_apparent_temperature(df, output_dir: Path):
+def plot_actual_vs_apparent_temperature(df, output_dir: Path,
+                                        density_threshold: int | None = DEFAULT_DENSITY_THRESHOLD):
+    apply_style()
+    _ensure_dir(output_dir)
+
+    # Large inputs are drawn (and keyed) as a density grid
+    grid = points = None
+    if use_density(df, density_threshold):
+        grid = density_grid(df, "Temperature (C)", "Apparent Temperature (C)")
+    else:
+        points = frame_of(df)[["Temperature (C)", "Apparent Temperature (C)"]]
+
+    output_path = output_dir / "actual_vs_apparent_temperature.png"
+    key = chart_key(plot_actual_vs_apparent_temperature, draw_density, grid, points)
+    if restore_chart(key, output_path):
+        return
+
     fig, ax = plt.subplots()
-    ax.scatter(
-        df["Temperature (C)"],
-        df["Apparent Temperature (C)"],
-        alpha=0.5
-    )
+    if grid is not None:
+        draw_density(ax, grid)
+    else:
+        ax.scatter(
+            points["Temperature (C)"],
+            points["Apparent Temperature (C)"],
+            alpha=0.5
+        )
     ax.set_title("Actual vs Apparent Temperature")
     ax.set_xlabel("Temperature (°C)")
     ax.set_ylabel("Apparent Temperature (°C)")
 
-    save_plot(fig, output_dir / "actual_vs_apparent_temperature.png")
+    save_plot(fig, output_path)
+    store_chart(key, output_path)
 
 
 # 5️⃣ Weather Summary Frequency
 def plot_weather_summary_frequency(df, output_dir: Path):
-    summary_counts = df["Summary"].value_counts().head(10)
+    apply_style()
+    _ensure_dir(output_dir)
+
+    summary_counts = frame_of(df)["Summary"].value_counts().head(10)
+
+    output_path = output_dir / "weather_summary_frequency.png"
+    key = chart_key(plot_weather_summary_frequency, summary_counts)
+    if restore_chart(key, output_path):
+        return
 
     fig, ax = plt.subplots(figsize=(10, 5))
     summary_counts.plot(kind="bar", ax=ax)
     ax.set_title("Most Frequent Weather Conditions")
 
-    save_plot(fig, output_dir / "weather_summary_frequency.png")
+    save_plot(fig, output_path)
+    store_chart(key, output_path)
 
 
 # 6️⃣ Correlation Heatmap
 def plot_weather_correlation_heatmap(df, output_dir: Path):
+    apply_style()
+    _ensure_dir(output_dir)
+
     corr_cols = [
         "Temperature (C)",
         "Apparent Temperature (C)",
@@ -89,27 +170,41 @@ def plot_weather_correlation_heatmap(df, output_dir: Path):
         "Pressure (millibars)",
     ]
 
+    corr = correlation_matrix(df, corr_cols)
+
+    output_path = output_dir / "correlation_heatmap.png"
+    key = chart_key(plot_weather_correlation_heatmap, corr)
+    if restore_chart(key, output_path):
+        return
+
     fig, ax = plt.subplots(figsize=(8, 6))
     sns.heatmap(
-        df[corr_cols].corr(),
+        corr,
         annot=True,
         cmap="coolwarm",
         ax=ax
     )
     ax.set_title("Weather Variable Correlation Heatmap")
 
-    save_plot(fig, output_dir / "correlation_heatmap.png")
+    save_plot(fig, output_path)
+    store_chart(key, output_path)
 
 
 # 7️⃣ Yearly Average Temperature Trend
 def plot_yearly_avg_temperature(df, output_dir: Path):
+    apply_style()
     _ensure_dir(output_dir)
 
-    yearly_avg = df.groupby("Year")["Temperature (C)"].mean()
+    yearly_avg = grouped_reduce(df, "Year", "Temperature (C)", "mean")
 
-    plt.figure(figsize=(12, 5))
+    output_path = output_dir / "yearly_avg_temperature_trend.png"
+    key = chart_key(plot_yearly_avg_temperature, yearly_avg)
+    if restore_chart(key, output_path):
+        return
 
-    plt.plot(
+    fig, ax = plt.subplots(figsize=(12, 5))
+
+    ax.plot(
         yearly_avg.index,
         yearly_avg.values,
         marker="o",
@@ -118,88 +213,114 @@ def plot_yearly_avg_temperature(df, output_dir: Path):
         alpha=0.9
     )
 
-    plt.title("Yearly Average Temperature Trend", fontsize=15)
-    plt.xlabel("Year")
-    plt.ylabel("Average Temperature (°C)")
-    plt.grid(True, linestyle="--", alpha=0.4)
+    ax.set_title("Yearly Average Temperature Trend", fontsize=15)
+    ax.set_xlabel("Year")
+    ax.set_ylabel("Average Temperature (°C)")
+    ax.grid(True, linestyle="--", alpha=0.4)
 
-    plt.tight_layout()
-    plt.savefig(output_dir / "yearly_avg_temperature_trend.png", dpi=300)
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=300)
+    plt.close(fig)
+    store_chart(key, output_path)
 
 
 # 8️⃣ Pressure vs Temperature
-def plot_pressure_vs_temperature(df, output_dir: Path):
+def plot_pressure_vs_temperature(df, output_dir: Path,
+                                 density_threshold: int | None = DEFAULT_DENSITY_THRESHOLD):
+    apply_style()
     _ensure_dir(output_dir)
 
-    plt.figure(figsize=(11, 5))
-
-    sns.scatterplot(
-        data=df,
-        x="Pressure (millibars)",
-        y="Temperature (C)",
-        hue="Temperature (C)",
-        palette="coolwarm",
-        alpha=0.6,
-        legend=True
-    )
+    grid = points = None
+    if use_density(df, density_threshold):
+        grid = density_grid(df, "Pressure (millibars)", "Temperature (C)")
+    else:
+        points = frame_of(df)[["Pressure (millibars)", "Temperature (C)"]]
+
+    output_path = output_dir / "pressure_vs_temperature.png"
+    key = chart_key(plot_pressure_vs_temperature, draw_density, grid, points)
+    if restore_chart(key, output_path):
+        return
+
+    fig, ax = plt.subplots(figsize=(11, 5))
+
+    if grid is not None:
+        draw_density(ax, grid, cmap="mako")
+    else:
+        sns.scatterplot(
+            data=points,
+            x="Pressure (millibars)",
+            y="Temperature (C)",
+            hue="Temperature (C)",
+            palette="coolwarm",
+            alpha=0.6,
+            legend=True,
+            ax=ax
+        )
 
-    plt.title("Pressure vs Temperature Relationship", fontsize=14)
-    plt.xlabel("Pressure (millibars)")
-    plt.ylabel("Temperature (°C)")
-    plt.grid(True, linestyle="--", alpha=0.4)
+    ax.set_title("Pressure vs Temperature Relationship", fontsize=14)
+    ax.set_xlabel("Pressure (millibars)")
+    ax.set_ylabel("Temperature (°C)")
+    ax.grid(True, linestyle="--", alpha=0.4)
 
-    plt.tight_layout()
-    plt.savefig(output_dir / "pressure_vs_temperature.png", dpi=300)
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=300)
+    plt.close(fig)
+    store_chart(key, output_path)
 
 
 # 9️⃣ Wind Speed Distribution
 def plot_wind_speed_distribution(df, output_dir: Path):
+    apply_style()
     _ensure_dir(output_dir)
 
-    plt.figure(figsize=(11, 5))
+    wind_speed = frame_of(df)[["Wind Speed (km/h)"]]
+
+    output_path = output_dir / "wind_speed_distribution.png"
+    key = chart_key(plot_wind_speed_distribution, wind_speed)
+    if restore_chart(key, output_path):
+        return
+
+    fig, ax = plt.subplots(figsize=(11, 5))
 
     sns.histplot(
-        data=df,
+        data=wind_speed,
         x="Wind Speed (km/h)",
         bins=30,
         kde=True,
         color="#4C72B0",
         edgecolor="white",
-        alpha=0.8
+        alpha=0.8,
+        ax=ax
     )
 
-    plt.title("Distribution of Wind Speed", fontsize=14)
-    plt.xlabel("Wind Speed (km/h)")
-    plt.ylabel("Frequency")
-    plt.grid(axis="y", linestyle="--", alpha=0.4)
+    ax.set_title("Distribution of Wind Speed", fontsize=14)
+    ax.set_xlabel("Wind Speed (km/h)")
+    ax.set_ylabel("Frequency")
+    ax.grid(axis="y", linestyle="--", alpha=0.4)
 
-    plt.tight_layout()
-    plt.savefig(output_dir / "wind_speed_distribution.png", dpi=300)
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=300)
+    plt.close(fig)
+    store_chart(key, output_path)
 
 
 # 🔟 Temperature Heatmap by Month & Year
 def plot_temperature_heatmap(df, output_dir: Path):
+    apply_style()
     _ensure_dir(output_dir)
 
-    month_order = [
-        "January", "February", "March", "April", "May", "June",
-        "July", "August", "September", "October", "November", "December"
-    ]
-
     pivot = (
-        df.pivot_table(
-            index="Year",
-            columns="Month_Name",
-            values="Temperature (C)",
-            aggfunc="mean"
-        )
-        .reindex(columns=month_order)
+        grouped_reduce(df, ["Year", "Month_Name"], "Temperature (C)", "mean")
+        .unstack("Month_Name")
+        .reindex(columns=MONTH_NAMES)
     )
 
-    plt.figure(figsize=(14, 6))
+    output_path = output_dir / "temperature_heatmap_month_year.png"
+    key = chart_key(plot_temperature_heatmap, pivot)
+    if restore_chart(key, output_path):
+        return
+
+    fig, ax = plt.subplots(figsize=(14, 6))
 
     sns.heatmap(
         pivot,
@@ -208,16 +329,18 @@ def plot_temperature_heatmap(df, output_dir: Path):
         fmt=".1f",
         linewidths=0.4,
         linecolor="white",
-        cbar_kws={"label": "Avg Temperature (°C)"}
+        cbar_kws={"label": "Avg Temperature (°C)"},
+        ax=ax
     )
 
-    plt.title("Average Monthly Temperature by Year", fontsize=15)
-    plt.xlabel("Month")
-    plt.ylabel("Year")
-    plt.yticks(rotation=0)
+    ax.set_title("Average Monthly Temperature by Year", fontsize=15)
+    ax.set_xlabel("Month")
+    ax.set_ylabel("Year")
+    ax.tick_params(axis="y", labelrotation=0)
 
-    plt.tight_layout()
-    plt.savefig(output_dir / "temperature_heatmap_month_year.png", dpi=300)
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=300)
+    plt.close(fig)
+    store_chart(key, output_path)
 
 